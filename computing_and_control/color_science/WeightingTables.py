@@ -0,0 +1,455 @@
+import collections
+import hashlib
+import os
+import tempfile
+
+import numpy
+
+import color_science
+
+class WeightingTables():
+
+    """
+    title::
+        WeightingTables
+
+    description::
+        Creates a registry of the spectra of standard observers and
+        illuminants and a cache of the 3 x N weighting matrices computed from
+        them by weighting_matrix. A weighting matrix is keyed by the
+        observer, the illuminant, the wavelengths of the data and the type of
+        the matrix, and is computed once by resampling the observer's color
+        matching functions and the illuminant to those wavelengths with
+        linear interpolation. The most recently used matrices are kept in
+        memory, the least recently used being evicted once there are more
+        than maximumSize, and if a cache directory is given every matrix is
+        also saved to it as a .npy file, named by a hash of the spectra it
+        was computed from, so later registries and processes load it instead
+        of computing it. Converting a batch of reflectances with ref2XYZ then
+        costs a single matrix multiply.
+
+        The CIE 1931 2 degree standard observer is registered as 'CIE1931',
+        using the multi-lobe Gaussian fit of Wyman, Sloan and Shirley (2013),
+        and the CIE illuminants A and E as 'A' and 'E'. Tabulated observers
+        and illuminants, e.g. CIE D65, are added with register_observer and
+        register_illuminant.
+
+    attributes::
+        maximumSize
+            (int [optional]) The largest number of weighting matrices kept in
+            memory. Defaults to 32.
+
+        cacheDirectory
+            (string [optional]) The directory the weighting matrices are
+            saved to and loaded from, which is created if needed. Defaults
+            to None, in which case they are only cached in memory.
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    def __init__(self, maximumSize=32, cacheDirectory=None):
+
+        """
+        description::
+            Instantiates WeightingTables with the built in observer and
+            illuminants and an empty cache
+
+        attributes::
+            maximumSize
+                (int [optional]) The largest number of weighting matrices kept
+                in memory. Defaults to 32.
+
+            cacheDirectory
+                (string [optional]) The directory the weighting matrices are
+                saved to. Defaults to None.
+        """
+
+        if maximumSize < 1:
+            msg = 'Provided attribute "maximumSize" must be at least 1'
+            raise ValueError(msg)
+        if cacheDirectory is not None:
+            os.makedirs(cacheDirectory, exist_ok=True)
+
+        self._maximumSize = maximumSize
+        self._cacheDirectory = cacheDirectory
+        self._observers = {}
+        self._illuminants = {}
+        self._cache = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        wavelengths = numpy.arange(360.0, 831.0)
+        self.register_observer('CIE1931', wavelengths,\
+                               _cie1931_cmfs(wavelengths))
+        self.register_illuminant('A', wavelengths,\
+                                 _illuminant_a(wavelengths))
+        self.register_illuminant('E', wavelengths,\
+                                 numpy.full(wavelengths.size, 100.0))
+
+    @property
+    def maximumSize(self):
+        return self._maximumSize
+
+    @property
+    def cacheDirectory(self):
+        return self._cacheDirectory
+
+    @property
+    def observers(self):
+        return sorted(self._observers)
+
+    @property
+    def illuminants(self):
+        return sorted(self._illuminants)
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __repr__(self):
+
+        """
+        description::
+            Returns the string representation of the registry with its
+            observers, illuminants and cache statistics
+        """
+
+        string = "Observers = {0}, Illuminants = {1}, Cached = {2}/{3}, "\
+                 "Hits = {4}, Misses = {5}"\
+                 .format(self.observers, self.illuminants, len(self),\
+                         self._maximumSize, self.hits, self.misses)
+
+        return string
+
+    def register_observer(self, name, wavelengths, cmfs):
+
+        """
+        description::
+            Registers, or replaces, the color matching functions of a
+            standard observer. The cached weighting matrices of an observer
+            that is replaced are evicted.
+
+        attributes::
+            name
+                (string) The name of the observer
+
+            wavelengths
+                (numpy ndarray) The N increasing wavelengths in nm
+
+            cmfs
+                (numpy ndarray) An N x 3 array of the x-bar, y-bar and z-bar
+                color matching functions at the wavelengths
+        """
+
+        wavelengths, cmfs = _spectrum(wavelengths, cmfs, (3,))
+        self._observers[name] = (wavelengths, cmfs)
+        self._evict(0, name)
+
+    def register_illuminant(self, name, wavelengths, values):
+
+        """
+        description::
+            Registers, or replaces, the spectral power distribution of an
+            illuminant. The cached weighting matrices of an illuminant that
+            is replaced are evicted.
+
+        attributes::
+            name
+                (string) The name of the illuminant
+
+            wavelengths
+                (numpy ndarray) The N increasing wavelengths in nm
+
+            values
+                (numpy ndarray) The N values of the illuminant at the
+                wavelengths
+        """
+
+        wavelengths, values = _spectrum(wavelengths, values, ())
+        self._illuminants[name] = (wavelengths, values)
+        self._evict(1, name)
+
+    def _evict(self, position, name):
+
+        # Evict the cached matrices of a replaced observer or illuminant
+        for key in [key for key in self._cache if key[position] == name]:
+            del self._cache[key]
+
+    def resample(self, observer, illuminant, wavelengths):
+
+        """
+        description::
+            Resamples the color matching functions of an observer and an
+            illuminant to the wavelengths of the data with linear
+            interpolation. The color matching functions are 0 outside the
+            wavelengths they were registered at, and the illuminant is its
+            first or last value.
+
+        attributes::
+            observer
+                (string) The name of the observer
+
+            illuminant
+                (string) The name of the illuminant
+
+            wavelengths
+                (numpy ndarray) The N wavelengths of the data in nm
+
+        returns::
+            cmfs
+                (numpy ndarray) The N x 3 resampled color matching functions
+
+            illum
+                (numpy ndarray) The N resampled values of the illuminant
+        """
+
+        self._check(observer, illuminant)
+
+        wavelengths = numpy.asarray(wavelengths, dtype=numpy.float64)
+        observerWavelengths, observerCmfs = self._observers[observer]
+        cmfs = numpy.stack([numpy.interp(wavelengths, observerWavelengths,\
+                                         observerCmfs[:, i], left=0, right=0)\
+                            for i in range(3)], axis=1)
+        illum = numpy.interp(wavelengths, *self._illuminants[illuminant])
+
+        return cmfs, illum
+
+    def weights(self, observer, illuminant, wavelengths, dtype=numpy.float64):
+
+        """
+        description::
+            Returns the 3 x N weighting matrix of an observer and an
+            illuminant at the wavelengths of the data, from the cache if it
+            has been computed before. The matrix is shared with the cache and
+            is read only.
+
+        attributes::
+            observer
+                (string) The name of the observer
+
+            illuminant
+                (string) The name of the illuminant
+
+            wavelengths
+                (numpy ndarray) The N wavelengths of the data in nm
+
+            dtype
+                (numpy dtype [optional]) The type of the matrix. Defaults to
+                numpy.float64.
+
+        returns::
+            weights
+                (numpy ndarray) The 3 x N weighting matrix
+        """
+
+        self._check(observer, illuminant)
+
+        wavelengths = numpy.ascontiguousarray(wavelengths, dtype=numpy.float64)
+        dtype = numpy.dtype(dtype)
+        key = (observer, illuminant, wavelengths.tobytes(), dtype.str)
+
+        # The most recently used matrices are moved to the end of the cache
+        weights = self._cache.get(key)
+        if weights is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return weights
+        self.misses += 1
+
+        filename = None
+        if self._cacheDirectory is not None:
+            filename = os.path.join(self._cacheDirectory,\
+                                    'weights_{0}.npy'\
+                                    .format(self._digest(observer, illuminant,\
+                                                         wavelengths, dtype)))
+        if filename is not None and os.path.exists(filename):
+            weights = numpy.load(filename, allow_pickle=False)
+        else:
+            weights = color_science.weighting_matrix(\
+                *self.resample(observer, illuminant, wavelengths), dtype)
+            if filename is not None:
+                # Each writer saves to its own temporary file, so processes
+                # sharing the cache directory never publish a partial matrix
+                handle, temporary = tempfile.mkstemp(suffix='.npy',\
+                                                     dir=self._cacheDirectory)
+                try:
+                    with os.fdopen(handle, 'wb') as f:
+                        numpy.save(f, weights, allow_pickle=False)
+                    os.replace(temporary, filename)
+                except BaseException:
+                    os.remove(temporary)
+                    raise
+
+        weights.flags.writeable = False
+        self._cache[key] = weights
+        if len(self._cache) > self._maximumSize:
+            self._cache.popitem(last=False)
+
+        return weights
+
+    def _check(self, observer, illuminant):
+
+        # Raise a ValueError for an observer or illuminant that has not been
+        # registered
+        if observer not in self._observers:
+            msg = 'Provided observer "{0}" must be one of {1}'\
+                  .format(observer, self.observers)
+            raise ValueError(msg)
+        if illuminant not in self._illuminants:
+            msg = 'Provided illuminant "{0}" must be one of {1}'\
+                  .format(illuminant, self.illuminants)
+            raise ValueError(msg)
+
+    def _digest(self, observer, illuminant, wavelengths, dtype):
+
+        # A hash of everything a weighting matrix is computed from, so a saved
+        # matrix is not used once its observer or illuminant is replaced
+        digest = hashlib.sha1()
+        for array in self._observers[observer] + \
+                     self._illuminants[illuminant] + (wavelengths,):
+            digest.update(array.tobytes())
+        digest.update(dtype.str.encode())
+        return digest.hexdigest()
+
+    def ref2XYZ(self, refs, wavelengths, observer='CIE1931', illuminant='E',\
+                out=None):
+
+        """
+        description::
+            Calculates the XYZ tristimulus values of reflectance spectra
+            with the cached weighting matrix of an observer and an
+            illuminant, as color_science.ref2XYZ does with the color matching
+            functions and illuminant resampled to the wavelengths of refs
+
+        attributes::
+            refs
+                (numpy ndarray) The reflectance spectra, with the N
+                wavelengths on the last axis. Arrays of float32 are converted
+                in float32, others in float64 as in color_science.ref2XYZ.
+
+            wavelengths
+                (numpy ndarray) The N wavelengths of refs in nm
+
+            observer
+                (string [optional]) The name of the observer. Defaults to
+                'CIE1931'.
+
+            illuminant
+                (string [optional]) The name of the illuminant. Defaults to
+                'E'.
+
+            out
+                (numpy ndarray [optional]) An array to write the tristimulus
+                values to. Defaults to None, in which case a new array is
+                returned.
+
+        returns::
+            XYZ
+                (numpy ndarray) The X, Y and Z tristimulus values on the last
+                axis, out if it was given
+        """
+
+        refs = numpy.asarray(refs)
+        weights = self.weights(observer, illuminant, wavelengths,\
+                               numpy.result_type(refs.dtype, numpy.float32))
+        if refs.shape[-1:] != weights.shape[1:]:
+            msg = 'Provided refs must have the {0} values of the spectra on '\
+                  'its last axis, not {1}'.format(weights.shape[1], refs.shape)
+            raise ValueError(msg)
+
+        return numpy.matmul(refs, weights.T, out=out)
+
+
+def _spectrum(wavelengths, values, shape):
+
+    # Check and copy the wavelengths and values of a registered spectrum
+    wavelengths = numpy.array(wavelengths, dtype=numpy.float64).reshape(-1)
+    values = numpy.array(values, dtype=numpy.float64)
+    if values.shape != wavelengths.shape + shape or \
+       numpy.any(numpy.diff(wavelengths) <= 0):
+        msg = 'Provided wavelengths must be increasing and the values must '\
+              'be {0}, not {1}'.format(wavelengths.shape + shape, values.shape)
+        raise ValueError(msg)
+    return wavelengths, values
+
+
+def _lobe(wavelengths, mean, lowerWidth, upperWidth):
+
+    # A Gaussian with different widths below and above its mean
+    width = numpy.where(wavelengths < mean, lowerWidth, upperWidth)
+    return numpy.exp(-0.5*((wavelengths - mean)/width)**2)
+
+
+def _cie1931_cmfs(wavelengths):
+
+    # The multi-lobe fit of the CIE 1931 2 degree color matching functions by
+    # Wyman, Sloan and Shirley (2013)
+    x = 1.056*_lobe(wavelengths, 599.8, 37.9, 31.0) + \
+        0.362*_lobe(wavelengths, 442.0, 16.0, 26.7) - \
+        0.065*_lobe(wavelengths, 501.1, 20.4, 26.2)
+    y = 0.821*_lobe(wavelengths, 568.8, 46.9, 40.5) + \
+        0.286*_lobe(wavelengths, 530.9, 16.3, 31.1)
+    z = 1.217*_lobe(wavelengths, 437.0, 11.8, 36.0) + \
+        0.681*_lobe(wavelengths, 459.0, 26.0, 13.8)
+    return numpy.stack([x, y, z], axis=1)
+
+
+def _illuminant_a(wavelengths):
+
+    # The relative spectral power distribution of CIE illuminant A, 100 at
+    # 560 nm
+    c2 = 1.435e7
+    return 100*(560/wavelengths)**5*numpy.expm1(c2/(2848*560))/\
+           numpy.expm1(c2/(2848*wavelengths))
+
+
+if __name__ == '__main__':
+
+    import time
+
+    wavelengths = numpy.arange(400.0, 701.0, 10.0)
+    rng = numpy.random.default_rng(2016)
+    batches = [rng.random((64, 31)) for batch in range(10000)]
+
+    tables = color_science.WeightingTables(maximumSize=4,\
+                                           cacheDirectory=tempfile.mkdtemp())
+    print(tables)
+
+    # Many small batches: the weighting matrix is computed once
+    start = time.time()
+    for refs in batches:
+        cmfs, illum = tables.resample('CIE1931', 'A', wavelengths)
+        color_science.ref2XYZ(refs, cmfs, illum)
+    uncachedTime = time.time() - start
+    start = time.time()
+    for refs in batches:
+        XYZ = tables.ref2XYZ(refs, wavelengths, illuminant='A')
+    cachedTime = time.time() - start
+    print('{0} batches of {1} spectra in {2:.3f} seconds, {3:.3f} seconds '\
+          'resampled every batch'\
+          .format(len(batches), batches[0].shape[0], cachedTime,\
+                  uncachedTime))
+    print(tables)
+
+    # The white point of each illuminant, and a new registry that loads the
+    # weighting matrices saved by the first
+    for illuminant in tables.illuminants:
+        print('XYZ of a perfect reflector under {0} = {1}'\
+              .format(illuminant,\
+                      tables.ref2XYZ(numpy.ones(31), wavelengths,\
+                                     illuminant=illuminant)))
+    reloaded = color_science.WeightingTables(\
+        cacheDirectory=tables.cacheDirectory)
+    print('Saved weighting matrices = {0}, reloaded identically: {1}'\
+          .format(sorted(os.listdir(tables.cacheDirectory)),\
+                  numpy.array_equal(reloaded.weights('CIE1931', 'A',\
+                                                     wavelengths),\
+                                    tables.weights('CIE1931', 'A',\
+                                                   wavelengths))))
@@ -0,0 +1,91 @@
+import numpy
+
+def XYZ2Lab(XYZ, XYZn, out=None):
+
+    """
+    title::
+        XYZ2Lab
+
+    description::
+        This method will calculate the CIE L*a*b* values of colors given
+        their XYZ tristimulus values and the XYZ tristimulus values of the
+        light source, as the MATLAB XYZ2Lab does. The tristimulus values are
+        on the last axis, so XYZ may be a single color, an M x 3 array of
+        colors or a whole H x W x 3 image, and L*, a* and b* replace them on
+        the last axis. One temporary array of the size of XYZ is used.
+
+    attributes::
+        XYZ
+            (numpy ndarray) The XYZ tristimulus values of the colors on the
+            last axis. Arrays of float32 are converted in float32, others in
+            float64 as in ref2XYZ.
+
+        XYZn
+            (numpy ndarray) The 3 XYZ tristimulus values of the light source
+
+        out
+            (numpy ndarray [optional]) An array of the shape of XYZ, of a
+            floating point type, to write L*, a* and b* to. It may be XYZ
+            itself. Defaults to None, in which case a new array is returned.
+
+    returns::
+        Lab
+            (numpy ndarray) The L*, a* and b* values on the last axis, out if
+            it was given
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    XYZ = numpy.asarray(XYZ)
+    dtype = numpy.result_type(XYZ.dtype, numpy.float32)
+    XYZn = numpy.asarray(XYZn, dtype=dtype).reshape(3)
+    if XYZ.shape[-1:] != (3,):
+        msg = 'Provided XYZ must have 3 values on its last axis, not {0}'\
+              .format(XYZ.shape)
+        raise ValueError(msg)
+    if out is None:
+        out = numpy.empty(XYZ.shape, dtype=dtype)
+
+    # The cube root of the ratios to the light source, and a straight line
+    # through the ratios at or below 0.008856
+    ratios = numpy.divide(XYZ, XYZn, dtype=dtype)
+    f = numpy.cbrt(ratios)
+    dark = ratios <= 0.008856
+    f[dark] = 7.787*ratios[dark] + 16/116
+
+    numpy.subtract(f[..., 0], f[..., 1], out=out[..., 1])
+    out[..., 1] *= 500
+    numpy.subtract(f[..., 1], f[..., 2], out=out[..., 2])
+    out[..., 2] *= 200
+    numpy.multiply(f[..., 1], 116, out=out[..., 0])
+    out[..., 0] -= 16
+
+    return out
+
+
+if __name__ == '__main__':
+
+    import color_science
+
+    XYZn = numpy.array([95.047, 100.0, 108.883])
+    XYZ = numpy.array([[95.047, 100.0, 108.883],\
+                       [41.24, 21.26, 1.93],\
+                       [0.5, 0.5, 0.5]])
+
+    Lab = color_science.XYZ2Lab(XYZ, XYZn)
+    for color, values in zip(XYZ, Lab):
+        print('XYZ = {0} ----> Lab = {1}'.format(color, values))
+
+    # Converted in place in single precision
+    image = numpy.tile(XYZ.astype(numpy.float32), (4, 1, 1))
+    color_science.XYZ2Lab(image, XYZn, out=image)
+    print('{0} image converted in place, largest difference {1:.2e}'\
+          .format(image.dtype, numpy.max(numpy.abs(image - Lab))))
@@ -0,0 +1,71 @@
+import numpy
+
+def XYZ2xyY(XYZ, out=None):
+
+    """
+    title::
+        XYZ2xyY
+
+    description::
+        This method will calculate the x and y chromaticity coordinates of
+        colors given their XYZ tristimulus values, as the MATLAB XYZ2xyY
+        does. The tristimulus values are on the last axis, so XYZ may be a
+        single color, an M x 3 array of colors or a whole H x W x 3 image,
+        and x, y and Y replace them on the last axis.
+
+    attributes::
+        XYZ
+            (numpy ndarray) The XYZ tristimulus values of the colors on the
+            last axis. Arrays of float32 are converted in float32, others in
+            float64 as in ref2XYZ.
+
+        out
+            (numpy ndarray [optional]) An array of the shape of XYZ, of a
+            floating point type, to write x, y and Y to. It may be XYZ
+            itself. Defaults to None, in which case a new array is returned.
+
+    returns::
+        xyY
+            (numpy ndarray) The x and y chromaticity coordinates and the Y
+            tristimulus value on the last axis, out if it was given
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    XYZ = numpy.asarray(XYZ)
+    dtype = numpy.result_type(XYZ.dtype, numpy.float32)
+    if XYZ.shape[-1:] != (3,):
+        msg = 'Provided XYZ must have 3 values on its last axis, not {0}'\
+              .format(XYZ.shape)
+        raise ValueError(msg)
+    if out is None:
+        out = numpy.empty(XYZ.shape, dtype=dtype)
+
+    # Y is copied before x and y are written so that out may be XYZ, as Z is
+    # only needed for the sum
+    total = numpy.sum(XYZ, axis=-1, dtype=dtype, keepdims=True)
+    out[..., 2] = XYZ[..., 1]
+    numpy.divide(XYZ[..., :2], total, out=out[..., :2])
+
+    return out
+
+
+if __name__ == '__main__':
+
+    import color_science
+
+    XYZ = numpy.array([[95.047, 100.0, 108.883],\
+                       [41.24, 21.26, 1.93],\
+                       [18.05, 7.22, 95.05]])
+
+    xyY = color_science.XYZ2xyY(XYZ)
+    for color, values in zip(XYZ, xyY):
+        print('XYZ = {0} ----> xyY = {1}'.format(color, values))
@@ -0,0 +1,7 @@
+from .cube2XYZ import cube2XYZ
+from .ref2XYZ import ref2XYZ
+from .weighting_matrix import weighting_matrix
+from .XYZ2Lab import XYZ2Lab
+from .XYZ2xyY import XYZ2xyY
+from .WeightingTables import WeightingTables
+from .deltaEab import deltaEab
@@ -0,0 +1,218 @@
+import time
+
+import numpy
+
+import color_science
+
+def cube2XYZ(cube, cmfs, illum, outputs, XYZn=None, dtype=numpy.float32,\
+             maximumMemory=2**26, callback=None):
+
+    """
+    title::
+        cube2XYZ
+
+    description::
+        This method will convert a spectral reflectance cube of H x W pixels
+        and N bands to XYZ tristimulus values, and optionally to CIE L*a*b*
+        and xyY, one tile at a time, so cubes much larger than memory can be
+        converted. The cube may be an array, a numpy.memmap or the name of a
+        .npy file, which is memory mapped. The 3 x N weighting matrix is
+        computed once by weighting_matrix, and each tile of reflectances is
+        read into one reused buffer and converted with a single matrix
+        multiply, then to L*a*b* and xyY with XYZ2Lab and XYZ2xyY into
+        reused buffers, and written to the outputs. Tiles are whole rows of
+        the cube where they fit, so the cube and the outputs are read and
+        written in order, otherwise parts of a row. The buffers, and the
+        temporary arrays of XYZ2Lab, are sized to fit in maximumMemory, which
+        bounds the memory used however large the cube is.
+
+    attributes::
+        cube
+            (numpy ndarray or string) The H x W x N reflectance cube, or the
+            name of a .npy file of it
+
+        cmfs
+            (numpy ndarray) An N x 3 array of the x-bar, y-bar and z-bar color
+            matching functions at the N wavelengths of the cube
+
+        illum
+            (numpy ndarray) An array of the N values of the illuminant at the
+            wavelengths of the cube
+
+        outputs
+            (dictionary) The outputs keyed by 'XYZ', 'Lab' or 'xyY'. Each is
+            either an H x W x 3 array, e.g. a numpy.memmap, to write to, or
+            the name of a .npy file, which is created as a memory mapped
+            array of type dtype.
+
+        XYZn
+            (numpy ndarray [optional]) The 3 XYZ tristimulus values of the
+            light source for L*a*b*. Defaults to None, in which case those of
+            a perfect reflector under illum are used.
+
+        dtype
+            (numpy dtype [optional]) The floating point type the tiles are
+            converted in. Defaults to numpy.float32.
+
+        maximumMemory
+            (int [optional]) The number of bytes the tile buffers may use.
+            A tile is at least one pixel. Defaults to 2**26 (64 MB).
+
+        callback
+            (function [optional]) Called with the number of pixels converted
+            so far and the total number of pixels after every tile. Defaults
+            to None.
+
+    returns::
+        report
+            (dictionary) The shape of the cube under 'shape', the tile shape
+            under 'tile', the number of tiles, the elapsed seconds, the
+            pixels converted per second and the megabytes of the cube read
+            per second under 'pixelsPerSecond' and 'megabytesPerSecond', and
+            the output arrays under 'outputs'
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    if isinstance(cube, str):
+        cube = numpy.load(cube, mmap_mode='r')
+    if cube.ndim != 3:
+        msg = 'Provided cube must be H x W x N, not {0}'.format(cube.shape)
+        raise ValueError(msg)
+    if not set(outputs) <= {'XYZ', 'Lab', 'xyY'}:
+        msg = 'Provided outputs must be keyed by "XYZ", "Lab" or "xyY", not '\
+              '{0}'.format(sorted(outputs))
+        raise ValueError(msg)
+
+    rows, columns, bands = cube.shape
+    weights = color_science.weighting_matrix(cmfs, illum, dtype).T
+    if weights.shape[0] != bands:
+        msg = 'Provided cube has {0} bands but cmfs and illum have {1} '\
+              'wavelengths'.format(bands, weights.shape[0])
+        raise ValueError(msg)
+    if XYZn is None:
+        XYZn = numpy.sum(weights, axis=0, dtype=numpy.float64)
+
+    # Create the outputs that are given as file names
+    arrays = {}
+    for name, output in outputs.items():
+        if isinstance(output, str):
+            output = numpy.lib.format.open_memmap(output, mode='w+',\
+                                                  dtype=dtype,\
+                                                  shape=(rows, columns, 3))
+        elif output.shape != (rows, columns, 3):
+            msg = 'Provided output "{0}" must be {1}, not {2}'\
+                  .format(name, (rows, columns, 3), output.shape)
+            raise ValueError(msg)
+        arrays[name] = output
+
+    # The bytes of buffers per pixel: the reflectances, XYZ, L*a*b* and xyY,
+    # and the ratios, cube roots and mask of XYZ2Lab
+    itemsize = numpy.dtype(dtype).itemsize
+    pixelBytes = itemsize*(bands + 9) + \
+                 (itemsize*6 + 3 if 'Lab' in arrays else 0)
+    pixels = max(maximumMemory//pixelBytes, 1)
+    tileRows = min(max(pixels//columns, 1), rows)
+    tileColumns = min(pixels, columns)
+
+    buffer = numpy.empty((tileRows, tileColumns, bands), dtype=dtype)
+    XYZ = numpy.empty((tileRows, tileColumns, 3), dtype=dtype)
+    Lab = numpy.empty_like(XYZ) if 'Lab' in arrays else None
+    xyY = numpy.empty_like(XYZ) if 'xyY' in arrays else None
+
+    start = time.perf_counter()
+    done = 0
+    tiles = 0
+    for row in range(0, rows, tileRows):
+        for column in range(0, columns, tileColumns):
+            tile = (slice(row, row + tileRows),\
+                    slice(column, column + tileColumns))
+            reflectances = cube[tile]
+            height, width = reflectances.shape[:2]
+            view = (slice(0, height), slice(0, width))
+
+            # Read the tile into the buffer and convert it
+            numpy.copyto(buffer[view], reflectances, casting='unsafe')
+            numpy.matmul(buffer[view], weights, out=XYZ[view])
+            if 'XYZ' in arrays:
+                arrays['XYZ'][tile] = XYZ[view]
+            if Lab is not None:
+                color_science.XYZ2Lab(XYZ[view], XYZn, out=Lab[view])
+                arrays['Lab'][tile] = Lab[view]
+            if xyY is not None:
+                color_science.XYZ2xyY(XYZ[view], out=xyY[view])
+                arrays['xyY'][tile] = xyY[view]
+
+            done += height*width
+            tiles += 1
+            if callback is not None:
+                callback(done, rows*columns)
+
+    for array in arrays.values():
+        if isinstance(array, numpy.memmap):
+            array.flush()
+    elapsedTime = time.perf_counter() - start
+
+    return {'shape': cube.shape,
+            'tile': (tileRows, tileColumns),
+            'tiles': tiles,
+            'seconds': elapsedTime,
+            'pixelsPerSecond': rows*columns/elapsedTime,
+            'megabytesPerSecond': cube.nbytes/elapsedTime/2**20,
+            'outputs': arrays}
+
+
+if __name__ == '__main__':
+
+    import os
+    import tempfile
+
+    # Gaussian stand-ins for the color matching functions and a linear
+    # illuminant on 31 wavelengths from 400 to 700 nm
+    wavelengths = numpy.linspace(400, 700, 31)
+    cmfs = numpy.stack([numpy.exp(-((wavelengths - center)/width)**2/2)\
+                        for center, width in ((600, 38), (555, 45),\
+                                              (450, 22))], axis=1)
+    illum = numpy.linspace(50, 150, 31)
+
+    # A memory mapped 2048 x 2048 x 31 cube of float32 reflectances
+    directory = tempfile.mkdtemp()
+    cubeFile = os.path.join(directory, 'cube.npy')
+    cube = numpy.lib.format.open_memmap(cubeFile, mode='w+',\
+                                        dtype=numpy.float32,\
+                                        shape=(2048, 2048, 31))
+    rng = numpy.random.default_rng(2016)
+    for row in range(0, 2048, 256):
+        cube[row:row + 256] = rng.random((256, 2048, 31), dtype=numpy.float32)
+    cube.flush()
+    del cube
+
+    for maximumMemory in (2**20, 2**24, 2**26):
+        report = color_science.cube2XYZ(cubeFile, cmfs, illum,\
+                                        {name: os.path.join(directory,\
+                                                            name + '.npy')\
+                                         for name in ('XYZ', 'Lab', 'xyY')},\
+                                        maximumMemory=maximumMemory)
+        print('{0} cube in {1} tiles of {2} with {3} MB of buffers: '\
+              '{4:.2f} seconds, {5:.3g} pixels/second, {6:.1f} MB/second'\
+              .format(report['shape'], report['tiles'], report['tile'],\
+                      maximumMemory/2**20, report['seconds'],\
+                      report['pixelsPerSecond'],\
+                      report['megabytesPerSecond']))
+
+    # The tiles agree with converting a corner of the cube in memory
+    corner = numpy.load(cubeFile, mmap_mode='r')[:64, :64]
+    Lab = color_science.XYZ2Lab(color_science.ref2XYZ(corner, cmfs, illum),\
+                                color_science.ref2XYZ(numpy.ones(31), cmfs,\
+                                                      illum))
+    print('Largest difference from the in memory L*a*b* = {0:.2e}'\
+          .format(numpy.max(numpy.abs(report['outputs']['Lab'][:64, :64] -\
+                                      Lab))))
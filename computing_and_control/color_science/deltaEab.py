@@ -0,0 +1,76 @@
+import numpy
+
+def deltaEab(Lab1, Lab2, out=None):
+
+    """
+    title::
+        deltaEab
+
+    description::
+        This method will calculate the CIE 1976 color difference Delta E*ab
+        between two sets of CIE L*a*b* values, as the MATLAB deltaEab does.
+        The L*, a* and b* values are on the last axis, and the two sets are
+        broadcast against each other, so a whole H x W x 3 image may be
+        compared with a single color or with another image.
+
+    attributes::
+        Lab1
+            (numpy ndarray) The first L*a*b* values on the last axis
+
+        Lab2
+            (numpy ndarray) The second L*a*b* values on the last axis. Arrays
+            of float32 are compared in float32 if the other array is float32
+            too, otherwise in float64.
+
+        out
+            (numpy ndarray [optional]) An array of the broadcast shape of
+            Lab1 and Lab2 without the last axis, of a floating point type, to
+            write the differences to. Defaults to None, in which case a new
+            array is returned.
+
+    returns::
+        DEab
+            (numpy ndarray) The color differences, out if it was given
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    Lab1 = numpy.asarray(Lab1)
+    Lab2 = numpy.asarray(Lab2)
+    dtype = numpy.result_type(Lab1.dtype, Lab2.dtype, numpy.float32)
+    if Lab1.shape[-1:] != (3,) or Lab2.shape[-1:] != (3,):
+        msg = 'Provided Lab1 and Lab2 must have 3 values on their last '\
+              'axis, not {0} and {1}'.format(Lab1.shape, Lab2.shape)
+        raise ValueError(msg)
+
+    # The squared differences are computed in one temporary array
+    difference = numpy.subtract(Lab2, Lab1, dtype=dtype)
+    numpy.square(difference, out=difference)
+    total = numpy.sum(difference, axis=-1, out=out)
+
+    return numpy.sqrt(total, out=out)
+
+
+if __name__ == '__main__':
+
+    import color_science
+
+    Lab1 = numpy.array([[50.0, 2.6772, -79.7751],\
+                        [50.0, 0.0, 0.0],\
+                        [100.0, 0.0, 0.0]])
+    Lab2 = numpy.array([[50.0, 0.0, -82.7485],\
+                        [50.0, -1.0, 2.0],\
+                        [0.0, 0.0, 0.0]])
+
+    DEab = color_science.deltaEab(Lab1, Lab2)
+    for color1, color2, difference in zip(Lab1, Lab2, DEab):
+        print('Lab1 = {0}, Lab2 = {1} ----> DEab = {2:.4f}'\
+              .format(color1, color2, difference))
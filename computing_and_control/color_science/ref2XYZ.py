@@ -0,0 +1,105 @@
+import numpy
+
+import color_science
+
+def ref2XYZ(refs, cmfs, illum, out=None):
+
+    """
+    title::
+        ref2XYZ
+
+    description::
+        This method will calculate the XYZ tristimulus values of reflectance
+        spectra given the color matching functions of a CIE standard observer
+        and the spectral power distribution of an illuminant, as the MATLAB
+        ref2XYZ does. The spectra are on the last axis, so refs may be a
+        single spectrum, an M x N array of spectra or a whole H x W x N
+        spectral image, and the tristimulus values replace the spectra on the
+        last axis. The illuminant and the normalization constant k, which
+        gives a perfect reflector a Y of 100, are folded into one 3 x N
+        weighting matrix by weighting_matrix, so the N x N diag(illum) matrix
+        of the MATLAB version is never built and the conversion is a single
+        matrix multiply.
+
+    attributes::
+        refs
+            (numpy ndarray) The reflectance spectra, with the N wavelengths on
+            the last axis. Arrays of float32 are converted in float32, other
+            arrays in float64 unless they are integer arrays of 8 or 16 bits,
+            which are converted in float32.
+
+        cmfs
+            (numpy ndarray) An N x 3 array of the x-bar, y-bar and z-bar color
+            matching functions at the N wavelengths of refs
+
+        illum
+            (numpy ndarray) An array of the N values of the illuminant at the
+            wavelengths of refs
+
+        out
+            (numpy ndarray [optional]) An array of the shape of refs with 3 on
+            the last axis, of a floating point type, to write the tristimulus
+            values to. Defaults to None, in which case a new array is
+            returned.
+
+    returns::
+        XYZ
+            (numpy ndarray) The X, Y and Z tristimulus values on the last
+            axis, out if it was given
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    refs = numpy.asarray(refs)
+    dtype = numpy.result_type(refs.dtype, numpy.float32)
+    weights = color_science.weighting_matrix(cmfs, illum, dtype)
+    if refs.shape[-1:] != weights.shape[1:]:
+        msg = 'Provided refs must have the {0} values of the spectra on its '\
+              'last axis, not {1}'.format(weights.shape[1], refs.shape)
+        raise ValueError(msg)
+
+    return numpy.matmul(refs, weights.T, out=out)
+
+
+if __name__ == '__main__':
+
+    import time
+
+    # Gaussian stand-ins for the color matching functions and a linear
+    # illuminant on 31 wavelengths from 400 to 700 nm
+    wavelengths = numpy.linspace(400, 700, 31)
+    cmfs = numpy.stack([numpy.exp(-((wavelengths - center)/width)**2/2)\
+                        for center, width in ((600, 38), (555, 45),\
+                                              (450, 22))], axis=1)
+    illum = numpy.linspace(50, 150, 31)
+    refs = numpy.random.default_rng(2016).random((512, 512, 31))
+
+    # The MATLAB formula, one pixel per column
+    start = time.time()
+    k = 100/(cmfs[:, 1] @ illum)
+    matlab = k*cmfs.T @ numpy.diag(illum) @ refs.reshape(-1, 31).T
+    matlabTime = time.time() - start
+
+    for dtype in (numpy.float64, numpy.float32):
+        image = refs.astype(dtype)
+        out = numpy.empty(image.shape[:-1] + (3,), dtype=dtype)
+        start = time.time()
+        XYZ = color_science.ref2XYZ(image, cmfs, illum, out=out)
+        elapsedTime = time.time() - start
+        print('{0} ref2XYZ of a {1} image in {2:.4f} seconds (MATLAB '\
+              'formula {3:.4f} seconds), largest difference {4:.2e}'\
+              .format(numpy.dtype(dtype).name, image.shape, elapsedTime,\
+                      matlabTime,\
+                      numpy.max(numpy.abs(XYZ.reshape(-1, 3).T - matlab))))
+
+    # A perfect reflector has a Y of 100
+    print('XYZ of a perfect reflector = {0}'\
+          .format(color_science.ref2XYZ(numpy.ones(31), cmfs, illum)))
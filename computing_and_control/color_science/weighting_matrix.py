@@ -0,0 +1,57 @@
+import numpy
+
+def weighting_matrix(cmfs, illum, dtype=numpy.float64):
+
+    """
+    title::
+        weighting_matrix
+
+    description::
+        This method will calculate the 3 x N weighting matrix that converts
+        reflectance spectra at N wavelengths to XYZ tristimulus values, k
+        times the transposed color matching functions times diag(illum) in
+        the MATLAB ref2XYZ, where the normalization constant k gives a
+        perfect reflector a Y of 100. The matrix is computed once, without
+        building diag(illum), so that any number of spectra can then be
+        converted with a single matrix multiply each.
+
+    attributes::
+        cmfs
+            (numpy ndarray) An N x 3 array of the x-bar, y-bar and z-bar color
+            matching functions at the N wavelengths
+
+        illum
+            (numpy ndarray) An array of the N values of the illuminant at the
+            same wavelengths
+
+        dtype
+            (numpy dtype [optional]) The type of the matrix. It is always
+            computed in float64 first. Defaults to numpy.float64.
+
+    returns::
+        weights
+            (numpy ndarray) The 3 x N weighting matrix. The XYZ tristimulus
+            values of spectra on the last axis of refs are
+            refs @ weights.T.
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    cmfs = numpy.asarray(cmfs, dtype=numpy.float64)
+    illum = numpy.asarray(illum, dtype=numpy.float64).reshape(-1)
+    if cmfs.shape != (illum.size, 3):
+        msg = 'Provided cmfs and illum must have N x 3 and N values, not {0} '\
+              'and {1}'.format(cmfs.shape, illum.shape)
+        raise ValueError(msg)
+
+    k = 100/numpy.dot(cmfs[:, 1], illum)
+
+    return (cmfs.T*(k*illum)).astype(dtype, copy=False)
@@ -0,0 +1,369 @@
+"""
+title::
+    benchmark_histogram
+
+description::
+    This file will benchmark every histogram backend in the ipcv package
+    (histogram_brute_force, histogram_where, histogram_numpy,
+    histogram_opencv and any future histogram_* module) against synthetic
+    grayscale and color images of several sizes and bit depths. It checks that
+    all of the backends agree with one another, records the timings as JSON
+    and compares them against a stored baseline so that a backend that has
+    become slower than a configurable percentage is reported as a regression.
+    No image files are required.
+
+methods::
+    available_backends
+        Finds every histogram_* module in the ipcv package and returns its
+        histogram function keyed by the module name.
+
+    synthetic_image
+        Creates a reproducible random grayscale or color image with a given
+        size and bit depth.
+
+    run_benchmark
+        Times each backend on each synthetic image and checks that the
+        outputs of the backends agree.
+
+    compare_to_baseline
+        Compares benchmark results against a stored baseline and returns the
+        cases that have regressed.
+
+author::
+    Alex Perkins
+
+copyright::
+    Copyright (C) 2016, Rochester Institute of Technology
+
+version::
+    1.0.0
+
+"""
+
+import importlib.util
+import json
+import pkgutil
+import platform
+import time
+
+import numpy
+
+# Default image sizes (rows, columns), bit depths and number of color planes
+# that are benchmarked
+SIZES = ((64, 64), (256, 256), (512, 512))
+BIT_DEPTHS = (8, 10, 12, 16)
+PLANES = (1, 3)
+
+# The brute force and where backends scale with the number of pixels and the
+# number of pixel values respectively and are skipped for cases that would
+# take minutes to complete
+LIMITS = {'histogram_brute_force': {'maxPixels': 64*64, 'maxBitDepth': 10},
+          'histogram_where': {'maxPixels': 512*512, 'maxBitDepth': 12}}
+
+
+def available_backends():
+
+    """
+    description::
+        Finds every histogram_* module in the ipcv package and returns its
+        histogram function keyed by the module name. Backends that cannot be
+        imported (e.g. OpenCV is not installed) are left out.
+
+    returns::
+        backends
+            (dictionary) The histogram function of each backend keyed by its
+            module name, e.g. 'histogram_numpy'
+    """
+
+    # The package is found without being imported, as its __init__ imports
+    # the OpenCV backend, and each backend is loaded from its own file
+    package = importlib.util.find_spec('ipcv')
+
+    backends = {}
+    for moduleInfo in pkgutil.iter_modules(package.submodule_search_locations):
+        if not moduleInfo.name.startswith('histogram_'):
+            continue
+        spec = moduleInfo.module_finder.find_spec(moduleInfo.name)
+        module = importlib.util.module_from_spec(spec)
+        try:
+            spec.loader.exec_module(module)
+        except ImportError:
+            continue
+        if hasattr(module, 'histogram'):
+            backends[moduleInfo.name] = module.histogram
+
+    return backends
+
+
+def synthetic_image(rows, cols, bitDepth=8, planes=1, seed=0):
+
+    """
+    description::
+        Creates a reproducible random image. Images with a bit depth of 8 or
+        less are stored as uint8, deeper images are stored as uint16 as they
+        would be when read in by the cv2.imread function.
+
+    attributes::
+        rows
+            (int) The number of rows in the image
+
+        cols
+            (int) The number of columns in the image
+
+        bitDepth
+            (int [optional]) The bit depth of each color channel of the image.
+            Defaults to 8 bits per color channel.
+
+        planes
+            (int [optional]) 1 for a grayscale image or 3 for a color image.
+            Defaults to 1.
+
+        seed
+            (int [optional]) The seed of the random number generator. Defaults
+            to 0.
+
+    returns::
+        image
+            (numpy ndarray) A rows x cols (x planes) image
+    """
+
+    dataType = numpy.uint8 if bitDepth <= 8 else numpy.uint16
+    shape = (rows, cols) if planes == 1 else (rows, cols, planes)
+
+    rng = numpy.random.default_rng(seed)
+    image = rng.integers(0, 2**bitDepth, size=shape, dtype=dataType)
+
+    return image
+
+
+def _time_backend(histogram, image, bitDepth, repeats):
+
+    # Time the backend several times and keep the fastest and the median
+    # run. The fastest run is the least affected by other processes.
+    times = []
+    for repeat in range(repeats):
+        startTime = time.perf_counter()
+        output = histogram(image, bitDepth=bitDepth)
+        times.append(time.perf_counter() - startTime)
+
+    return output, min(times), float(numpy.median(times))
+
+
+def _normalize(output, maxCount):
+
+    # The backends return their lists in slightly different layouts (e.g.
+    # OpenCV returns an M x 1 histogram for grayscale images), so reshape
+    # each output to planes x maxCount before comparing
+    return [numpy.asarray(x, dtype=numpy.float64).reshape(-1, maxCount)
+            for x in output]
+
+
+def run_benchmark(backends=None, sizes=SIZES, bitDepths=BIT_DEPTHS,
+                  planes=PLANES, repeats=3, limits=LIMITS, seed=0):
+
+    """
+    description::
+        Times each backend on a synthetic image for every combination of
+        size, bit depth and number of planes. The histogram, PDF and CDF of
+        each backend are compared against the first backend that ran on the
+        same image.
+
+    attributes::
+        backends
+            (dictionary [optional]) Histogram functions keyed by name.
+            Defaults to every backend found by available_backends.
+
+        sizes
+            (tuple of tuples [optional]) The (rows, columns) of each image
+
+        bitDepths
+            (tuple of ints [optional]) The bit depths to benchmark
+
+        planes
+            (tuple of ints [optional]) The number of planes to benchmark, 1
+            for grayscale and 3 for color images
+
+        repeats
+            (int [optional]) The number of times each backend is timed on each
+            image. Defaults to 3.
+
+        limits
+            (dictionary [optional]) The maximum number of pixels
+            ('maxPixels') and bit depth ('maxBitDepth') each backend is run
+            on, keyed by backend name. Backends without an entry have no
+            limits.
+
+        seed
+            (int [optional]) The seed used to generate the images
+
+    returns::
+        results
+            (dictionary) The platform the benchmark was run on and a list of
+            cases. Each case records the backend, image shape, bit depth, the
+            fastest and median time in seconds, and whether the backend
+            agreed with the reference backend. Skipped cases have a time of
+            None.
+    """
+
+    if backends is None:
+        backends = available_backends()
+
+    # Prefer the numpy backend as the reference as it is both fast and
+    # exact
+    names = sorted(backends, key=lambda name: name != 'histogram_numpy')
+
+    cases = []
+    for rows, cols in sizes:
+        for bitDepth in bitDepths:
+            for numPlanes in planes:
+                image = synthetic_image(rows, cols, bitDepth, numPlanes, seed)
+                maxCount = 2**bitDepth
+                reference = None
+
+                for name in names:
+                    case = {'backend': name,
+                            'shape': list(image.shape),
+                            'bitDepth': bitDepth,
+                            'seconds': None,
+                            'medianSeconds': None,
+                            'agree': None}
+                    cases.append(case)
+
+                    limit = limits.get(name, {})
+                    if image.size > limit.get('maxPixels', float('inf')) or \
+                       bitDepth > limit.get('maxBitDepth', float('inf')):
+                        continue
+
+                    output, best, median = _time_backend(backends[name],
+                                                         image, bitDepth,
+                                                         repeats)
+                    case['seconds'] = best
+                    case['medianSeconds'] = median
+
+                    # Compare the histogram exactly and the PDF and CDF to
+                    # within floating point accumulation error
+                    output = _normalize(output, maxCount)
+                    if reference is None:
+                        reference = output
+                        case['agree'] = True
+                    else:
+                        case['agree'] = bool(
+                            numpy.array_equal(output[0], reference[0]) and
+                            numpy.allclose(output[1], reference[1],
+                                           rtol=1e-6, atol=1e-9) and
+                            numpy.allclose(output[2], reference[2],
+                                           rtol=1e-6, atol=1e-9))
+
+    results = {'platform': platform.platform(),
+               'python': platform.python_version(),
+               'numpy': numpy.__version__,
+               'cases': cases}
+
+    return results
+
+
+def _case_key(case):
+    return (case['backend'], tuple(case['shape']), case['bitDepth'])
+
+
+def compare_to_baseline(results, baseline, tolerance=10.0):
+
+    """
+    description::
+        Compares the fastest time of each case against the same case in a
+        baseline. A case has regressed if it is more than tolerance percent
+        slower than the baseline. Cases that are missing or were skipped in
+        either set of results are ignored.
+
+    attributes::
+        results
+            (dictionary) Results returned by run_benchmark
+
+        baseline
+            (dictionary) Results returned by an earlier run of run_benchmark
+
+        tolerance
+            (float [optional]) The allowable slow down in percent. Defaults
+            to 10 percent.
+
+    returns::
+        regressions
+            (list of dictionaries) The backend, shape, bit depth, baseline
+            time, current time and slow down in percent of each case that has
+            regressed
+    """
+
+    baselineTimes = {_case_key(case): case['seconds']
+                     for case in baseline['cases']}
+
+    regressions = []
+    for case in results['cases']:
+        baselineTime = baselineTimes.get(_case_key(case))
+        if baselineTime is None or case['seconds'] is None:
+            continue
+
+        slowDown = (case['seconds']/baselineTime - 1)*100
+        if slowDown > tolerance:
+            regressions.append({'backend': case['backend'],
+                                'shape': case['shape'],
+                                'bitDepth': case['bitDepth'],
+                                'baselineSeconds': baselineTime,
+                                'seconds': case['seconds'],
+                                'slowDown': slowDown})
+
+    return regressions
+
+
+if __name__ == '__main__':
+
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='Benchmark the ipcv '\
+                                     'histogram backends')
+    parser.add_argument('--output', default='histogram_benchmark.json',
+                        help='file the results are written to as JSON')
+    parser.add_argument('--baseline',
+                        help='JSON results of an earlier run to compare to')
+    parser.add_argument('--tolerance', type=float, default=10.0,
+                        help='allowable slow down in percent')
+    parser.add_argument('--repeats', type=int, default=3)
+    arguments = parser.parse_args()
+
+    results = run_benchmark(repeats=arguments.repeats)
+    with open(arguments.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    failed = False
+    print('{0:<24}{1:<18}{2:<6}{3:>14}{4:>8}'.format('Backend', 'Shape',
+                                                     'Bits', 'Time [s]',
+                                                     'Agree'))
+    for case in results['cases']:
+        seconds = case['seconds']
+        print('{0:<24}{1:<18}{2:<6}{3:>14}{4:>8}'\
+              .format(case['backend'], str(tuple(case['shape'])),
+                      case['bitDepth'],
+                      'skipped' if seconds is None else
+                      '{0:.6f}'.format(seconds),
+                      str(case['agree'])))
+        if case['agree'] is False:
+            failed = True
+
+    if arguments.baseline:
+        with open(arguments.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline,
+                                          arguments.tolerance)
+        for regression in regressions:
+            print('Regression: {0} {1} {2}-bit is {3:.1f}% slower '\
+                  '({4:.6f} [s] -> {5:.6f} [s])'\
+                  .format(regression['backend'],
+                          tuple(regression['shape']),
+                          regression['bitDepth'],
+                          regression['slowDown'],
+                          regression['baselineSeconds'],
+                          regression['seconds']))
+        if regressions:
+            failed = True
+
+    sys.exit(1 if failed else 0)
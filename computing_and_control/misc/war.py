@@ -9,7 +9,8 @@ description::
     playing the game. Following the rules of War, if the two players draw
     the same card during a battle, a "war" sequence starts. It will then count
     the number of war sequences that are played. Once the number of simulations
-    have been reached the stats for the game are printed.
+    have been reached the stats for the game are printed. The games are
+    played across a pool of worker processes, one core each.
 
 methods::
     shuffle_and_deal
@@ -30,6 +31,12 @@ methods::
         a player runs out of cards during the war, the other player is 
         considered the winner of the war.
 
+    simulate
+        Plays a number of games across a pool of worker processes, each chunk
+        of games with its own seeded random number generator, and returns
+        the aggregated statistics. The statistics are reproducible for a
+        given seed.
+
 author::
     Alex Perkins
 
@@ -41,9 +48,15 @@ version::
 
 """
 
+import collections
+import multiprocessing
+import os
 import random
 
-def shuffle_and_deal():
+import war_statistics
+import war_trace
+
+def shuffle_and_deal(rng=random):
 
     """
     description::
@@ -51,30 +64,35 @@ def shuffle_and_deal():
         so that each player has 26 cards. The card numbers 11-14 represent
         Jacks, Queens, Kings, and Aces respectively.
 
+    attributes::
+        rng
+            (random.Random or module [optional]) The random number generator
+            used to shuffle the deck. Defaults to the random module.
+
     returns::
         player1Hand
-            (list of integers) Player 1's hand of the 26 cards dealt to them
+            (deque of integers) Player 1's hand of the 26 cards dealt to them
 
         player2Hand
-            (list of integers) Player 2's hand of the 26 cards dealt to them
+            (deque of integers) Player 2's hand of the 26 cards dealt to them
     """
     
-    player1Hand = []
-    player2Hand = []
     deck = [2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14]*4
 
     # Shuffle the deck
-    random.shuffle(deck)
+    rng.shuffle(deck)
 
-    # Deal cards to each player
-    for card in range(int(len(deck)/2)):
-        player1Hand.append(deck.pop(0))
-        player2Hand.append(deck.pop(0))
+    # Deal cards to each player, alternating one card at a time from the top
+    # of the deck
+    player1Hand = collections.deque(deck[0::2])
+    player2Hand = collections.deque(deck[1::2])
 
     return player1Hand, player2Hand
 
 
-def play(player1Hand, player2Hand):
+def play(player1Hand, player2Hand, rng=random, shuffleWinnings=True,\
+         maximumBattles=None, detectCycles=None, warDepths=None,\
+         outcomes=None, cardsPerWar=4):
 
     """
     description::
@@ -82,21 +100,67 @@ def play(player1Hand, player2Hand):
         deck. The card with the highest number wins that "battle". If the two
         cards are equal to each other a "war" sequence starts. When the war 
         sequence is complete the regular "battles" continue. Once a player has
-        all 52 cards the game is over and that player wins.
+        all 52 cards the game is over and that player wins. The hands are
+        held as deques so that cards are taken from the top and added to the
+        bottom in constant time. Hands dealt from any other deck, and wars of
+        any number of cards, are played the same way, the game ending when
+        one player has every card.
+
+        If the winnings are not shuffled the game is deterministic and may
+        loop forever. With cycle detection on, both hands are encoded as one
+        bytes object before every battle and compared with a single saved
+        state using Brent's algorithm, which saves the state at every power
+        of two battles, so a loop is found within a few times its length.
+        The state is only encoded when Player 1's hand is the size it was
+        when the state was saved, which keeps the check cheap. A game that
+        repeats a state, or that reaches maximumBattles, is a draw.
 
     attributes::
         player1Hand
-            (list of integers) Player 1's hand of 26 cards with values ranging
-            from 2-14
+            (deque or list of integers) Player 1's hand of 26 cards with values
+            ranging from 2-14
 
         player2Hand
-            (list of integers) Player 2's hand of 26 cards with values ranging
-            from 2-14
+            (deque or list of integers) Player 2's hand of 26 cards with values
+            ranging from 2-14
+
+        rng
+            (random.Random or module [optional]) The random number generator
+            used to shuffle the winnings. Defaults to the random module.
+
+        shuffleWinnings
+            (boolean [optional]) Whether the winnings are shuffled before they
+            are added to the bottom of the winner's hand. If False they are
+            added in the order they were laid down. Defaults to True.
+
+        maximumBattles
+            (integer [optional]) The number of battles after which the game is
+            a draw. Defaults to None, in which case there is no limit.
+
+        detectCycles
+            (boolean [optional]) Whether a game that repeats a state is a
+            draw. Defaults to None, in which case cycles are detected only if
+            the winnings are not shuffled, as a repeated state is only a loop
+            when the game is deterministic.
+
+        warDepths
+            (collections.Counter [optional]) If given, the number of war
+            sequences of every war is counted in it, with no limit on the
+            depth of a war. Defaults to None.
+
+        outcomes
+            (bytearray [optional]) If given, the outcome of every battle is
+            appended to it as one byte, encoded as described in war_trace.
+            Defaults to None.
+
+        cardsPerWar
+            (integer [optional]) The number of cards each player lays down in
+            a war, see begin_war. Defaults to 4.
 
     returns::
         winner
             (integer) The winner of the game. Either 1 or 2 representing 
-            Player 1 or Player 2.
+            Player 1 or Player 2, or 0 if the game was a draw.
 
         numBattles
             (integer) The number of battles that took place during the game.
@@ -121,38 +185,73 @@ def play(player1Hand, player2Hand):
     winner = 0
     numBattles = 0
     warHistogram = [0]*6
+    if not isinstance(player1Hand, collections.deque):
+        player1Hand = collections.deque(player1Hand)
+    if not isinstance(player2Hand, collections.deque):
+        player2Hand = collections.deque(player2Hand)
+    if detectCycles is None:
+        detectCycles = not shuffleWinnings
+    savedState = None
+    savedLength = None
+    power = 1
+    steps = 0
 
     while True:
 
-        # Check which player wins the game
-        if len(player1Hand) == 52:
+        # Check which player wins the game. Every card is in a hand between
+        # battles, so a player with all of the cards leaves the other none.
+        if not player2Hand:
             winner = player1
             break
-        elif len(player2Hand) == 52:
+        elif not player1Hand:
             winner = player2
             break
+
+        # The game is a draw once it reaches the maximum number of battles
+        if maximumBattles is not None and numBattles >= maximumBattles:
+            break
+
+        # The game is a draw if it returns to the saved state. The state is
+        # saved again after every power of two battles (Brent's algorithm).
+        # Card values are never 0, so 0 separates the two hands. The state is
+        # only encoded when Player 1's hand is the size it was when saved.
+        if detectCycles:
+            if len(player1Hand) == savedLength and \
+               bytes(player1Hand) + b'\x00' + bytes(player2Hand) == savedState:
+                break
+            steps += 1
+            if steps == power:
+                savedState = bytes(player1Hand) + b'\x00' + bytes(player2Hand)
+                savedLength = len(player1Hand)
+                power *= 2
+                steps = 0
         
         # Players begin a battle, each laying down a card
-        winningDeck = []
-        winningDeck.append(player1Hand.pop(0))
-        winningDeck.append(player2Hand.pop(0))
+        winningDeck = [player1Hand.popleft(), player2Hand.popleft()]
         numBattles += 1
 
         # Check if Player 1's card value is greater than Player 2's card value
         if winningDeck[0] > winningDeck[1]:
-            random.shuffle(winningDeck)
+            if shuffleWinnings:
+                rng.shuffle(winningDeck)
             player1Hand.extend(winningDeck)
+            if outcomes is not None:
+                outcomes.append(player1)
         
         # Begin war sequence if both cards are equal
         elif winningDeck[0] == winningDeck[1]:
             player1Hand, player2Hand, numBattles, warHistogram = \
             begin_war(player1Hand, player2Hand, winningDeck, numBattles,\
-            warHistogram)
+            warHistogram, rng, shuffleWinnings, warDepths, outcomes,\
+            cardsPerWar)
 
         # Player 2 wins the battle if other checks are not met
         else:
-            random.shuffle(winningDeck)
+            if shuffleWinnings:
+                rng.shuffle(winningDeck)
             player2Hand.extend(winningDeck)
+            if outcomes is not None:
+                outcomes.append(player2)
     
     # Count number of wars that occurred during the game. Multipliers are added
     # to account for the fact that double wars and above are two wars or more
@@ -163,26 +262,29 @@ def play(player1Hand, player2Hand):
     return winner, numBattles, numWars, warHistogram
 
 
-def begin_war(player1Hand, player2Hand, winningDeck, numBattles, warHistogram):
+def begin_war(player1Hand, player2Hand, winningDeck, numBattles, warHistogram,\
+              rng=random, shuffleWinnings=True, warDepths=None,\
+              outcomes=None, cardsPerWar=4):
 
     """
     description::
-        Starts a war sequence. Both players put down four cards from the top of
-        their decks. The value of the fourth card determines the winner of the
-        war. Whichever card has the highest value, the player that put down
-        that card wins the war. If the fourth cards equal each other another 
-        war sequence begins until a winner is determined. Only up to six wars
-        can be played in this version of war. If a player runs out of cards
-        during a war sequence, the other player is determined the winner of the
-        war sequence.
+        Starts a war sequence. Both players put down four cards, or
+        cardsPerWar cards, from the top of their decks. The value of the last
+        card determines the winner of the war. Whichever card has the highest
+        value, the player that put down that card wins the war. If the last
+        cards equal each other another war sequence begins until a winner is
+        determined. Only up to six wars are counted in warHistogram in this
+        version of war, but every war is counted in warDepths if it is given.
+        If a player runs out of cards during a war sequence, the other player
+        is determined the winner of the war sequence.
 
     attributes::
         player1Hand
-            (list of integers) Player 1's hand of cards. Values of cards range
+            (deque of integers) Player 1's hand of cards. Values of cards range
             from 2-14.
 
         player2Hand
-            (list of integers) Player 2's hand of cards. Values of cards range
+            (deque of integers) Player 2's hand of cards. Values of cards range
             from 2-14.
     
         winningDeck
@@ -203,13 +305,34 @@ def begin_war(player1Hand, player2Hand, winningDeck, numBattles, warHistogram):
             4th position: 5-war sequence
             5th position: 6-war sequence
 
+        rng
+            (random.Random or module [optional]) The random number generator
+            used to shuffle the winnings. Defaults to the random module.
+
+        shuffleWinnings
+            (boolean [optional]) Whether the winnings are shuffled before they
+            are added to the bottom of the winner's hand. Defaults to True.
+
+        warDepths
+            (collections.Counter [optional]) If given, the number of war
+            sequences of the war is counted in it. Defaults to None.
+
+        outcomes
+            (bytearray [optional]) If given, the winner and the number of war
+            sequences of the war are appended to it as one byte, encoded as
+            described in war_trace. Defaults to None.
+
+        cardsPerWar
+            (integer [optional]) The number of cards each player lays down in
+            every war sequence. Defaults to 4.
+
     returns::
         player1Hand
-            (list of integers) Player 1's hand of cards. Value of cards range
+            (deque of integers) Player 1's hand of cards. Value of cards range
             from 2-14
         
         player2Hand
-            (list of integers) Player 2's hand of cards. Value of cards range
+            (deque of integers) Player 2's hand of cards. Value of cards range
             from 2-14
 
         numBattles
@@ -234,19 +357,29 @@ def begin_war(player1Hand, player2Hand, winningDeck, numBattles, warHistogram):
 
         numBattles += 1
 
-        # Players lay down 4 cards
-        for i in range(4):
+        # Players lay down 4 cards, or cardsPerWar cards
+        for i in range(cardsPerWar):
             try:
-                winningDeck.append(player1Hand.pop(0))
-                winningDeck.append(player2Hand.pop(0))
+                winningDeck.append(player1Hand.popleft())
+                winningDeck.append(player2Hand.popleft())
 
             # If a player runs out of cards the other player wins the war
             except IndexError:
-                random.shuffle(winningDeck)
+                if shuffleWinnings:
+                    rng.shuffle(winningDeck)
                 if len(player1Hand) == 0:
                     player2Hand.extend(winningDeck)
+                    warWinner = 2
                 else:
                     player1Hand.extend(winningDeck)
+                    warWinner = 1
+
+                if warDepths is not None:
+                    warDepths[warSequence + 1] += 1
+                if outcomes is not None:
+                    outcomes.append(warWinner | min(warSequence + 1,\
+                                    war_trace.MAXIMUM_DEPTH) << \
+                                    war_trace.DEPTH_SHIFT)
 
                 # If six war sequences have occurred, the war ends
                 if warSequence > 5:
@@ -255,25 +388,41 @@ def begin_war(player1Hand, player2Hand, winningDeck, numBattles, warHistogram):
                     warHistogram[warSequence] += 1
                     return player1Hand, player2Hand, numBattles,  warHistogram
 
-        # Check if Player 1's 4th card is of greater value than Player 2's 4th
-        # card
+        # Check if Player 1's last card is of greater value than Player 2's
+        # last card
         if winningDeck[-2] > winningDeck[-1]:
-            random.shuffle(winningDeck)
+            if shuffleWinnings:
+                rng.shuffle(winningDeck)
             player1Hand.extend(winningDeck)
-            warHistogram[warSequence] += 1
+            if warSequence <= 5:
+                warHistogram[warSequence] += 1
+            if warDepths is not None:
+                warDepths[warSequence + 1] += 1
+            if outcomes is not None:
+                outcomes.append(1 | min(warSequence + 1,\
+                                war_trace.MAXIMUM_DEPTH) << \
+                                war_trace.DEPTH_SHIFT)
             continueWar = False
             break
 
-        # Check if Player 2's 4th card is of greater value than Player 1's 4th
-        # card
+        # Check if Player 2's last card is of greater value than Player 1's
+        # last card
         elif winningDeck[-2] < winningDeck[-1]:
-            random.shuffle(winningDeck)
+            if shuffleWinnings:
+                rng.shuffle(winningDeck)
             player2Hand.extend(winningDeck)
-            warHistogram[warSequence] += 1
+            if warSequence <= 5:
+                warHistogram[warSequence] += 1
+            if warDepths is not None:
+                warDepths[warSequence + 1] += 1
+            if outcomes is not None:
+                outcomes.append(2 | min(warSequence + 1,\
+                                war_trace.MAXIMUM_DEPTH) << \
+                                war_trace.DEPTH_SHIFT)
             continueWar = False
             break
 
-        # Continues war sequence if both of the 4th cards are equal to each 
+        # Continues war sequence if both of the last cards are equal to each 
         # other
         else:
             warSequence += 1
@@ -281,34 +430,225 @@ def begin_war(player1Hand, player2Hand, winningDeck, numBattles, warHistogram):
     return player1Hand, player2Hand, numBattles,  warHistogram
 
 
+def _simulate_chunk(task):
+
+    # Play one chunk of games with its own random number generator and return
+    # only the aggregated counters. The generator is seeded from the seed and
+    # the chunk number, so the counters do not depend on which process plays
+    # the chunk. Every game is dealt and played with a generator seeded from
+    # it, so that any game can be replayed from its seed alone, and if the
+    # games are traced their encoded records are returned too. With bulk
+    # deals every deck of the chunk is shuffled at once by NumPy from a seed
+    # drawn from the chunk's generator, and each game's generator is then
+    # only used to shuffle its winnings.
+    seed, chunk, games, shuffleWinnings, maximumBattles, trace, bulkDeals = \
+        task
+    rng = random.Random('{0}:{1}'.format(seed, chunk))
+    records = [] if trace else None
+    outcomes = None
+    if bulkDeals:
+
+        # Imported here as NumPy is only needed for bulk deals
+        import numpy
+        import war_vectorized
+
+        decks = war_vectorized.deal_decks(games, numpy.random.default_rng(\
+                                          rng.getrandbits(128))).tolist()
+
+    # Wins are indexed by the winner, 0 counting draws
+    wins = [0, 0, 0]
+    totalBattles = 0
+    totalWars = 0
+    totalHistogram = [0]*6
+    distributions = war_statistics.WarStatistics()
+    for game in range(games):
+        gameSeed = rng.getrandbits(64)
+        gameRng = random.Random(gameSeed)
+        if bulkDeals:
+            player1Hand = collections.deque(decks[game][0::2])
+            player2Hand = collections.deque(decks[game][1::2])
+        else:
+            player1Hand, player2Hand = shuffle_and_deal(gameRng)
+        if trace:
+            deal = bytes(player1Hand), bytes(player2Hand)
+            outcomes = bytearray()
+        warDepths = collections.Counter()
+        winner, numBattles, numWars, warHistogram = \
+            play(player1Hand, player2Hand, gameRng, shuffleWinnings,\
+                 maximumBattles, warDepths=warDepths, outcomes=outcomes)
+        if trace:
+            records.append(war_trace.encode_game(gameSeed, deal[0], deal[1],\
+                                                 winner, numBattles,\
+                                                 outcomes))
+        wins[winner] += 1
+        totalBattles += numBattles
+        totalWars += numWars
+        for i in range(6):
+            totalHistogram[i] += warHistogram[i]
+        distributions.update(winner, numBattles, numWars, warDepths)
+
+    return games, wins, totalBattles, totalWars, totalHistogram, \
+           distributions, records
+
+
+def simulate(games, workers=None, seed=0, chunkSize=10000, callback=None,\
+             shuffleWinnings=True, maximumBattles=None, targets=None,\
+             confidence=0.95, traceFile=None, bulkDeals=False):
+
+    """
+    description::
+        Plays a number of games of War across a pool of worker processes.
+        The games are split into chunks of chunkSize games. Each chunk is
+        played with its own random.Random seeded from the seed and the chunk
+        number, and returns only its aggregated counters, which are summed
+        in chunk order. The statistics are therefore reproducible for a given
+        seed and chunkSize regardless of the number of workers, and whether
+        or not the games are traced. If targets are given, no more chunks are
+        played once the confidence interval of every statistic in targets is
+        narrow enough, so games is then the most games that will be played.
+
+    attributes::
+        games
+            (integer) The number of games to play
+
+        workers
+            (integer [optional]) The number of worker processes. Defaults to
+            None, in which case the number of CPUs is used. With 1 the games
+            are played in this process.
+
+        seed
+            (integer [optional]) The seed from which every chunk's random
+            number generator is derived. Defaults to 0.
+
+        chunkSize
+            (integer [optional]) The number of games in a chunk. Defaults to
+            10000.
+
+        callback
+            (function [optional]) Called with the number of games played so
+            far and the total number of games after every chunk. Defaults to
+            None.
+
+        shuffleWinnings
+            (boolean [optional]) Whether the winnings are shuffled, see play.
+            Defaults to True.
+
+        maximumBattles
+            (integer [optional]) The number of battles after which a game is
+            a draw, see play. Defaults to None.
+
+        targets
+            (dictionary [optional]) The largest acceptable half-width of the
+            confidence interval of statistics in war_statistics.NAMES, e.g.
+            {'numBattles': 0.5}. Defaults to None, in which case every game
+            is played.
+
+        confidence
+            (float [optional]) The confidence level of the intervals compared
+            with targets. Defaults to 0.95.
+
+        traceFile
+            (string [optional]) If given, every game is appended, in order,
+            to the war_trace trace of this name, which can be read and
+            replayed with war_trace.TraceReader. Defaults to None.
+
+        bulkDeals
+            (boolean [optional]) Whether the decks of each chunk are shuffled
+            all at once by war_vectorized.deal_decks rather than one game at
+            a time. The statistics are then reproducible for a given seed
+            but differ from those without bulk deals, and the games cannot
+            be traced, as a game is no longer dealt from its own seed.
+            Defaults to False.
+
+    returns::
+        statistics
+            (dictionary) The number of games played, the number of wins of
+            each player keyed by 1 and 2 under 'wins', the number of drawn
+            games under 'draws', the total numBattles, numWars and
+            warHistogram over all of the games, and the full distributions of
+            the game lengths and war depths as a war_statistics.WarStatistics
+            under 'distributions'
+    """
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if bulkDeals and traceFile is not None:
+        msg = 'Provided attributes "bulkDeals" and "traceFile" cannot be '\
+              'combined, as bulk dealt games cannot be replayed'
+        raise ValueError(msg)
+
+    tasks = [(seed, chunk, min(chunkSize, games - start), shuffleWinnings,\
+              maximumBattles, traceFile is not None, bulkDeals)\
+             for chunk, start in enumerate(range(0, games, chunkSize))]
+
+    statistics = {'games': 0,
+                  'wins': {1: 0, 2: 0},
+                  'draws': 0,
+                  'numBattles': 0,
+                  'numWars': 0,
+                  'warHistogram': [0]*6,
+                  'distributions': war_statistics.WarStatistics()}
+
+    def merge(counters):
+        chunkGames, wins, numBattles, numWars, warHistogram, distributions, \
+            records = counters
+        if records is not None:
+            for record in records:
+                writer.append(record)
+        statistics['games'] += chunkGames
+        statistics['draws'] += wins[0]
+        statistics['wins'][1] += wins[1]
+        statistics['wins'][2] += wins[2]
+        statistics['numBattles'] += numBattles
+        statistics['numWars'] += numWars
+        for i in range(6):
+            statistics['warHistogram'][i] += warHistogram[i]
+        statistics['distributions'].merge(distributions)
+        if callback is not None:
+            callback(statistics['games'], games)
+
+        # Whether the statistics are precise enough to stop
+        return targets is not None and \
+               statistics['distributions'].converged(targets, confidence)
+
+    writer = None
+    if traceFile is not None:
+        writer = war_trace.TraceWriter(traceFile, shuffleWinnings,\
+                                       maximumBattles)
+
+    try:
+        if workers == 1:
+            for task in tasks:
+                if merge(_simulate_chunk(task)):
+                    break
+        else:
+            with multiprocessing.Pool(workers) as pool:
+                for counters in pool.imap(_simulate_chunk, tasks):
+                    if merge(counters):
+                        break
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return statistics
+
+
 if __name__ == '__main__':
 
-    import os
     import time
-    from operator import add
+
+    def progress(done, total):
+        print('Simulating {0} games... {1:.2f}% complete'\
+              .format(total, (done/total)*100), end='\r')
 
     simulations = [100000, 1000000]
 
     for games in simulations:
 
-        winnerStat = {1:0, 2:0}
-        numBattlesStat = 0
-        numWarsStat = 0
-        warHistogramStat = [0] * 6
-
         start = time.time()
-        for i in range(games):
-
-            print('Simulating {0} games... {1:.2f}% complete'\
-                  .format(games, (i/games)*100), end='\r')
-
-            player1Hand, player2Hand = shuffle_and_deal()
-            winner, numBattles, numWars, warHistogram = play(player1Hand,\
-                                                             player2Hand)
-            winnerStat[winner] += 1
-            numBattlesStat += numBattles
-            numWarsStat += numWars
-            warHistogramStat = list(map(add, warHistogramStat, warHistogram))
+        statistics = simulate(games, seed=2016, callback=progress)
+        warHistogramStat = statistics['warHistogram']
 
         elapsedTime = time.time() - start
         print('\nPlayer 1 wins = {0}\n'\
@@ -323,9 +663,9 @@ if __name__ == '__main__':
               'Average 6-war sequences/game = {9:.6f}\n'\
               'The elapsed time to complete {10} simulations was {11:.2f} '\
               'seconds\n'\
-              .format(winnerStat[1], winnerStat[2],\
-                      numBattlesStat/games,\
-                      numWarsStat/games,\
+              .format(statistics['wins'][1], statistics['wins'][2],\
+                      statistics['numBattles']/games,\
+                      statistics['numWars']/games,\
                       warHistogramStat[0]/games,\
                       warHistogramStat[1]/games,\
                       warHistogramStat[2]/games,\
@@ -333,3 +673,23 @@ if __name__ == '__main__':
                       warHistogramStat[4]/games,\
                       warHistogramStat[5]/games,\
                       games, elapsedTime))
+
+        distributions = statistics['distributions']
+        lower, upper = distributions.confidence_interval('numBattles')
+        print('95% confidence interval of battles/game = [{0:.3f}, {1:.3f}]\n'\
+              'Battles/game 5th, 50th, 95th and 99th percentiles = {2}\n'\
+              'Wars of every depth = {3}\n'\
+              'War depth 50th, 99th and 99.99th percentiles = {4}\n'\
+              .format(lower, upper, [distributions.percentile(q)\
+                                     for q in (5, 50, 95, 99)],\
+                      distributions.war_histogram(),\
+                      [distributions.percentile(q, 'warDepths')\
+                       for q in (50, 99, 99.99)]))
+
+    # Stop as soon as the mean battles/game and the win rate of Player 1 are
+    # known to within 0.5 battles and 0.1% with 95% confidence
+    statistics = simulate(10**8, seed=2016, callback=progress,\
+                          targets={'numBattles': 0.5,\
+                                   'player1WinRate': 0.001})
+    print('\nStopped after {0} games: {1}'\
+          .format(statistics['games'], statistics['distributions']))
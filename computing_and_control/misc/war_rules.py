@@ -0,0 +1,475 @@
+"""
+title::
+    war_rules
+
+description::
+    This file will play variants of the card game War described by a
+    WarRules object: the number of cards each player lays down in a war,
+    whether the winnings are shuffled, the composition of the deck, the
+    number of players and an optional cap on the number of battles. Every two
+    player variant is played by the tuned engine in war.py, so the standard
+    game's results for a given seed are those of war.simulate, and variants of
+    more players by a general engine for any number of players. A sweep runner
+    plays a grid of variants across a pool of worker processes and caches
+    the statistics of each variant on disk, keyed by the rules, the seed and
+    the number of games, so a sweep that is run again, or extended with new
+    variants, only plays the variants it has not played before.
+
+classes::
+    WarRules
+        The rules of a variant of War.
+
+methods::
+    deal
+        Shuffles the deck of a variant and deals it to its players.
+
+    play_rules
+        Plays one game of any variant with the general engine.
+
+    play_game
+        Plays one game of a variant with the fastest engine for its rules.
+
+    sweep
+        Plays a number of games of each of a list of variants in parallel,
+        with results cached on disk.
+
+author::
+    Alex Perkins
+
+copyright::
+    Copyright (C) 2016, Rochester Institute of Technology
+
+version::
+    1.0.0
+
+"""
+
+import collections
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+
+import war
+import war_statistics
+
+# The ranks of a standard deck. The card numbers 11-14 represent Jacks,
+# Queens, Kings, and Aces respectively.
+STANDARD_RANKS = (2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14)
+
+# The version of the engines and of the way games are seeded, which is part of
+# every cache key. It must be increased whenever a change would give a variant
+# different statistics for the same seed, so stale results are never read.
+CACHE_VERSION = 3
+
+
+class WarRules(collections.namedtuple('WarRules', ['cardsPerWar',\
+                                                   'shuffleWinnings',\
+                                                   'ranks', 'suits',\
+                                                   'players',\
+                                                   'maximumBattles'])):
+
+    """
+    description::
+        The rules of a variant of War. The rules are an immutable, hashable
+        named tuple so they can be used as dictionary keys, sent to worker
+        processes and written into cache keys.
+
+    attributes::
+        cardsPerWar
+            (integer [optional]) The number of cards each player lays down in
+            a war, the last of which decides it. Defaults to 4.
+
+        shuffleWinnings
+            (boolean [optional]) Whether the winnings are shuffled before they
+            are added to the bottom of the winner's hand. If False they are
+            added in the order they were laid down, and a game that repeats a
+            state is a draw. Defaults to True.
+
+        ranks
+            (tuple of integers [optional]) The values of the cards of one
+            suit, which must be from 1 to 255 as the state of a game is
+            encoded one byte per card. Defaults to STANDARD_RANKS.
+
+        suits
+            (integer [optional]) The number of suits in the deck. Defaults to
+            4.
+
+        players
+            (integer [optional]) The number of players. Defaults to 2.
+
+        maximumBattles
+            (integer [optional]) The number of battles after which a game is
+            a draw. Defaults to None, in which case there is no limit.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, cardsPerWar=4, shuffleWinnings=True,\
+                ranks=STANDARD_RANKS, suits=4, players=2,\
+                maximumBattles=None):
+
+        ranks = tuple(int(rank) for rank in ranks)
+        if cardsPerWar < 1 or players < 2 or suits < 1 or \
+           min(ranks, default=0) < 1 or max(ranks) > 255:
+            msg = 'Provided rules must have at least one card per war, two '\
+                  'players, one suit and ranks from 1 to 255'
+            raise ValueError(msg)
+        if len(ranks)*suits < players:
+            msg = 'Provided deck must have at least one card per player'
+            raise ValueError(msg)
+
+        return super().__new__(cls, int(cardsPerWar), bool(shuffleWinnings),\
+                               ranks, int(suits), int(players),\
+                               maximumBattles)
+
+    @property
+    def deck(self):
+
+        """
+        description::
+            The unshuffled deck, every suit of the ranks in turn
+        """
+
+        return list(self.ranks)*self.suits
+
+
+def deal(rules, rng=random):
+
+    """
+    description::
+        Shuffles the deck of a variant and deals it to its players, one card
+        at a time from the top of the deck in turn. If the deck does not
+        divide evenly the first players are dealt one card more.
+
+    attributes::
+        rules
+            (WarRules) The rules of the variant
+
+        rng
+            (random.Random or module [optional]) The random number generator.
+            Defaults to the random module.
+
+    returns::
+        hands
+            (list of deques of integers) The hand of each player
+    """
+
+    deck = rules.deck
+    rng.shuffle(deck)
+
+    return [collections.deque(deck[player::rules.players])\
+            for player in range(rules.players)]
+
+
+def play_rules(rules, hands, rng=random):
+
+    """
+    description::
+        Plays one game of any variant of War. Every player with cards lays
+        down one card and the highest card wins the battle. If more than one
+        player lays the highest card those players go to war: each lays down
+        rules.cardsPerWar cards, one card each in turn, and the highest last
+        card wins the war, with the players still tied going to war again. A
+        player that runs out of cards during a war is out of the war, and the
+        last player left in a war wins it. The winner of a battle or war takes
+        every card laid down. A player with no cards is out of the game and
+        the last player with cards wins it. With two players these are the
+        rules of war.play.
+
+    attributes::
+        rules
+            (WarRules) The rules of the variant
+
+        hands
+            (list of deques or lists of integers) The hand of each player, the
+            top card first
+
+        rng
+            (random.Random or module [optional]) The random number generator
+            used to shuffle the winnings. Defaults to the random module.
+
+    returns::
+        winner
+            (integer) The winner of the game, from 1 to the number of
+            players, or 0 if the game was a draw
+
+        numBattles
+            (integer) The number of battles that took place during the game.
+            Each war sequence is considered a battle.
+
+        numWars
+            (integer) The number of war sequences that took place during the
+            game
+
+        warDepths
+            (collections.Counter) The number of wars of each number of war
+            sequences
+    """
+
+    hands = [collections.deque(hand) for hand in hands]
+    players = range(len(hands))
+    numBattles = 0
+    warDepths = collections.Counter()
+
+    # The state of a deterministic game is saved after every power of two
+    # battles to detect a repeated state (Brent's algorithm), as in war.play
+    detectCycles = not rules.shuffleWinnings
+    savedState = None
+    power = 1
+    steps = 0
+
+    while True:
+
+        # The last player with cards wins the game
+        playing = [player for player in players if hands[player]]
+        if len(playing) == 1:
+            winner = playing[0] + 1
+            break
+
+        # The game is a draw once it reaches the maximum number of battles
+        if rules.maximumBattles is not None and \
+           numBattles >= rules.maximumBattles:
+            winner = 0
+            break
+
+        if detectCycles:
+            state = b'\x00'.join(bytes(hand) for hand in hands)
+            if state == savedState:
+                winner = 0
+                break
+            steps += 1
+            if steps == power:
+                savedState = state
+                power *= 2
+                steps = 0
+
+        # Every player with cards lays down a card
+        numBattles += 1
+        winningDeck = [hands[player].popleft() for player in playing]
+        highest = max(winningDeck)
+        contenders = [player for player, card in zip(playing, winningDeck)\
+                      if card == highest]
+
+        # The players that laid the highest card go to war until one of them
+        # wins
+        warSequence = 0
+        while len(contenders) > 1:
+            numBattles += 1
+            lastCards = {}
+            for card in range(rules.cardsPerWar):
+                for player in list(contenders):
+                    if hands[player]:
+                        lastCards[player] = hands[player].popleft()
+                        winningDeck.append(lastCards[player])
+                    else:
+                        contenders.remove(player)
+                        if len(contenders) == 1:
+                            break
+                if len(contenders) == 1:
+                    break
+
+            if len(contenders) > 1:
+                highest = max(lastCards[player] for player in contenders)
+                contenders = [player for player in contenders\
+                              if lastCards[player] == highest]
+                if len(contenders) > 1:
+                    warSequence += 1
+                    continue
+            warDepths[warSequence + 1] += 1
+
+        if rules.shuffleWinnings:
+            rng.shuffle(winningDeck)
+        hands[contenders[0]].extend(winningDeck)
+
+    numWars = sum(depth*wars for depth, wars in warDepths.items())
+
+    return winner, numBattles, numWars, warDepths
+
+
+def play_game(rules, rng=random):
+
+    """
+    description::
+        Deals and plays one game of a variant of War with the fastest engine
+        for its rules. Every two player variant is played by war.play, which
+        is about twice as fast, and variants of more players by play_rules.
+
+    attributes::
+        rules
+            (WarRules) The rules of the variant
+
+        rng
+            (random.Random or module [optional]) The random number generator.
+            Defaults to the random module.
+
+    returns::
+        winner, numBattles, numWars, warDepths
+            As returned by play_rules
+    """
+
+    hands = deal(rules, rng)
+    if rules.players == 2:
+        warDepths = collections.Counter()
+        winner, numBattles, numWars, warHistogram = \
+            war.play(hands[0], hands[1], rng, rules.shuffleWinnings,\
+                     rules.maximumBattles, warDepths=warDepths,\
+                     cardsPerWar=rules.cardsPerWar)
+        return winner, numBattles, numWars, warDepths
+
+    return play_rules(rules, hands, rng)
+
+
+def _play_chunk(task):
+
+    # Play one chunk of games of one variant with its own random number
+    # generator, and every game with a generator seeded from it, as in
+    # war.simulate, and return its statistics
+    rules, seed, chunk, games = task
+    rng = random.Random('{0}:{1}'.format(seed, chunk))
+
+    statistics = war_statistics.WarStatistics()
+    for game in range(games):
+        statistics.update(*play_game(rules,\
+                                     random.Random(rng.getrandbits(64))))
+
+    return statistics
+
+
+def _cache_file(cacheDirectory, rules, seed, games, chunkSize):
+
+    # The cache file of a variant, named by a hash of everything that
+    # determines its statistics
+    key = repr((CACHE_VERSION, tuple(rules), seed, games, chunkSize))\
+          .encode()
+    return os.path.join(cacheDirectory,\
+                        'war_{0}.json'.format(hashlib.sha1(key).hexdigest()))
+
+
+def sweep(variants, games, seed=0, workers=None, chunkSize=10000,\
+          cacheDirectory=None):
+
+    """
+    description::
+        Plays a number of games of each of a list of variants across a pool
+        of worker processes. The games of every variant are split into chunks
+        that are seeded as in war.simulate, so a standard variant has the
+        same statistics as war.simulate with the same seed, and the chunks of
+        every variant are shared out to the workers together. If a cache
+        directory is given, the statistics of each variant are read from it
+        if they were found before with the same rules, seed, number of games,
+        chunk size and CACHE_VERSION, and written to it otherwise.
+
+    attributes::
+        variants
+            (list of WarRules) The variants to play
+
+        games
+            (integer) The number of games to play of each variant
+
+        seed
+            (integer [optional]) The seed from which every chunk's random
+            number generator is derived. Defaults to 0.
+
+        workers
+            (integer [optional]) The number of worker processes. Defaults to
+            None, in which case the number of CPUs is used. With 1 the games
+            are played in this process.
+
+        chunkSize
+            (integer [optional]) The number of games in a chunk. Defaults to
+            10000.
+
+        cacheDirectory
+            (string [optional]) The directory the statistics are cached in,
+            which is created if needed. Defaults to None, in which case
+            nothing is cached.
+
+    returns::
+        results
+            (dictionary) The war_statistics.WarStatistics of each variant
+            keyed by its WarRules
+    """
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if cacheDirectory is not None:
+        os.makedirs(cacheDirectory, exist_ok=True)
+
+    # Read the variants that have been played before from the cache
+    results = {}
+    for rules in variants:
+        if cacheDirectory is None or rules in results:
+            continue
+        filename = _cache_file(cacheDirectory, rules, seed, games, chunkSize)
+        if os.path.exists(filename):
+            with open(filename) as f:
+                results[rules] = \
+                    war_statistics.WarStatistics.from_dict(json.load(f))
+
+    # Play every chunk of the remaining variants
+    remaining = list(dict.fromkeys(rules for rules in variants\
+                                   if rules not in results))
+    tasks = [(rules, seed, chunk, min(chunkSize, games - start))\
+             for rules in remaining\
+             for chunk, start in enumerate(range(0, games, chunkSize))]
+    for rules in remaining:
+        results[rules] = war_statistics.WarStatistics()
+
+    if workers == 1:
+        chunks = map(_play_chunk, tasks)
+        for task, statistics in zip(tasks, chunks):
+            results[task[0]].merge(statistics)
+    elif tasks:
+        with multiprocessing.Pool(workers) as pool:
+            for task, statistics in zip(tasks, pool.imap(_play_chunk, tasks)):
+                results[task[0]].merge(statistics)
+
+    # Write the newly played variants to the cache
+    if cacheDirectory is not None:
+        for rules in remaining:
+            filename = _cache_file(cacheDirectory, rules, seed, games,\
+                                   chunkSize)
+            temporary = filename + '.tmp'
+            with open(temporary, 'w') as f:
+                json.dump(results[rules].as_dict(), f)
+            os.replace(temporary, filename)
+
+    return results
+
+
+if __name__ == '__main__':
+
+    import itertools
+    import tempfile
+    import time
+
+    # A grid of variants: cards per war, shuffle policy, number of suits and
+    # number of players
+    variants = [WarRules(cardsPerWar=cardsPerWar,\
+                         shuffleWinnings=shuffleWinnings, suits=suits,\
+                         players=players, maximumBattles=10000)\
+                for cardsPerWar, shuffleWinnings, suits, players in\
+                itertools.product((2, 4), (True, False), (4, 8), (2, 3))]
+    cacheDirectory = os.path.join(tempfile.gettempdir(), 'war_sweep')
+
+    for attempt in ('played', 'cached'):
+        start = time.time()
+        results = sweep(variants, 500, seed=2016,\
+                        cacheDirectory=cacheDirectory)
+        print('{0} {1} variants in {2:.2f} seconds'\
+              .format(attempt.capitalize(), len(variants),\
+                      time.time() - start))
+
+    print('{0:>6}{1:>9}{2:>7}{3:>9}{4:>12}{5:>10}{6:>8}'\
+          .format('War', 'Shuffle', 'Suits', 'Players', 'Battles',\
+                  'Wars', 'Draws'))
+    for rules in variants:
+        statistics = results[rules]
+        print('{0:>6}{1:>9}{2:>7}{3:>9}{4:>12.3f}{5:>10.3f}{6:>8.3f}'\
+              .format(rules.cardsPerWar, str(rules.shuffleWinnings),\
+                      rules.suits, rules.players,\
+                      statistics.mean('numBattles'),\
+                      statistics.mean('numWars'),\
+                      statistics.mean('drawRate')))
@@ -0,0 +1,314 @@
+"""
+title::
+    war_statistics
+
+description::
+    This file contains a streaming collector of the statistics of simulated
+    games of War. Each game is added as it is played and only running
+    integer sums and histograms are kept, so the memory used does not grow
+    with the number of games: the histograms hold one count per distinct
+    game length and per distinct war depth, with no upper limit on the depth
+    of a war. Collectors of separate chunks of games, e.g. from separate
+    worker processes, are merged exactly. Means, variances and confidence
+    intervals of the game length, the number of wars and the win rate, and
+    percentiles of the game length and of the depth of the wars, are
+    available at any time, so a simulation can stop as soon as the
+    statistics it needs are precise enough.
+
+classes::
+    WarStatistics
+        Collects the statistics of a stream of games of War.
+
+author::
+    Alex Perkins
+
+copyright::
+    Copyright (C) 2016, Rochester Institute of Technology
+
+version::
+    1.0.0
+
+"""
+
+import collections
+import math
+import statistics
+
+# The statistics whose means and confidence intervals are available
+NAMES = ('numBattles', 'numWars', 'player1WinRate', 'drawRate')
+
+
+class WarStatistics():
+
+    """
+    description::
+        Collects the statistics of a stream of games of War. The sums and
+        sums of squares are Python integers, so they are exact and the
+        variances do not suffer from round-off however many games are added.
+
+    attributes::
+        games
+            (integer) The number of games added
+
+        wins
+            (collections.Counter) The number of games won by each player,
+            keyed by its number from 1, and drawn, keyed by 0
+
+        sums
+            (dictionary) The sums of numBattles and numWars over every game
+
+        squaredSums
+            (dictionary) The sums of the squares of numBattles and numWars
+
+        gameLengths
+            (collections.Counter) The number of games of each numBattles
+
+        warDepths
+            (collections.Counter) The number of wars of each number of war
+            sequences
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.wins = collections.Counter()
+        self.sums = {'numBattles': 0, 'numWars': 0}
+        self.squaredSums = {'numBattles': 0, 'numWars': 0}
+        self.gameLengths = collections.Counter()
+        self.warDepths = collections.Counter()
+
+    def __repr__(self):
+
+        """
+        description::
+            Returns the string representation of the collector
+        """
+
+        return 'WarStatistics(games={0}, numBattles={1:.3f}, '\
+               'numWars={2:.3f}, player1WinRate={3:.4f})'\
+               .format(self.games, self.mean('numBattles'),\
+                       self.mean('numWars'), self.mean('player1WinRate'))
+
+    def update(self, winner, numBattles, numWars, warDepths=None):
+
+        """
+        description::
+            Adds one game, as returned by war.play
+
+        attributes::
+            winner
+                (integer) The winner of the game, 1 or 2, or 0 for a draw
+
+            numBattles
+                (integer) The number of battles of the game
+
+            numWars
+                (integer) The number of wars of the game
+
+            warDepths
+                (collections.Counter [optional]) The number of wars of each
+                number of war sequences in the game, as counted by war.play.
+                Defaults to None.
+        """
+
+        self.games += 1
+        self.wins[winner] += 1
+        self.sums['numBattles'] += numBattles
+        self.squaredSums['numBattles'] += numBattles*numBattles
+        self.sums['numWars'] += numWars
+        self.squaredSums['numWars'] += numWars*numWars
+        self.gameLengths[numBattles] += 1
+        if warDepths:
+            self.warDepths.update(warDepths)
+
+    def merge(self, other):
+
+        """
+        description::
+            Merges the games collected by another WarStatistics into this one
+
+        attributes::
+            other
+                (WarStatistics) The collector to merge
+
+        returns::
+            self
+                (WarStatistics) This collector so merges can be chained
+        """
+
+        self.games += other.games
+        self.wins.update(other.wins)
+        for name in self.sums:
+            self.sums[name] += other.sums[name]
+            self.squaredSums[name] += other.squaredSums[name]
+        self.gameLengths.update(other.gameLengths)
+        self.warDepths.update(other.warDepths)
+        return self
+
+    def as_dict(self):
+
+        """
+        description::
+            Returns the collected sums and histograms as a dictionary that
+            can be written as JSON
+        """
+
+        return {'games': self.games,
+                'wins': dict(self.wins),
+                'sums': dict(self.sums),
+                'squaredSums': dict(self.squaredSums),
+                'gameLengths': dict(self.gameLengths),
+                'warDepths': dict(self.warDepths)}
+
+    @classmethod
+    def from_dict(cls, dictionary):
+
+        """
+        description::
+            Creates a collector from a dictionary returned by as_dict, also
+            after a round trip through JSON, which turns the integer keys of
+            the histograms into strings
+        """
+
+        collector = cls()
+        collector.games = dictionary['games']
+        collector.sums = dict(dictionary['sums'])
+        collector.squaredSums = dict(dictionary['squaredSums'])
+        for name in ('wins', 'gameLengths', 'warDepths'):
+            setattr(collector, name,\
+                    collections.Counter({int(key): value for key, value\
+                                         in dictionary[name].items()}))
+        return collector
+
+    def _moments(self, name):
+
+        # The sum and sum of squares of a statistic. A rate is the mean of a
+        # 0 or 1 indicator, whose square is itself.
+        if name == 'player1WinRate':
+            return self.wins[1], self.wins[1]
+        if name == 'drawRate':
+            return self.wins[0], self.wins[0]
+        if name not in self.sums:
+            msg = 'Provided attribute "name" must be one of {0}'.format(NAMES)
+            raise ValueError(msg)
+        return self.sums[name], self.squaredSums[name]
+
+    def mean(self, name):
+
+        """
+        description::
+            The mean of a statistic in NAMES over every game
+        """
+
+        total, squaredTotal = self._moments(name)
+        return total/self.games if self.games else float('nan')
+
+    def variance(self, name):
+
+        """
+        description::
+            The unbiased sample variance of a statistic in NAMES
+        """
+
+        if self.games < 2:
+            return float('nan')
+        total, squaredTotal = self._moments(name)
+        return (self.games*squaredTotal - total*total)/\
+               (self.games*(self.games - 1))
+
+    def confidence_interval(self, name, confidence=0.95):
+
+        """
+        description::
+            The normal approximation confidence interval of the mean of a
+            statistic in NAMES
+
+        attributes::
+            name
+                (string) The statistic
+
+            confidence
+                (float [optional]) The confidence level. Defaults to 0.95.
+
+        returns::
+            lower
+                (float) The lower bound of the interval
+
+            upper
+                (float) The upper bound of the interval
+        """
+
+        if self.games < 2:
+            return float('-inf'), float('inf')
+        z = statistics.NormalDist().inv_cdf(0.5 + confidence/2)
+        halfWidth = z*math.sqrt(self.variance(name)/self.games)
+        mean = self.mean(name)
+        return mean - halfWidth, mean + halfWidth
+
+    def percentile(self, q, histogram='gameLengths'):
+
+        """
+        description::
+            The smallest value that at least q percent of the counts of a
+            histogram did not exceed: by default the game length that q
+            percent of the games did not exceed, or, with 'warDepths', the
+            number of war sequences that q percent of the wars did not exceed
+
+        attributes::
+            q
+                (float) The percentile, between 0 and 100
+
+            histogram
+                (string [optional]) Either 'gameLengths' or 'warDepths'.
+                Defaults to 'gameLengths'.
+        """
+
+        if histogram not in ('gameLengths', 'warDepths'):
+            msg = 'Provided attribute "histogram" must be "gameLengths" or '\
+                  '"warDepths"'
+            raise ValueError(msg)
+        counts = getattr(self, histogram)
+        total = sum(counts.values())
+        if not total:
+            return float('nan')
+        rank = max(math.ceil(q/100*total), 1)
+        cumulative = 0
+        for value in sorted(counts):
+            cumulative += counts[value]
+            if cumulative >= rank:
+                return value
+        return value
+
+    def war_histogram(self):
+
+        """
+        description::
+            The number of wars of every number of war sequences as a list,
+            the 0th position counting 1-war sequences, with as many positions
+            as the deepest war
+        """
+
+        depth = max(self.warDepths, default=0)
+        return [self.warDepths[i] for i in range(1, depth + 1)]
+
+    def converged(self, targets, confidence=0.95):
+
+        """
+        description::
+            Whether the half-width of the confidence interval of every
+            statistic in targets is no more than its target
+
+        attributes::
+            targets
+                (dictionary) The largest acceptable half-width keyed by the
+                name of the statistic, e.g. {'numBattles': 0.5,
+                'player1WinRate': 0.001}
+
+            confidence
+                (float [optional]) The confidence level. Defaults to 0.95.
+        """
+
+        for name, target in targets.items():
+            lower, upper = self.confidence_interval(name, confidence)
+            if not (upper - lower)/2 <= target:
+                return False
+        return True
@@ -0,0 +1,475 @@
+"""
+title::
+    war_trace
+
+description::
+    This file contains a compact binary trace of games of War, so that single
+    games of a large simulation can be inspected and replayed. Every game is
+    recorded with the seed of its random number generator, the hands it was
+    dealt and the outcome of each of its battles in one byte, so a game costs
+    69 bytes plus one byte per battle. The trace is only ever appended to,
+    and a separate index file holds the offset of every game, so a reader
+    memory maps both files and seeks to game N without reading the games
+    before it. A game is replayed by dealing and playing it again from its
+    seed, which reproduces it exactly.
+
+    The trace file starts with a header of MAGIC, the format version, whether
+    the winnings were shuffled and the maximum number of battles (0 for no
+    limit), followed by the games. Each game is a RECORD of its seed, winner,
+    numBattles and number of outcomes, the 26 cards dealt to Player 1 and the
+    26 cards dealt to Player 2, and then its outcomes. An outcome is the
+    winner of a battle, 1 or 2, plus the number of war sequences it took,
+    0 for no war and at most MAXIMUM_DEPTH, shifted left by DEPTH_SHIFT. The
+    index file is INDEX_MAGIC followed by the offset of every game as a
+    little-endian unsigned 64-bit integer. A reader ignores indexed games
+    that are not completely in the trace, so a trace cut short by a crash
+    still reads correctly up to its last complete game.
+
+classes::
+    GameTrace
+        The trace of one game.
+
+    TraceWriter
+        Appends games to a trace.
+
+    TraceReader
+        Reads, and replays, the games of a trace.
+
+methods::
+    encode_game
+        Encodes one game as the bytes of its record.
+
+    decode_outcomes
+        Decodes the outcomes of a game into the winner and the number of war
+        sequences of each battle.
+
+author::
+    Alex Perkins
+
+copyright::
+    Copyright (C) 2016, Rochester Institute of Technology
+
+version::
+    1.0.0
+
+"""
+
+import collections
+import mmap
+import random
+import struct
+
+MAGIC = b'WARTRACE'
+INDEX_MAGIC = b'WARINDEX'
+VERSION = 1
+HEADER = struct.Struct('<8sBBI')
+RECORD = struct.Struct('<QBII')
+OFFSET = struct.Struct('<Q')
+HAND_SIZE = 26
+DEPTH_SHIFT = 2
+WINNER_MASK = (1 << DEPTH_SHIFT) - 1
+MAXIMUM_DEPTH = 255 >> DEPTH_SHIFT
+
+
+class GameTrace(collections.namedtuple('GameTrace', ['seed', 'winner',\
+                                                     'numBattles',\
+                                                     'player1Hand',\
+                                                     'player2Hand',\
+                                                     'outcomes'])):
+
+    """
+    description::
+        The trace of one game of War
+
+    attributes::
+        seed
+            (integer) The seed of the random.Random the game was dealt and
+            played with
+
+        winner
+            (integer) The winner of the game, 1 or 2, or 0 for a draw
+
+        numBattles
+            (integer) The number of battles of the game, each war sequence
+            counted as a battle, as returned by war.play
+
+        player1Hand
+            (list of integers) The 26 cards dealt to Player 1
+
+        player2Hand
+            (list of integers) The 26 cards dealt to Player 2
+
+        outcomes
+            (bytes) The encoded outcome of every battle, see decode_outcomes
+    """
+
+    __slots__ = ()
+
+    @property
+    def battles(self):
+
+        """
+        description::
+            The winner and number of war sequences of every battle
+        """
+
+        return decode_outcomes(self.outcomes)
+
+
+def encode_game(seed, player1Hand, player2Hand, winner, numBattles, outcomes):
+
+    """
+    description::
+        Encodes one game as the bytes of its record in a trace
+
+    attributes::
+        seed
+            (integer) The seed of the game, between 0 and 2**64 - 1
+
+        player1Hand
+            (deque or list of integers) The 26 cards dealt to Player 1
+
+        player2Hand
+            (deque or list of integers) The 26 cards dealt to Player 2
+
+        winner
+            (integer) The winner of the game, 1 or 2, or 0 for a draw
+
+        numBattles
+            (integer) The number of battles of the game
+
+        outcomes
+            (bytearray or bytes) The outcomes of the battles, as recorded by
+            war.play
+
+    returns::
+        record
+            (bytes) The encoded game
+    """
+
+    return RECORD.pack(seed, winner, numBattles, len(outcomes)) + \
+           bytes(player1Hand) + bytes(player2Hand) + bytes(outcomes)
+
+
+def decode_outcomes(outcomes):
+
+    """
+    description::
+        Decodes the outcomes of the battles of a game
+
+    attributes::
+        outcomes
+            (bytes) The encoded outcomes
+
+    returns::
+        battles
+            (list of tuples) The winner, 1 or 2, and the number of war
+            sequences, 0 for no war, of every battle
+    """
+
+    return [(outcome & WINNER_MASK, outcome >> DEPTH_SHIFT)\
+            for outcome in outcomes]
+
+
+class TraceWriter():
+
+    """
+    description::
+        Appends games to a trace, creating the trace and its index if they
+        do not exist. Games can only be appended to a trace recorded with the
+        same rules, as replaying a game depends on them. When an existing
+        trace is opened, games that were indexed but not completely written
+        before a crash are dropped from the trace and its index.
+
+    attributes::
+        filename
+            (string) The name of the trace file. The index is written to
+            filename + '.idx'.
+
+        shuffleWinnings
+            (boolean [optional]) Whether the winnings of the games are
+            shuffled. Defaults to True.
+
+        maximumBattles
+            (integer [optional]) The number of battles after which the games
+            are a draw. Defaults to None, in which case there is no limit.
+    """
+
+    def __init__(self, filename, shuffleWinnings=True, maximumBattles=None):
+        header = HEADER.pack(MAGIC, VERSION, bool(shuffleWinnings),\
+                             maximumBattles or 0)
+
+        self.filename = filename
+        self._trace = open(filename, 'ab')
+        self._index = open(filename + '.idx', 'ab')
+        if self._trace.tell() == 0:
+            self._trace.write(header)
+            self._index.write(INDEX_MAGIC)
+        else:
+            with open(filename, 'rb') as f:
+                if f.read(HEADER.size) != header:
+                    self.close()
+                    msg = 'Trace "{0}" was recorded with different rules or '\
+                          'is not a trace'.format(filename)
+                    raise ValueError(msg)
+            self._recover()
+
+        self._offset = self._trace.tell()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def _recover(self):
+
+        # The last games indexed before a crash may not have been completely
+        # written to the trace, so they are dropped from the index and the
+        # trace is cut back to the end of the last complete game, which new
+        # games are then appended after
+        self._trace.flush()
+        self._index.flush()
+        traceSize = self._trace.tell()
+        with open(self.filename + '.idx', 'rb') as f:
+            index = f.read()
+        with open(self.filename, 'rb') as f:
+            games = max(len(index) - len(INDEX_MAGIC), 0)//OFFSET.size
+            end = HEADER.size
+            while games:
+                offset = OFFSET.unpack_from(index, len(INDEX_MAGIC) + \
+                                            (games - 1)*OFFSET.size)[0]
+                f.seek(offset)
+                record = f.read(RECORD.size)
+                if len(record) == RECORD.size:
+                    end = offset + RECORD.size + 2*HAND_SIZE + \
+                          RECORD.unpack(record)[3]
+                    if end <= traceSize:
+                        break
+                end = HEADER.size
+                games -= 1
+
+        self._trace.truncate(end)
+        self._trace.seek(end)
+        if index[:len(INDEX_MAGIC)] == INDEX_MAGIC:
+            self._index.truncate(len(INDEX_MAGIC) + games*OFFSET.size)
+        else:
+            self._index.truncate(0)
+            self._index.write(INDEX_MAGIC)
+
+    def append(self, record):
+
+        """
+        description::
+            Appends one game, encoded by encode_game, to the trace and its
+            offset to the index
+        """
+
+        self._trace.write(record)
+        self._index.write(OFFSET.pack(self._offset))
+        self._offset += len(record)
+
+    def flush(self):
+
+        """
+        description::
+            Writes the buffered games to disk
+        """
+
+        self._trace.flush()
+        self._index.flush()
+
+    def close(self):
+
+        """
+        description::
+            Flushes and closes the trace and its index
+        """
+
+        if not self._trace.closed:
+            self.flush()
+        self._trace.close()
+        self._index.close()
+
+
+class TraceReader():
+
+    """
+    description::
+        Reads the games of a trace by memory mapping the trace and its index.
+        A game is read with reader[n], which seeks straight to it, and every
+        game with iter(reader). Only the games in the trace when it was
+        opened are read.
+
+    attributes::
+        filename
+            (string) The name of the trace file
+
+        shuffleWinnings
+            (boolean) Whether the winnings of the games were shuffled
+
+        maximumBattles
+            (integer) The number of battles after which the games were a
+            draw, or None if there was no limit
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, 'rb') as f:
+            self._trace = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(filename + '.idx', 'rb') as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, shuffleWinnings, maximumBattles = \
+            HEADER.unpack_from(self._trace)
+        if magic != MAGIC or version != VERSION or \
+           self._index[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            self.close()
+            msg = 'Provided file "{0}" is not a version {1} trace'\
+                  .format(filename, VERSION)
+            raise ValueError(msg)
+        self.shuffleWinnings = bool(shuffleWinnings)
+        self.maximumBattles = maximumBattles or None
+
+        # The last offsets may belong to games that were not completely
+        # written to the trace before a crash
+        self._games = (len(self._index) - len(INDEX_MAGIC))//OFFSET.size
+        while self._games and not self._complete(self._games - 1):
+            self._games -= 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def __len__(self):
+        return self._games
+
+    def __iter__(self):
+        for n in range(self._games):
+            yield self[n]
+
+    def _offset(self, n):
+        return OFFSET.unpack_from(self._index,\
+                                  len(INDEX_MAGIC) + n*OFFSET.size)[0]
+
+    def _complete(self, n):
+        offset = self._offset(n)
+        if offset + RECORD.size > len(self._trace):
+            return False
+        numOutcomes = RECORD.unpack_from(self._trace, offset)[3]
+        return offset + RECORD.size + 2*HAND_SIZE + numOutcomes <= \
+               len(self._trace)
+
+    def __getitem__(self, n):
+
+        """
+        description::
+            Reads game n, counting from 0, or from the end if n is negative,
+            as a GameTrace
+        """
+
+        if n < 0:
+            n += self._games
+        if not 0 <= n < self._games:
+            raise IndexError('Game {0} is not in the trace'.format(n))
+
+        offset = self._offset(n)
+        seed, winner, numBattles, numOutcomes = \
+            RECORD.unpack_from(self._trace, offset)
+        offset += RECORD.size
+        player1Hand = list(self._trace[offset:offset + HAND_SIZE])
+        offset += HAND_SIZE
+        player2Hand = list(self._trace[offset:offset + HAND_SIZE])
+        offset += HAND_SIZE
+        outcomes = self._trace[offset:offset + numOutcomes]
+
+        return GameTrace(seed, winner, numBattles, player1Hand, player2Hand,\
+                         outcomes)
+
+    def replay(self, n):
+
+        """
+        description::
+            Deals and plays game n again from its seed with the rules of the
+            trace, and checks that it is dealt the recorded hands
+
+        attributes::
+            n
+                (integer) The game to replay
+
+        returns::
+            game
+                (GameTrace) The replayed game, which is equal to reader[n]
+                unless the game engine has changed since it was recorded
+        """
+
+        # Imported here as war imports this module
+        import war
+
+        recorded = self[n]
+        rng = random.Random(recorded.seed)
+        player1Hand, player2Hand = war.shuffle_and_deal(rng)
+        if list(player1Hand) != recorded.player1Hand or \
+           list(player2Hand) != recorded.player2Hand:
+            msg = 'Game {0} is not dealt the recorded hands from its seed'\
+                  .format(n)
+            raise ValueError(msg)
+
+        outcomes = bytearray()
+        winner, numBattles, numWars, warHistogram = \
+            war.play(player1Hand, player2Hand, rng, self.shuffleWinnings,\
+                     self.maximumBattles, outcomes=outcomes)
+
+        return GameTrace(recorded.seed, winner, numBattles,\
+                         recorded.player1Hand, recorded.player2Hand,\
+                         bytes(outcomes))
+
+    def close(self):
+
+        """
+        description::
+            Closes the memory maps of the trace and its index
+        """
+
+        self._trace.close()
+        self._index.close()
+
+
+if __name__ == '__main__':
+
+    import os
+    import tempfile
+    import time
+
+    import war
+
+    games = 100000
+    traceFile = os.path.join(tempfile.mkdtemp(), 'war.trace')
+
+    # The same games played with and without a trace
+    start = time.time()
+    statistics = war.simulate(games, workers=1, seed=2016)
+    untraced = time.time() - start
+    start = time.time()
+    traced = war.simulate(games, workers=1, seed=2016, traceFile=traceFile)
+    tracedTime = time.time() - start
+    print('{0} games in {1:.2f} seconds, {2:.2f} seconds traced, with the '\
+          'same statistics: {3}'\
+          .format(games, untraced, tracedTime,\
+                  statistics['distributions'].as_dict() == \
+                  traced['distributions'].as_dict()))
+    print('Trace of {0} bytes, {1:.2f} bytes per battle'\
+          .format(os.path.getsize(traceFile),\
+                  os.path.getsize(traceFile)/statistics['numBattles']))
+
+    # Seek to single games and replay them from their seeds
+    with TraceReader(traceFile) as reader:
+        for n in (0, games//2, len(reader) - 1):
+            game = reader[n]
+            print('Game {0}: seed {1}, winner {2}, {3} battles, wars {4}, '\
+                  'replayed identically: {5}'\
+                  .format(n, game.seed, game.winner, game.numBattles,\
+                          [battle for battle in game.battles if battle[1]],\
+                          reader.replay(n) == game))
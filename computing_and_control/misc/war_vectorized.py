@@ -0,0 +1,369 @@
+"""
+title::
+    war_vectorized
+
+description::
+    This file will simulate thousands of games of the card game War at once
+    with NumPy, following the same rules as war.py. The hands of every game
+    are held as fixed-size 52 card uint8 ring buffers in one array, with a
+    head index and a card count per player, so a card is taken from the top
+    or added to the bottom of a hand without moving any other card. Every
+    game that is still being played is advanced by one battle, or by one war
+    sequence of a war, per vectorized step, with masks selecting the games
+    whose battle was won by either player or tied. The per game results are
+    the same statistics that war.play returns (winner, numBattles, numWars
+    and warHistogram), drawn from the same distribution, though not from the
+    same random numbers as war.py for a given seed.
+
+methods::
+    deal_decks
+        Shuffles a deck of 52 cards for each of a number of games at once,
+        returning them as one uint8 array.
+
+    shuffle_and_deal_vectorized
+        Shuffles a deck of 52 cards for each of a number of games and deals
+        them to two players so that each player has 26 cards.
+
+    play_vectorized
+        Plays a game of War for every row of the hands given, returning the
+        winner, numBattles, numWars and warHistogram of each game.
+
+author::
+    Alex Perkins
+
+copyright::
+    Copyright (C) 2016, Rochester Institute of Technology
+
+version::
+    1.0.0
+
+"""
+
+import numpy
+
+# The 52 card deck. The card numbers 11-14 represent Jacks, Queens, Kings,
+# and Aces respectively.
+DECK = numpy.array([2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14]*4,\
+                   dtype=numpy.uint8)
+
+# The slot of a 52 card ring buffer that follows each slot
+NEXT = numpy.roll(numpy.arange(52, dtype=numpy.intp), -1)
+
+
+def deal_decks(games, rng=None, blockSize=2**16):
+
+    """
+    description::
+        Shuffles a deck of 52 cards for each of a number of games at once.
+        Each deck is the 52 card deck permuted by the order that sorts 52
+        uniformly random keys, which is a uniformly random permutation. The
+        keys are sorted blockSize decks at a time so the temporary arrays
+        stay small while the decks are written into one uint8 array.
+
+    attributes::
+        games
+            (integer) The number of decks to shuffle
+
+        rng
+            (numpy.random.Generator [optional]) The random number generator.
+            Defaults to None, in which case numpy.random.default_rng() is
+            used.
+
+        blockSize
+            (integer [optional]) The number of decks shuffled at a time.
+            Defaults to 2**16.
+
+    returns::
+        decks
+            (numpy ndarray) A (games, 52) uint8 array of shuffled decks, the
+            top card first
+    """
+
+    if rng is None:
+        rng = numpy.random.default_rng()
+
+    decks = numpy.empty((games, 52), dtype=numpy.uint8)
+    for first in range(0, games, blockSize):
+        last = min(first + blockSize, games)
+        order = numpy.argsort(rng.random((last - first, 52)), axis=1)
+        numpy.take(DECK, order, out=decks[first:last])
+
+    return decks
+
+
+def shuffle_and_deal_vectorized(games, rng=None, decks=None):
+
+    """
+    description::
+        Shuffles a deck of 52 cards for each game and deals them to two
+        players, alternating one card at a time from the top of the deck, so
+        that each player has 26 cards. The hands are strided views of the
+        decks, so dealing copies no cards.
+
+    attributes::
+        games
+            (integer) The number of games to deal
+
+        rng
+            (numpy.random.Generator [optional]) The random number generator.
+            Defaults to None, in which case numpy.random.default_rng() is
+            used.
+
+        decks
+            (numpy ndarray [optional]) A (games, 52) array of decks, e.g. a
+            slice of the decks returned by deal_decks, to deal instead of
+            shuffling new ones. Defaults to None.
+
+    returns::
+        player1Hands
+            (numpy ndarray) A (games, 26) uint8 view of Player 1's hands
+
+        player2Hands
+            (numpy ndarray) A (games, 26) uint8 view of Player 2's hands
+    """
+
+    if decks is None:
+        decks = deal_decks(games, rng)
+
+    return decks[:, 0::2], decks[:, 1::2]
+
+
+def play_vectorized(player1Hands, player2Hands, rng=None):
+
+    """
+    description::
+        Plays a game of War for every row of the hands given, in lockstep.
+        Each step advances every game that is not over by one battle, or by
+        one war sequence if it is in a war, exactly as war.play and
+        war.begin_war would. Winnings are shuffled before they are added to
+        the bottom of the winner's hand. Only up to six war sequences are
+        counted in a war's histogram entry, as in war.begin_war.
+
+    attributes::
+        player1Hands
+            (numpy ndarray) A (games, cards) array of Player 1's hands with
+            values ranging from 2-14, the top card first
+
+        player2Hands
+            (numpy ndarray) A (games, 52 - cards) array of Player 2's hands
+
+        rng
+            (numpy.random.Generator [optional]) The random number generator
+            used to shuffle the winnings. Defaults to None, in which case
+            numpy.random.default_rng() is used.
+
+    returns::
+        winner
+            (numpy ndarray) The winner of each game. Either 1 or 2
+            representing Player 1 or Player 2.
+
+        numBattles
+            (numpy ndarray) The number of battles that took place during each
+            game. Each war sequence is considered a battle.
+
+        numWars
+            (numpy ndarray) The number of wars that took place during each
+            game
+
+        warHistogram
+            (numpy ndarray) A (games, 6) array. Each column counts how many
+            1- to 6-war sequences occurred in each game.
+    """
+
+    if rng is None:
+        rng = numpy.random.default_rng()
+
+    player1Hands = numpy.asarray(player1Hands, dtype=numpy.uint8)
+    player2Hands = numpy.asarray(player2Hands, dtype=numpy.uint8)
+    games = player1Hands.shape[0]
+    if player1Hands.shape[1] + player2Hands.shape[1] != 52:
+        msg = 'Provided hands must hold 52 cards between them'
+        raise ValueError(msg)
+
+    # The ring buffers of both players' hands, flattened so that slot s of
+    # player p's hand in game g is at (2*g + p)*52 + s, with the head and
+    # tail index and card count of every hand, and the pile of cards being
+    # played for in each game
+    hands = numpy.zeros((games, 2, 52), dtype=numpy.uint8)
+    hands[:, 0, :player1Hands.shape[1]] = player1Hands
+    hands[:, 1, :player2Hands.shape[1]] = player2Hands
+    hands = hands.ravel()
+    base = numpy.arange(2*games, dtype=numpy.intp)*52
+    head = numpy.zeros(2*games, dtype=numpy.intp)
+    count = numpy.empty(2*games, dtype=numpy.intp)
+    count[0::2] = player1Hands.shape[1]
+    count[1::2] = player2Hands.shape[1]
+    tail = count % 52
+    pile = numpy.zeros((games, 52), dtype=numpy.uint8)
+    pileLength = numpy.zeros(games, dtype=numpy.intp)
+
+    winner = numpy.zeros(games, dtype=numpy.uint8)
+    numBattles = numpy.zeros(games, dtype=numpy.int64)
+    warHistogram = numpy.zeros((games, 6), dtype=numpy.int64)
+    inWar = numpy.zeros(games, dtype=bool)
+    warSequence = numpy.zeros(games, dtype=numpy.intp)
+
+    def take(hand):
+
+        # Take the top card of each of the given hands
+        position = head[hand]
+        cards = hands[base[hand] + position]
+        head[hand] = NEXT[position]
+        count[hand] -= 1
+        return cards
+
+    def give(hand, cards):
+
+        # Add a card to the bottom of each of the given hands
+        position = tail[hand]
+        hands[base[hand] + position] = cards
+        tail[hand] = NEXT[position]
+        count[hand] += 1
+
+    def collect(index, player):
+
+        # Shuffle the pile of each of the given games, by sorting random keys
+        # with the empty slots sorted last, and add it to the bottom of the
+        # winning player's hand
+        if index.size == 0:
+            return
+        hand = 2*index + player
+        length = pileLength[index]
+        width = int(length.max())
+        slots = numpy.arange(width)
+        keys = rng.random((index.size, width))
+        keys[slots >= length[:, None]] = 2.0
+        shuffled = numpy.take_along_axis(pile[index, :width],\
+                                         numpy.argsort(keys, axis=1), axis=1)
+        valid = slots < length[:, None]
+        hands[(base[hand][:, None] + (tail[hand][:, None] + slots) % 52)\
+              [valid]] = shuffled[valid]
+        tail[hand] = (tail[hand] + length) % 52
+        count[hand] += length
+        pileLength[index] = 0
+
+    def record(index):
+
+        # Count a war that ended after warSequence + 1 war sequences. Wars of
+        # more than six sequences are not counted.
+        counted = warSequence[index] <= 5
+        warHistogram[index[counted], warSequence[index[counted]]] += 1
+
+    active = numpy.arange(games)
+    while active.size:
+
+        # Games whose next battle finds a player with all 52 cards are over
+        battling = active[~inWar[active]]
+        winner[battling[count[2*battling] == 52]] = 1
+        winner[battling[count[2*battling + 1] == 52]] = 2
+        battling = battling[winner[battling] == 0]
+
+        # Continue the wars of the games that tied their last battle or war
+        # sequence. Both players lay down four cards. A player that runs out
+        # of cards first, Player 1 checked before Player 2 on each card,
+        # loses the war and with it the game.
+        warring = active[inWar[active]]
+        if warring.size:
+            numBattles[warring] += 1
+            player1Count = count[2*warring]
+            player2Count = count[2*warring + 1]
+            full = (player1Count >= 4) & (player2Count >= 4)
+            exhausted = warring[~full]
+            record(exhausted)
+            winner[exhausted] = numpy.where(player1Count[~full] <=\
+                                            player2Count[~full], 2, 1)
+            inWar[exhausted] = False
+
+            warring = warring[full]
+            length = pileLength[warring]
+            for card in range(4):
+                player1Card = take(2*warring)
+                player2Card = take(2*warring + 1)
+                pile[warring, length + 2*card] = player1Card
+                pile[warring, length + 2*card + 1] = player2Card
+            pileLength[warring] += 8
+            for player, won in ((0, player1Card > player2Card),\
+                                (1, player1Card < player2Card)):
+                record(warring[won])
+                inWar[warring[won]] = False
+                collect(warring[won], player)
+            warSequence[warring[player1Card == player2Card]] += 1
+
+        # Play one battle in every other game. The two cards of a battle are
+        # shuffled by swapping them half of the time.
+        numBattles[battling] += 1
+        player1Card = take(2*battling)
+        player2Card = take(2*battling + 1)
+        tie = player1Card == player2Card
+        won = ~tie
+        swap = rng.random(battling.size) < 0.5
+        hand = 2*battling[won] + (player1Card < player2Card)[won]
+        give(hand, numpy.where(swap, player2Card, player1Card)[won])
+        give(hand, numpy.where(swap, player1Card, player2Card)[won])
+        tied = battling[tie]
+        pile[tied, 0] = player1Card[tie]
+        pile[tied, 1] = player2Card[tie]
+        pileLength[tied] = 2
+        inWar[tied] = True
+        warSequence[tied] = 0
+
+        active = active[winner[active] == 0]
+
+    numWars = warHistogram @ numpy.arange(1, 7)
+
+    return winner, numBattles, numWars, warHistogram
+
+
+if __name__ == '__main__':
+
+    import time
+
+    simulations = [100000, 1000000]
+    batchSize = 100000
+
+    for games in simulations:
+
+        rng = numpy.random.default_rng(2016)
+        winnerStat = {1: 0, 2: 0}
+        numBattlesStat = 0
+        numWarsStat = 0
+        warHistogramStat = numpy.zeros(6, dtype=numpy.int64)
+
+        start = time.time()
+        decks = deal_decks(games, rng)
+        for first in range(0, games, batchSize):
+            player1Hands, player2Hands = \
+                shuffle_and_deal_vectorized(min(batchSize, games - first),\
+                                            decks=decks[first:first +\
+                                                        batchSize])
+            winner, numBattles, numWars, warHistogram = \
+                play_vectorized(player1Hands, player2Hands, rng)
+            winnerStat[1] += int(numpy.count_nonzero(winner == 1))
+            winnerStat[2] += int(numpy.count_nonzero(winner == 2))
+            numBattlesStat += int(numBattles.sum())
+            numWarsStat += int(numWars.sum())
+            warHistogramStat += warHistogram.sum(axis=0)
+
+        elapsedTime = time.time() - start
+        print('Player 1 wins = {0}\n'\
+              'Player 2 wins = {1}\n'\
+              'Average battles/game = {2:.3f}\n'\
+              'Average wars/game = {3:.3f}\n'\
+              'Average 1-war sequences/game = {4:.6f}\n'\
+              'Average 2-war sequences/game = {5:.6f}\n'\
+              'Average 3-war sequences/game = {6:.6f}\n'\
+              'Average 4-war sequences/game = {7:.6f}\n'\
+              'Average 5-war sequences/game = {8:.6f}\n'\
+              'Average 6-war sequences/game = {9:.6f}\n'\
+              'The elapsed time to complete {10} simulations was {11:.2f} '\
+              'seconds\n'\
+              .format(winnerStat[1], winnerStat[2],\
+                      numBattlesStat/games,\
+                      numWarsStat/games,\
+                      warHistogramStat[0]/games,\
+                      warHistogramStat[1]/games,\
+                      warHistogramStat[2]/games,\
+                      warHistogramStat[3]/games,\
+                      warHistogramStat[4]/games,\
+                      warHistogramStat[5]/games,\
+                      games, elapsedTime))
@@ -0,0 +1,17 @@
+from .accumulators import RunningStatistics
+from .checkpoint import Checkpoint
+from .monte_carlo_anytime import monte_carlo_anytime
+from .monte_carlo_anytime import monte_carlo_anytime_async
+from .monte_carlo_average import monte_carlo_average
+from .monte_carlo_average_vectorized import monte_carlo_average_vectorized
+from .monte_carlo_batch import monte_carlo_batch
+from .monte_carlo_hit_or_miss import monte_carlo_hit_or_miss
+from .monte_carlo_hit_or_miss_vectorized import \
+     monte_carlo_hit_or_miss_vectorized
+from .monte_carlo_nd import monte_carlo_nd
+from .monte_carlo_parallel import monte_carlo_parallel
+from .monte_carlo_resumable import monte_carlo_resumable
+from .quadrature import quadrature
+from .quasi_monte_carlo import quasi_monte_carlo
+from . import progress
+from . import samplers
@@ -0,0 +1,154 @@
+import numpy
+from math import sqrt
+
+class RunningStatistics():
+
+    """
+    title::
+        RunningStatistics
+
+    description::
+        Accumulates the count, mean and sum of squared deviations from the
+        mean (M2) of a stream of samples in one pass and constant memory.
+        Single samples are added with Welford's update and chunks of samples
+        (e.g. numpy arrays from a generator) with Chan's parallel update, so
+        no intermediate list is built and the variance does not suffer the
+        cancellation of the sum of squares formula. Two accumulators can be
+        merged exactly as if one had seen both streams, which allows streams
+        to be split across processes or machines.
+
+    attributes::
+        count
+            (int) The number of samples accumulated
+
+        mean
+            (float) The mean of the samples
+
+        m2
+            (float) The sum of squared deviations of the samples from their
+            mean
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+
+        """
+        description::
+            Instantiates an empty accumulator, or one with a known state
+        """
+
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def __repr__(self):
+
+        """
+        description::
+            Returns the string representation of the accumulator
+        """
+
+        return 'RunningStatistics(count={0}, mean={1}, m2={2})'\
+               .format(self.count, self.mean, self.m2)
+
+    def _combine(self, count, mean, m2):
+
+        # Chan et al. update of this accumulator with the statistics of
+        # another set of samples
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta*count/total
+        self.m2 += m2 + delta**2*self.count*count/total
+        self.count = total
+
+    def update(self, samples):
+
+        """
+        description::
+            Adds a single sample or a chunk of samples
+
+        attributes::
+            samples
+                (int, float, list, tuple or numpy ndarray) The samples
+
+        returns::
+            self
+                (RunningStatistics) This accumulator so updates can be chained
+        """
+
+        if numpy.ndim(samples) == 0:
+            # Welford's update for a single sample
+            self.count += 1
+            delta = samples - self.mean
+            self.mean += delta/self.count
+            self.m2 += delta*(samples - self.mean)
+        else:
+            chunk = numpy.asarray(samples, dtype=float).ravel()
+            if chunk.size:
+                mean = float(chunk.mean())
+                deviations = chunk - mean
+                self._combine(chunk.size, mean,\
+                              float(numpy.dot(deviations, deviations)))
+
+        return self
+
+    def merge(self, other):
+
+        """
+        description::
+            Merges the samples accumulated by another RunningStatistics into
+            this one
+
+        attributes::
+            other
+                (RunningStatistics) The accumulator to merge
+
+        returns::
+            self
+                (RunningStatistics) This accumulator so merges can be chained
+        """
+
+        self._combine(other.count, other.mean, other.m2)
+        return self
+
+    @property
+    def variance(self):
+
+        """
+        description::
+            The population variance of the samples, M2/count
+        """
+
+        return self.m2/self.count if self.count else float('nan')
+
+    @property
+    def sampleVariance(self):
+
+        """
+        description::
+            The unbiased sample variance of the samples, M2/(count - 1)
+        """
+
+        return self.m2/(self.count - 1) if self.count > 1 else float('nan')
+
+    @property
+    def standardError(self):
+
+        """
+        description::
+            The standard error of the mean, sqrt(variance/count)
+        """
+
+        return sqrt(max(self.variance, 0.0)/self.count) if self.count \
+               else float('inf')
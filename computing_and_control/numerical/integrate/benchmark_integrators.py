@@ -0,0 +1,561 @@
+"""
+title::
+    benchmark_integrators
+
+description::
+    This file will benchmark the integrators in numerical.integrate on a
+    catalog of integrands with known integrals: a smooth one, a sharply
+    peaked one, a discontinuous one and the Planck blackbody curve. Every
+    integrator mode in MODES, from the scalar loops and each sampler and
+    low-discrepancy sequence to the parallel, multi-dimensional, batch,
+    anytime and resumable integrators and tabulated quadrature, is run with
+    a ConvergenceTrace until the tightest error target, relative to the
+    exact integral, is met, from which the evaluations per second, the time
+    taken to reach each error target and the empirical convergence order
+    (the slope of log(epsilon) against log(evaluations), -0.5 for plain
+    Monte Carlo) are found. Each case also records whether its actual error
+    is within four epsilon, which flags an integrator whose error estimate
+    cannot be trusted for that integrand. The results are recorded as JSON
+    and may be compared against a stored baseline so that a mode that has
+    become slower than a configurable percentage is reported as a
+    regression.
+
+methods::
+    run_benchmark
+        Runs every integrator mode on every integrand and measures its
+        performance and convergence.
+
+    compare_to_baseline
+        Compares benchmark results against a stored baseline and returns the
+        cases that have regressed.
+
+author::
+    Alex Perkins
+
+copyright::
+    Copyright (C) 2016, Rochester Institute of Technology
+
+version::
+    1.0.0
+
+"""
+
+import json
+import math
+import os
+import platform
+import random
+import tempfile
+
+import numpy
+
+import numerical.integrate
+
+# The error targets, relative to the exact integral, at which the time taken
+# is recorded
+TARGETS = (1e-2, 1e-3, 1e-4)
+
+
+def _smooth(x):
+    return numpy.sqrt(x)
+
+
+def _peaked(x):
+    return 1/(1 + (100*(x - 0.5))**2)
+
+
+def _discontinuous(x):
+    return numpy.where(x < 1/3, 1.0, 0.25)
+
+
+def _planck(x):
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        return numpy.where(x > 0, x**3/numpy.expm1(x), 0.0)
+
+
+def _planck_integral():
+
+    # The area under x^3/(e^x - 1) over [0, 10], by Romberg integration
+    points = numpy.linspace(0, 10, 2**16 + 1)
+    return numerical.integrate.quadrature(_planck(points), points)[0]
+
+
+# Each integrand is a vectorized function, its limits and its exact integral
+INTEGRANDS = {'smooth': (_smooth, 0.0, 1.0, 2.0/3.0),
+              'peaked': (_peaked, 0.0, 1.0, 2*math.atan(50)/100),
+              'discontinuous': (_discontinuous, 0.0, 1.0, 0.5),
+              'planck': (_planck, 0.0, 10.0, _planck_integral())}
+
+
+def _scalar(function):
+
+    # Wraps a vectorized integrand so the scalar loop of
+    # monte_carlo_average, which requires a Python function, may use it
+    def scalar(x):
+        return float(function(numpy.float64(x)))
+    return scalar
+
+
+def _average(function, lowerLimit, upperLimit, acceptableError,\
+             maximumIterations, callback, seed):
+    random.seed(seed)
+    return numerical.integrate.monte_carlo_average(\
+               _scalar(function), lowerLimit, upperLimit, acceptableError,\
+               maximumIterations=maximumIterations, callback=callback,\
+               callbackInterval=0.01)
+
+
+def _average_vectorized(function, lowerLimit, upperLimit, acceptableError,\
+                        maximumIterations, callback, seed):
+    return numerical.integrate.monte_carlo_average_vectorized(\
+               function, lowerLimit, upperLimit, acceptableError,\
+               maximumIterations=maximumIterations, seed=seed,\
+               callback=callback, callbackInterval=0)
+
+
+def _hit_or_miss_vectorized(function, lowerLimit, upperLimit,\
+                            acceptableError, maximumIterations, callback,\
+                            seed):
+    return numerical.integrate.monte_carlo_hit_or_miss_vectorized(\
+               function, lowerLimit, upperLimit, acceptableError,\
+               maximumIterations=maximumIterations, seed=seed,\
+               callback=callback, callbackInterval=0)
+
+
+def _stratified(function, lowerLimit, upperLimit, acceptableError,\
+                maximumIterations, callback, seed):
+    return numerical.integrate.monte_carlo_average_vectorized(\
+               function, lowerLimit, upperLimit, acceptableError,\
+               maximumIterations=maximumIterations, seed=seed,\
+               sampler=numerical.integrate.samplers.StratifiedSampler(),\
+               callback=callback, callbackInterval=0)
+
+
+def _antithetic(function, lowerLimit, upperLimit, acceptableError,\
+                maximumIterations, callback, seed):
+    return numerical.integrate.monte_carlo_average_vectorized(\
+               function, lowerLimit, upperLimit, acceptableError,\
+               maximumIterations=maximumIterations, seed=seed,\
+               sampler=numerical.integrate.samplers.AntitheticSampler(),\
+               callback=callback, callbackInterval=0)
+
+
+def _hit_or_miss(function, lowerLimit, upperLimit, acceptableError,\
+                 maximumIterations, callback, seed):
+    random.seed(seed)
+    return numerical.integrate.monte_carlo_hit_or_miss(\
+               _scalar(function), lowerLimit, upperLimit, acceptableError,\
+               maximumIterations=maximumIterations, callback=callback,\
+               callbackInterval=0.01)
+
+
+def _importance(function, lowerLimit, upperLimit, acceptableError,\
+                maximumIterations, callback, seed):
+
+    # A piecewise constant density that follows the integrand on a coarse
+    # grid, widened by a tenth of its mean so it is non-zero everywhere
+    bins = 64
+    edges = numpy.linspace(lowerLimit, upperLimit, bins + 1)
+    binWidth = (upperLimit - lowerLimit)/bins
+    heights = numpy.abs(function((edges[:-1] + edges[1:])/2))
+    weights = heights + 0.1*heights.mean()
+    weights /= weights.sum()
+
+    def density(x):
+        index = numpy.clip(((x - lowerLimit)/binWidth).astype(int), 0,\
+                           bins - 1)
+        return weights[index]/binWidth
+
+    def draw(size, rng):
+        return edges[rng.choice(bins, size, p=weights)] + \
+               binWidth*rng.random(size)
+
+    return numerical.integrate.monte_carlo_average_vectorized(\
+               function, lowerLimit, upperLimit, acceptableError,\
+               maximumIterations=maximumIterations, seed=seed,\
+               sampler=numerical.integrate.samplers.ImportanceSampler(\
+                   density, draw),\
+               callback=callback, callbackInterval=0)
+
+
+def _control_variate(function, lowerLimit, upperLimit, acceptableError,\
+                     maximumIterations, callback, seed):
+
+    # The control function g(x) = x, whose integral is known exactly
+    sampler = numerical.integrate.samplers.ControlVariateSampler(\
+                  lambda x: x, (upperLimit**2 - lowerLimit**2)/2)
+    return numerical.integrate.monte_carlo_average_vectorized(\
+               function, lowerLimit, upperLimit, acceptableError,\
+               maximumIterations=maximumIterations, seed=seed,\
+               sampler=sampler, callback=callback, callbackInterval=0)
+
+
+def _sobol(function, lowerLimit, upperLimit, acceptableError,\
+           maximumIterations, callback, seed):
+    return numerical.integrate.quasi_monte_carlo(\
+               function, lowerLimit, upperLimit, acceptableError,\
+               maximumIterations=maximumIterations, seed=seed,\
+               callback=callback, callbackInterval=0)
+
+
+def _parallel(function, lowerLimit, upperLimit, acceptableError,\
+              maximumIterations, callback, seed):
+    return numerical.integrate.monte_carlo_parallel(\
+               function, lowerLimit, upperLimit, acceptableError,\
+               maximumIterations=maximumIterations, seed=seed,\
+               callback=callback, callbackInterval=0)
+
+
+def _halton(function, lowerLimit, upperLimit, acceptableError,\
+            maximumIterations, callback, seed):
+    return numerical.integrate.quasi_monte_carlo(\
+               function, lowerLimit, upperLimit, acceptableError,\
+               sequence='halton', maximumIterations=maximumIterations,\
+               seed=seed, callback=callback, callbackInterval=0)
+
+
+def _nd(function, lowerLimit, upperLimit, acceptableError,\
+        maximumIterations, callback, seed, adaptive=False):
+    return numerical.integrate.monte_carlo_nd(\
+               lambda x: function(x[:, 0]), [lowerLimit], [upperLimit],\
+               acceptableError, maximumIterations=maximumIterations,\
+               adaptive=adaptive, seed=seed, callback=callback,\
+               callbackInterval=0)
+
+
+def _vegas(function, lowerLimit, upperLimit, acceptableError,\
+           maximumIterations, callback, seed):
+    return _nd(function, lowerLimit, upperLimit, acceptableError,\
+               maximumIterations, callback, seed, adaptive=True)
+
+
+def _batch(function, lowerLimit, upperLimit, acceptableError,\
+           maximumIterations, callback, seed):
+
+    # Four copies of the integral in one call. monte_carlo_batch has no
+    # callback and returns nothing if it reaches its maximum, so the function
+    # values it evaluates are accumulated here, pooled over the copies as
+    # they are all of the same integral, and reported once whether or not
+    # it succeeds
+    cases = 4
+    statistics = numerical.integrate.RunningStatistics()
+
+    def counted(x):
+        fx = function(x)
+        statistics.update(numpy.ravel(fx))
+        return fx
+
+    progress = numerical.integrate.progress.Progress(callback, 0)
+    try:
+        numerical.integrate.monte_carlo_batch(\
+            counted, numpy.full(cases, lowerLimit), upperLimit,\
+            acceptableError, maximumIterations=maximumIterations//cases,\
+            seed=seed)
+    finally:
+        width = upperLimit - lowerLimit
+        if statistics.count:
+            progress.finish(width*statistics.mean,\
+                            abs(width)*statistics.standardError,\
+                            statistics.count)
+    return width*statistics.mean
+
+
+def _anytime(function, lowerLimit, upperLimit, acceptableError,\
+             maximumIterations, callback, seed):
+
+    # The anytime integrator returns its best estimate when it reaches its
+    # maximum rather than raising, so a missed target is raised here
+    area, epsilon, iterations = numerical.integrate.monte_carlo_anytime(\
+                                    function, lowerLimit, upperLimit,\
+                                    acceptableError,\
+                                    maximumIterations=maximumIterations,\
+                                    seed=seed, callback=callback,\
+                                    callbackInterval=0)
+    if epsilon >= acceptableError:
+        raise RuntimeError('Reached maximum number of allowed '\
+                           'iterations: {0}'.format(maximumIterations))
+    return area
+
+
+def _resumable(function, lowerLimit, upperLimit, acceptableError,\
+               maximumIterations, callback, seed):
+    with tempfile.TemporaryDirectory() as directory:
+        return numerical.integrate.monte_carlo_resumable(\
+                   function, lowerLimit, upperLimit, acceptableError,\
+                   os.path.join(directory, 'checkpoint.npz'),\
+                   maximumIterations=maximumIterations, seed=seed,\
+                   callback=callback, callbackInterval=0)
+
+
+def _quadrature(function, lowerLimit, upperLimit, acceptableError,\
+                maximumIterations, callback, seed):
+
+    # Tabulates the integrand at 2**k + 1 evenly spaced points, doubling k
+    # until the error estimate of numerical.integrate.quadrature is met. Each
+    # table is evaluated afresh, so every table's points are counted.
+    progress = numerical.integrate.progress.Progress(callback, 0)
+    points = 3
+    iterations = 0
+    while True:
+        if iterations + points > maximumIterations:
+            raise RuntimeError('Reached maximum number of allowed '\
+                               'iterations: {0}'.format(maximumIterations))
+        x = numpy.linspace(lowerLimit, upperLimit, points)
+        area, epsilon = numerical.integrate.quadrature(function(x), x)
+        iterations += points
+        if epsilon < acceptableError:
+            break
+        progress.update(area, epsilon, iterations)
+        points = 2*points - 1
+
+    progress.finish(area, epsilon, iterations)
+    return area
+
+
+# Each mode integrates one integrand, reporting to a callback, with a
+# maximum number of evaluations. The scalar loops are limited to fewer
+# evaluations as they are far slower than the rest, and quadrature to fewer
+# as each of its tables is held in memory at once.
+MODES = {'average': (_average, 10**6),
+         'hit_or_miss': (_hit_or_miss, 10**6),
+         'average_vectorized': (_average_vectorized, 10**8),
+         'hit_or_miss_vectorized': (_hit_or_miss_vectorized, 10**8),
+         'stratified': (_stratified, 10**8),
+         'antithetic': (_antithetic, 10**8),
+         'importance': (_importance, 10**8),
+         'control_variate': (_control_variate, 10**8),
+         'sobol': (_sobol, 10**8),
+         'halton': (_halton, 10**8),
+         'parallel': (_parallel, 10**8),
+         'nd': (_nd, 10**8),
+         'vegas': (_vegas, 10**8),
+         'batch': (_batch, 10**8),
+         'anytime': (_anytime, 10**8),
+         'resumable': (_resumable, 10**8),
+         'quadrature': (_quadrature, 10**7)}
+
+
+def _convergence_order(iterations, epsilons):
+
+    # The least squares slope of log(epsilon) against log(iterations)
+    iterations = numpy.asarray(iterations, dtype=float)
+    epsilons = numpy.asarray(epsilons, dtype=float)
+    valid = (iterations > 0) & (epsilons > 0) & numpy.isfinite(epsilons)
+    if numpy.count_nonzero(valid) < 3 or \
+       numpy.ptp(numpy.log(iterations[valid])) < 1:
+        return None
+    return float(numpy.polyfit(numpy.log(iterations[valid]),\
+                               numpy.log(epsilons[valid]), 1)[0])
+
+
+def run_benchmark(modes=None, integrands=None, targets=TARGETS, seed=0):
+
+    """
+    title::
+        run_benchmark
+
+    description::
+        Runs every integrator mode on every integrand until the tightest
+        target is met or the mode's maximum number of evaluations is reached.
+        A case that reaches its maximum records the targets it did meet.
+
+    attributes::
+        modes
+            (list or tuple [optional]) The names of the modes in MODES to run.
+            Defaults to None, in which case every mode is run.
+
+        integrands
+            (list or tuple [optional]) The names of the integrands in
+            INTEGRANDS to run. Defaults to None, in which case every
+            integrand is run.
+
+        targets
+            (list or tuple [optional]) The error targets, relative to the
+            exact integral, at which the time taken is recorded. Defaults to
+            TARGETS.
+
+        seed
+            (int [optional]) The seed of the random number generators.
+            Defaults to 0.
+
+    returns::
+        results
+            (dictionary) The platform, the Python and numpy versions, the
+            targets and a list of cases. Each case records the mode, the
+            integrand, the exact and estimated area, the actual error, the
+            final epsilon, the number of evaluations, the elapsed time, the
+            evaluations per second, the time to reach each target (None if it
+            was not reached), the convergence order, whether the case
+            converged to the tightest target and whether the actual error is
+            within four epsilon.
+    """
+
+    modes = list(MODES) if modes is None else modes
+    integrands = list(INTEGRANDS) if integrands is None else integrands
+    tightest = min(targets)
+
+    cases = []
+    for mode in modes:
+        run, maximumIterations = MODES[mode]
+        for name in integrands:
+            function, lowerLimit, upperLimit, exact = INTEGRANDS[name]
+
+            trace = numerical.integrate.progress.ConvergenceTrace()
+            converged = True
+            try:
+                run(function, lowerLimit, upperLimit, tightest*abs(exact),\
+                    maximumIterations, trace, seed)
+            except RuntimeError:
+                converged = False
+
+            reports = trace.reports
+            last = reports[-1] if reports else None
+            # An epsilon of zero, from too few distinct samples, does not
+            # count as reaching a target
+            timeToTarget = {}
+            for target in targets:
+                reached = [report['elapsedTime'] for report in reports\
+                           if 0 < report['epsilon'] < target*abs(exact)]
+                timeToTarget[repr(target)] = reached[0] if reached else None
+
+            cases.append({'mode': mode,
+                          'integrand': name,
+                          'exact': exact,
+                          'area': last['area'] if last else None,
+                          'error': abs(last['area'] - exact) if last \
+                                   else None,
+                          'epsilon': last['epsilon'] if last else None,
+                          'iterations': last['iterations'] if last else 0,
+                          'seconds': last['elapsedTime'] if last else None,
+                          'evaluationsPerSecond':\
+                              last['evaluationsPerSecond'] if last else None,
+                          'timeToTarget': timeToTarget,
+                          'convergenceOrder':\
+                              _convergence_order(trace.column('iterations'),\
+                                                 trace.column('epsilon')),
+                          'converged': converged,
+                          'consistent': bool(last) and \
+                                        abs(last['area'] - exact) <= \
+                                        4*last['epsilon']})
+
+    return {'platform': platform.platform(),
+            'python': platform.python_version(),
+            'numpy': numpy.__version__,
+            'targets': list(targets),
+            'cases': cases}
+
+
+def _case_key(case):
+    return (case['mode'], case['integrand'])
+
+
+def compare_to_baseline(results, baseline, tolerance=10.0):
+
+    """
+    title::
+        compare_to_baseline
+
+    description::
+        Compares the evaluations per second of each case against the same
+        case in a baseline. Cases that are missing from either are ignored.
+
+    attributes::
+        results
+            (dictionary) Results returned by run_benchmark
+
+        baseline
+            (dictionary) Earlier results returned by run_benchmark, e.g. read
+            from a stored JSON file
+
+        tolerance
+            (float [optional]) The allowable drop in evaluations per second,
+            in percent. Defaults to 10.0.
+
+    returns::
+        regressions
+            (list) One dictionary per regressed case with the mode, the
+            integrand, the baseline and current evaluations per second and
+            the slow down in percent
+    """
+
+    baselineCases = {_case_key(case): case for case in baseline['cases']}
+
+    regressions = []
+    for case in results['cases']:
+        previous = baselineCases.get(_case_key(case))
+        if previous is None or not case['evaluationsPerSecond'] or \
+           not previous['evaluationsPerSecond']:
+            continue
+        slowDown = (previous['evaluationsPerSecond']/\
+                    case['evaluationsPerSecond'] - 1)*100
+        if slowDown > tolerance:
+            regressions.append({'mode': case['mode'],
+                                'integrand': case['integrand'],
+                                'baselineEvaluationsPerSecond':\
+                                    previous['evaluationsPerSecond'],
+                                'evaluationsPerSecond':\
+                                    case['evaluationsPerSecond'],
+                                'slowDown': slowDown})
+
+    return regressions
+
+
+if __name__ == '__main__':
+
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='Benchmark the '\
+                                     'numerical.integrate integrators')
+    parser.add_argument('--output', default='integrator_benchmark.json',
+                        help='file the results are written to as JSON')
+    parser.add_argument('--baseline',
+                        help='JSON results of an earlier run to compare to')
+    parser.add_argument('--tolerance', type=float, default=10.0,
+                        help='allowable slow down in percent')
+    parser.add_argument('--modes', nargs='+', choices=list(MODES))
+    parser.add_argument('--integrands', nargs='+', choices=list(INTEGRANDS))
+    parser.add_argument('--seed', type=int, default=0)
+    arguments = parser.parse_args()
+
+    results = run_benchmark(arguments.modes, arguments.integrands,\
+                            seed=arguments.seed)
+    with open(arguments.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print('{0:<24}{1:<15}{2:>12}{3:>11}{4:>11}{5:>7}{6:>12}  {7}'\
+          .format('Mode', 'Integrand', 'Evals/s', 'Error', 'Epsilon',\
+                  'Order', 'Consistent', 'Time to ' + ', '.join(repr(target)\
+                  for target in results['targets'])))
+    for case in results['cases']:
+        print('{0:<24}{1:<15}{2:>12.4g}{3:>11.2e}{4:>11.2e}{5:>7}{6:>12}  {7}'\
+              .format(case['mode'], case['integrand'],\
+                      case['evaluationsPerSecond'] or 0.0,\
+                      case['error'] if case['error'] is not None else\
+                      float('nan'),\
+                      case['epsilon'] if case['epsilon'] is not None else\
+                      float('nan'),\
+                      '-' if case['convergenceOrder'] is None else\
+                      '{0:.2f}'.format(case['convergenceOrder']),\
+                      str(case['consistent']),\
+                      ', '.join('-' if seconds is None else\
+                                '{0:.4f}'.format(seconds) for seconds\
+                                in case['timeToTarget'].values())))
+
+    failed = False
+    if arguments.baseline:
+        with open(arguments.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline,
+                                          arguments.tolerance)
+        for regression in regressions:
+            print('Regression: {0} on {1} is {2:.1f}% slower '\
+                  '({3:.4g} -> {4:.4g} evaluations/s)'\
+                  .format(regression['mode'], regression['integrand'],\
+                          regression['slowDown'],\
+                          regression['baselineEvaluationsPerSecond'],\
+                          regression['evaluationsPerSecond']))
+        if regressions:
+            failed = True
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,216 @@
+import json
+import os
+
+import numpy
+
+import numerical.integrate
+
+class Checkpoint():
+
+    """
+    title::
+        Checkpoint
+
+    description::
+        The state of a Monte Carlo integration, which is all that is needed
+        to resume it or to combine it with other runs: the method, the
+        limits, the envelope of the "Hit or Miss" method, the running
+        statistics of the samples, the number of function evaluations, the
+        size of the next batch and the state of the random number generator.
+        A checkpoint is saved to a small uncompressed numpy .npz file with no
+        pickled objects, written to a temporary file and renamed so a killed
+        process never leaves a half-written checkpoint behind. Checkpoints of
+        independent runs of the same integral, e.g. on separate machines with
+        different seeds, are merged with merge, which combines their running
+        statistics exactly so the combined epsilon is that of one run over
+        all of their samples. Each sample of the "Hit or Miss" method is
+        accumulated as the envelope it was drawn under times the hit, so runs
+        whose envelopes differ still merge into one unbiased estimate.
+
+    attributes::
+        method
+            (string) Either 'average' or 'hit_or_miss'
+
+        lowerLimit
+            (float) The lower (left-hand) boundary of the region
+
+        upperLimit
+            (float) The upper (right-hand) boundary of the region
+
+        maxY
+            (float [optional]) The envelope of the "Hit or Miss" method.
+            Defaults to 0.0.
+
+        statistics
+            (RunningStatistics [optional]) The running statistics of the
+            function values for the "Average" method or of the envelope times
+            the hits, maxY*hit, for the "Hit or Miss" method. Defaults to an
+            empty accumulator.
+
+        iterations
+            (int [optional]) The number of function evaluations. Defaults to
+            0.
+
+        size
+            (int [optional]) The number of samples in the next batch.
+            Defaults to 0.
+
+        rngState
+            (dictionary [optional]) The state of the numpy random Generator's
+            bit generator. Defaults to None, as after a merge.
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    def __init__(self, method, lowerLimit, upperLimit, maxY=0.0,\
+                 statistics=None, iterations=0, size=0, rngState=None):
+
+        """
+        description::
+            Instantiates a checkpoint
+        """
+
+        if method not in ('average', 'hit_or_miss'):
+            msg = 'Provided attribute "method" must be "average" or '\
+                  '"hit_or_miss"'
+            raise ValueError(msg)
+
+        self.method = method
+        self.lowerLimit = float(lowerLimit)
+        self.upperLimit = float(upperLimit)
+        self.maxY = float(maxY)
+        self.statistics = statistics if statistics is not None \
+                          else numerical.integrate.RunningStatistics()
+        self.iterations = int(iterations)
+        self.size = int(size)
+        self.rngState = rngState
+
+    def __repr__(self):
+
+        """
+        description::
+            Returns the string representation of the checkpoint
+        """
+
+        return 'Checkpoint(method={0!r}, area={1}, epsilon={2}, '\
+               'iterations={3})'.format(self.method, self.area,\
+                                        self.epsilon, self.iterations)
+
+    @property
+    def area(self):
+
+        """
+        description::
+            The estimate of the area under the curve
+        """
+
+        return (self.upperLimit - self.lowerLimit)*self.statistics.mean
+
+    @property
+    def epsilon(self):
+
+        """
+        description::
+            The estimated error of the area
+        """
+
+        if self.statistics.count <= 1:
+            return float('inf')
+        width = abs(self.upperLimit - self.lowerLimit)
+        if self.method == 'average':
+            return width*self.statistics.standardError
+        return (2.0/3.0)*width*self.statistics.standardError
+
+    def merge(self, other):
+
+        """
+        description::
+            Merges the samples of the checkpoint of another, independent run
+            of the same integral into this one. The random number generator
+            state is dropped, as the merged samples came from more than one
+            stream, and the envelope of the "Hit or Miss" method becomes the
+            wider of the two so a resumed merged run stays above the
+            function.
+
+        attributes::
+            other
+                (Checkpoint) The checkpoint to merge
+
+        returns::
+            self
+                (Checkpoint) This checkpoint so merges can be chained
+        """
+
+        if (other.method, other.lowerLimit, other.upperLimit) != \
+           (self.method, self.lowerLimit, self.upperLimit):
+            msg = 'Checkpoints must be of the same method and limits to be '\
+                  'merged'
+            raise ValueError(msg)
+
+        self.statistics.merge(other.statistics)
+        self.maxY = max(self.maxY, other.maxY)
+        self.iterations += other.iterations
+        self.size = max(self.size, other.size)
+        self.rngState = None
+        return self
+
+    def save(self, filename):
+
+        """
+        description::
+            Saves the checkpoint to a numpy .npz file, atomically replacing
+            any previous checkpoint of the same name
+
+        attributes::
+            filename
+                (string) The name of the file
+        """
+
+        temporary = filename + '.tmp'
+        with open(temporary, 'wb') as f:
+            numpy.savez(f,
+                        method=numpy.array(self.method),
+                        limits=numpy.array([self.lowerLimit, self.upperLimit,\
+                                            self.maxY]),
+                        counts=numpy.array([self.statistics.count,\
+                                            self.iterations, self.size],\
+                                           dtype=numpy.int64),
+                        moments=numpy.array([self.statistics.mean,\
+                                             self.statistics.m2]),
+                        rngState=numpy.array(json.dumps(self.rngState)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, filename)
+
+    @classmethod
+    def load(cls, filename):
+
+        """
+        description::
+            Loads a checkpoint saved with save
+
+        attributes::
+            filename
+                (string) The name of the file
+
+        returns::
+            checkpoint
+                (Checkpoint) The loaded checkpoint
+        """
+
+        with numpy.load(filename, allow_pickle=False) as data:
+            lowerLimit, upperLimit, maxY = data['limits'].tolist()
+            count, iterations, size = data['counts'].tolist()
+            mean, m2 = data['moments'].tolist()
+            statistics = numerical.integrate.RunningStatistics(count, mean, m2)
+            return cls(str(data['method']), lowerLimit, upperLimit, maxY,\
+                       statistics, iterations, size,\
+                       json.loads(str(data['rngState'])))
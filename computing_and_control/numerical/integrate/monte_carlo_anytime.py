@@ -0,0 +1,307 @@
+import asyncio
+import time
+from math import sqrt
+
+import numpy
+
+import numerical.integrate
+
+def _batches(function, lowerLimit, upperLimit, acceptableError, timeBudget,\
+             method, maximumIterations, batchSize, growthFactor,\
+             maximumBatchSize, numberSamples, envelopeMargin, seed):
+
+    # Yield the area, epsilon and number of samples after every batch until
+    # the acceptable error, the time budget or the maximum number of samples
+    # is reached. Each batch is sized so it is expected to finish before the
+    # deadline, using the time per sample of the previous batch. The clock
+    # starts once the generator and the envelope are set up, and at least one
+    # batch is always counted so there is an estimate to return.
+    if method not in ('average', 'hit_or_miss'):
+        msg = 'Provided attribute "method" must be "average" or "hit_or_miss"'
+        raise ValueError(msg)
+
+    rng = numpy.random.default_rng(seed)
+    width = upperLimit - lowerLimit
+
+    # Estimate the maximum point of the function for the "Hit or Miss" method
+    maxY = 0.0
+    if method == 'hit_or_miss':
+        x = rng.uniform(lowerLimit, upperLimit, numberSamples)
+        maxY = float(numpy.max(function(x)))*(1 + envelopeMargin)
+
+    statistics = numerical.integrate.RunningStatistics()
+    area = 0.0
+    epsilon = float('inf')
+    iterations = 0
+    size = batchSize
+    secondsPerSample = 0.0
+    startTime = time.perf_counter()
+    deadline = startTime + timeBudget if timeBudget is not None \
+               else float('inf')
+
+    while epsilon >= acceptableError or statistics.count <= 1:
+
+        # Stop with the best estimate so far once the time budget or the
+        # maximum allowable number of samples is used up
+        now = time.perf_counter()
+        if (now >= deadline and statistics.count) or \
+           iterations >= maximumIterations:
+            break
+
+        # Do not start a batch that is expected to overrun the deadline, but
+        # always evaluate at least two samples
+        size = min(int(size), maximumBatchSize, maximumIterations - iterations)
+        if timeBudget is not None and secondsPerSample > 0:
+            size = max(min(size, int((deadline - now)/secondsPerSample)), 2)
+
+        x = rng.uniform(lowerLimit, upperLimit, size)
+        fx = numpy.broadcast_to(numpy.asarray(function(x), dtype=float),\
+                                x.shape)
+        if method == 'hit_or_miss':
+            y = rng.uniform(0, maxY, size)
+            batchMaxY = float(numpy.max(fx))
+
+            # If the function rises above the envelope, raise the envelope
+            # and restart the counts
+            if batchMaxY > maxY:
+                maxY = batchMaxY*(1 + envelopeMargin)
+                statistics = numerical.integrate.RunningStatistics()
+                epsilon = float('inf')
+                iterations += size
+                continue
+            statistics.update((y <= fx).astype(float))
+        else:
+            statistics.update(fx)
+        iterations += size
+        secondsPerSample = (time.perf_counter() - now)/size
+
+        # Calculate epsilon and the area under curve
+        if method == 'average':
+            area = width*statistics.mean
+            epsilon = abs(width)*statistics.standardError
+        else:
+            ratio = statistics.mean
+            area = ratio*width*maxY
+            epsilon = (2.0/3.0)*width*maxY*\
+                      sqrt((ratio*(1 - ratio))/statistics.count)
+
+        yield area, epsilon, iterations
+
+        size *= growthFactor
+
+
+def monte_carlo_anytime(function, lowerLimit, upperLimit, acceptableError,\
+                        timeBudget=None, method='average',\
+                        maximumIterations=10**8, batchSize=1000,\
+                        growthFactor=2, maximumBatchSize=2**20,\
+                        numberSamples=1000, envelopeMargin=0.05, seed=None,\
+                        callback=None, callbackInterval=0.1):
+
+    """
+    title::
+        monte_carlo_anytime
+
+    description::
+        This method will perform an integration using either the Monte Carlo
+        "Average" or "Hit or Miss" method on batches of samples and return
+        the best estimate available when it stops, rather than raising a
+        RuntimeError. It stops once epsilon is less than the acceptable
+        error, the time budget has elapsed or the maximum number of samples
+        has been evaluated, whichever comes first, but always after at least
+        one batch so that there is an estimate to return. The next batch is
+        sized from the time per sample of the previous one so it is expected
+        to finish within the budget, which therefore bounds the latency of
+        the call to roughly one function evaluation of slack.
+
+    attributes::
+        function
+            (function) Function for which the area will be found under. It
+            must accept a numpy ndarray of x-values and return an ndarray of
+            y-values of the same shape, e.g. numpy.sqrt.
+
+        lowerLimit
+            (int or float) The lower (left-hand) boundary of the region beneath
+            the function for which the area is to be found.
+
+        upperLimit
+            (int or float) The upper (right-hand) boundary of the region
+            beneath the function for which the area is to be found.
+
+        acceptableError
+            (float) The acceptable error for the approximation of the area.
+            Use 0 to integrate for the whole time budget.
+
+        timeBudget
+            (float [optional]) The number of seconds the integration may run.
+            Default value of None, in which case there is no time limit.
+
+        method
+            (string [optional]) Either 'average' or 'hit_or_miss'. Default
+            value of 'average'.
+
+        maximumIterations
+            (int [optional]) The maximum number of samples to evaluate.
+            Default value of 10**8.
+
+        batchSize
+            (int [optional]) The number of samples in the first batch. Default
+            value of 1000.
+
+        growthFactor
+            (int or float [optional]) The factor by which each batch is larger
+            than the previous batch. Default value of 2.
+
+        maximumBatchSize
+            (int [optional]) The largest number of samples in a batch, which
+            bounds the memory used. Default value of 2**20.
+
+        numberSamples
+            (int [optional]) The number of samples at which the function is
+            evaluated to estimate its maximum for the "Hit or Miss" method.
+            Default value of 1000.
+
+        envelopeMargin
+            (float [optional]) The fraction by which the estimated maximum of
+            the function is widened for the "Hit or Miss" method. Default
+            value of 0.05.
+
+        seed
+            (int [optional]) The seed of the random number generator. Default
+            value of None, in which case fresh entropy is used.
+
+        callback
+            (function [optional]) Called with a dictionary of the area,
+            epsilon, iterations, evaluations per second and elapsed time at
+            most once every callbackInterval seconds and once when the
+            integration finishes. Default value of None.
+
+        callbackInterval
+            (float [optional]) The minimum number of seconds between calls to
+            callback. Default value of 0.1.
+
+    returns::
+        area
+            (float) The best estimate of the area under the curve, or nan if
+            no samples could be evaluated, e.g. with a maximumIterations of 0
+
+        epsilon
+            (float) The estimated error of the area, which is infinite if no
+            estimate could be made
+
+        iterations
+            (int) The number of samples evaluated
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    progress = numerical.integrate.progress.Progress(callback,\
+                                                     callbackInterval)
+
+    area, epsilon, iterations = float('nan'), float('inf'), 0
+    for area, epsilon, iterations in _batches(function, lowerLimit,\
+                                              upperLimit, acceptableError,\
+                                              timeBudget, method,\
+                                              maximumIterations, batchSize,\
+                                              growthFactor, maximumBatchSize,\
+                                              numberSamples, envelopeMargin,\
+                                              seed):
+        progress.update(area, epsilon, iterations)
+
+    progress.finish(area, epsilon, iterations)
+    return area, epsilon, iterations
+
+
+async def monte_carlo_anytime_async(function, lowerLimit, upperLimit,\
+                                    acceptableError, timeBudget=None,\
+                                    method='average', maximumIterations=10**8,\
+                                    batchSize=1000, growthFactor=2,\
+                                    maximumBatchSize=2**16,\
+                                    numberSamples=1000, envelopeMargin=0.05,\
+                                    seed=None, callback=None,\
+                                    callbackInterval=0.1):
+
+    """
+    title::
+        monte_carlo_anytime_async
+
+    description::
+        The coroutine version of monte_carlo_anytime. It yields to the event
+        loop after every batch so many integrations can run concurrently in
+        one process without blocking it, e.g. with asyncio.gather. The
+        default maximumBatchSize is smaller than that of monte_carlo_anytime
+        so no single batch holds the event loop for long. The attributes and
+        returns are those of monte_carlo_anytime.
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    progress = numerical.integrate.progress.Progress(callback,\
+                                                     callbackInterval)
+
+    area, epsilon, iterations = float('nan'), float('inf'), 0
+    for area, epsilon, iterations in _batches(function, lowerLimit,\
+                                              upperLimit, acceptableError,\
+                                              timeBudget, method,\
+                                              maximumIterations, batchSize,\
+                                              growthFactor, maximumBatchSize,\
+                                              numberSamples, envelopeMargin,\
+                                              seed):
+        progress.update(area, epsilon, iterations)
+        await asyncio.sleep(0)
+
+    progress.finish(area, epsilon, iterations)
+    return area, epsilon, iterations
+
+
+if __name__ == '__main__':
+
+    import numerical.integrate
+
+    lowerLimit = 0.0
+    upperLimit = 1.0
+    for timeBudget in (0.01, 0.1, 1.0):
+        for method in ('average', 'hit_or_miss'):
+            startTime = time.time()
+            area, epsilon, iterations = \
+                numerical.integrate.monte_carlo_anytime(numpy.sqrt,\
+                                                        lowerLimit,\
+                                                        upperLimit, 0,\
+                                                        timeBudget=timeBudget,\
+                                                        method=method,\
+                                                        seed=2016)
+            print('Elapsed time = {0:.6f} [s] of {1} [s] ({2})'\
+                  .format(time.time() - startTime, timeBudget, method))
+            print('Area of f(x)=sqrt(x) over [{0}, {1}] = {2} +/- {3:.2e} '\
+                  'from {4} samples'.format(lowerLimit, upperLimit, area,\
+                                            epsilon, iterations))
+
+    # Many concurrent integrations sharing one event loop
+    async def main():
+        return await asyncio.gather(*[
+            numerical.integrate.monte_carlo_anytime_async(\
+                lambda x, p=p: x**p, lowerLimit, upperLimit, 0,\
+                timeBudget=0.5, seed=p) for p in range(1, 9)])
+
+    startTime = time.time()
+    results = asyncio.run(main())
+    print('Elapsed time = {0:.6f} [s] for {1} concurrent integrations'\
+          .format(time.time() - startTime, len(results)))
+    for p, (area, epsilon, iterations) in enumerate(results, 1):
+        print('Area of f(x)=x**{0} = {1:.6f} +/- {2:.2e} (exact {3:.6f})'\
+              .format(p, area, epsilon, 1/(p + 1)))
@@ -1,10 +1,19 @@
+import collections.abc
 import inspect
 import random
 import time
 from math import sqrt
 
+import numpy
+
+import numerical.integrate
+
 def monte_carlo_average(function, lowerLimit, upperLimit, acceptableError,\
-                        maximumIterations=100000):
+                        maximumIterations=100000, vectorized=False,\
+                        batchSize=1000, seed=None,\
+                        workers=None, sampling='random', sampler=None,\
+                        callback=None, callbackInterval=0.1,\
+                        quadrature=None):
 
     """
     title::
@@ -14,16 +23,19 @@ def monte_carlo_average(function, lowerLimit, upperLimit, acceptableError,\
         This method will perform an integration using the Monte Carlo "Average"
         method. If the method is given a list or tuple it is assumed that the 
         values are the y-values of the function and are between the desired 
-        bounds to integrate over. If the method is given a function it will 
-        iterate until it obtains the area under the curve to within a specified
-        acceptable error.
+        bounds to integrate over. Any other iterable, such as a generator of
+        samples or of numpy arrays of samples from a sensor stream, is
+        treated the same way but read in one pass with constant memory. If
+        the method is given a function it will iterate until it obtains the
+        area under the curve to within a specified acceptable error.
 
     attributes::
         function
-            (function, list or tuple) Function for which the area will be found
-            under. If list or tuple, it is assumed the values are the y-values
-            of the function and are between the desired bounds to integrate 
-            over.
+            (function, list, tuple or iterable) Function for which the area
+            will be found under. If list or tuple, it is assumed the values
+            are the y-values of the function and are between the desired
+            bounds to integrate over. Any other iterable may yield single
+            y-values or numpy arrays of y-values.
 
         lowerLimit
             (int or float) The lower (left-hand) boundary of the region beneath
@@ -44,6 +56,66 @@ def monte_carlo_average(function, lowerLimit, upperLimit, acceptableError,\
             the method may execute before raising a RuntimeError. Default
             value of 100000. Ignored if function attribute is a list or tuple
 
+        vectorized
+            (bool [optional]) If True the function is evaluated on numpy
+            arrays of samples in geometrically growing batches by
+            monte_carlo_average_vectorized. The function must then accept and
+            return numpy ndarrays. Default value of False. Ignored if function
+            attribute is a list or tuple
+
+        batchSize
+            (int [optional]) The number of samples in the first batch when
+            vectorized is True. Default value of 1000.
+
+        seed
+            (int [optional]) The seed of the random number generator when
+            vectorized is True, workers is given or sampling is not 'random'.
+            Default value of None.
+
+        workers
+            (int [optional]) If given, the integration is split across this
+            many worker processes by monte_carlo_parallel, each with its own
+            random stream derived from seed, or from 0 if seed is None, so
+            the result is reproducible. The function must then accept and
+            return numpy ndarrays and be picklable. Default value of None.
+
+        sampling
+            (string [optional]) Either 'random' for pseudo-random samples, or
+            'sobol' or 'halton' for scrambled low-discrepancy samples
+            integrated by quasi_monte_carlo. The function must accept and
+            return numpy ndarrays for 'sobol' and 'halton'. Default value of
+            'random'.
+
+        sampler
+            (sampler [optional]) A variance-reduction sampler from
+            numerical.integrate.samplers, e.g. StratifiedSampler(),
+            AntitheticSampler(), ControlVariateSampler(...) or
+            ImportanceSampler(...). If given, the integration is vectorized,
+            and workers and sampling may not be given with it, as neither
+            supports a sampler. The function attribute must then be a
+            function. Default value of None.
+
+        callback
+            (function [optional]) Called with a dictionary of the area,
+            epsilon, iterations, evaluations per second and elapsed time at
+            most once every callbackInterval seconds and once when the
+            integration finishes, e.g. numerical.integrate.progress.
+            PrintProgress() or ConvergenceTrace(). Default value of None, in
+            which case the integration is silent.
+
+        callbackInterval
+            (float [optional]) The minimum number of seconds between calls to
+            callback. Default value of 0.1.
+
+        quadrature
+            (string [optional]) If given and the function attribute is a list,
+            tuple or numpy ndarray of y-values evenly spaced from lowerLimit to
+            upperLimit inclusive, it is integrated by
+            numerical.integrate.quadrature with one of 'auto', 'trapezoid',
+            'simpson' or 'romberg' instead of being treated as random samples.
+            The estimated error is reported to the callback. Default value of
+            None.
+
     returns::
         area
             (float) The area under the curve to within a specified acceptable
@@ -61,6 +133,77 @@ def monte_carlo_average(function, lowerLimit, upperLimit, acceptableError,\
         1.0.0
 
     """
+
+    if sampler is not None and (workers is not None or sampling != 'random'):
+        msg = 'Provided attribute "sampler" cannot be combined with '\
+              '"workers" or "sampling"'
+        raise ValueError(msg)
+    if sampler is not None and not callable(function):
+        msg = 'Provided attribute "sampler" requires "function" to be a '\
+              'function, not tabulated or streamed y-values'
+        raise ValueError(msg)
+
+    # Use low-discrepancy samples if requested
+    if sampling != 'random' and callable(function):
+        return numerical.integrate.quasi_monte_carlo(function,\
+                                                   lowerLimit,\
+                                                   upperLimit,\
+                                                   acceptableError,\
+                                                   method='average',\
+                                                   sequence=sampling,\
+                                                   maximumIterations=\
+                                                   maximumIterations,\
+                                                   seed=seed,\
+                                                   callback=callback,\
+                                                   callbackInterval=\
+                                                   callbackInterval)
+
+    # Split the integration across worker processes if requested
+    if workers is not None and callable(function):
+        return numerical.integrate.monte_carlo_parallel(function,\
+                                                   lowerLimit,\
+                                                   upperLimit,\
+                                                   acceptableError,\
+                                                   method='average',\
+                                                   workers=workers,\
+                                                   seed=0 if seed is None\
+                                                   else seed,\
+                                                   maximumIterations=\
+                                                   maximumIterations,\
+                                                   batchSize=batchSize,\
+                                                   callback=callback,\
+                                                   callbackInterval=\
+                                                   callbackInterval)
+
+    # Evaluate batches of samples at once if a vectorized integration was
+    # requested
+    if (vectorized or sampler is not None) and callable(function):
+        return numerical.integrate.monte_carlo_average_vectorized(function,\
+                                                   lowerLimit,\
+                                                   upperLimit,\
+                                                   acceptableError,\
+                                                   maximumIterations,\
+                                                   batchSize=batchSize,\
+                                                   seed=seed,\
+                                                   sampler=sampler,\
+                                                   callback=callback,\
+                                                   callbackInterval=\
+                                                   callbackInterval)
+    
+    # Report progress to the callback, if any, no more often than
+    # callbackInterval
+    progress = numerical.integrate.progress.Progress(callback,\
+                                                     callbackInterval)
+
+    # Integrate tabulated data with a deterministic rule if requested
+    if quadrature is not None and \
+       isinstance(function, (list, tuple, numpy.ndarray)):
+        area, epsilon = numerical.integrate.quadrature(function,\
+                                                   lowerLimit=lowerLimit,\
+                                                   upperLimit=upperLimit,\
+                                                   method=quadrature)
+        progress.finish(area, epsilon, len(function))
+        return area
     
     # Check if function attribute is a list or tuple
     if isinstance(function, list) or isinstance(function, tuple):
@@ -80,18 +223,13 @@ def monte_carlo_average(function, lowerLimit, upperLimit, acceptableError,\
         epsilon = (upperLimit - lowerLimit)*sqrt((fSquaredBar - fBar**2)\
                    /numElements)
 
-        # Calculate area and print epsilon. Comment out if unnecessary to 
-        # print out.
+        # Calculate area
         area = (upperLimit - lowerLimit)*fBar
-        print('Error: {0}'.format(epsilon))
+        iterations = numElements
             
     # Check if function attribute is a function    
     elif inspect.isfunction(function):
 
-        # Create small table for display purposes on command line.
-        # Comment out if unnecessary.
-        print('\nArea\t\tEpsilon\t\tIterations')
-        
         # Define variables. Epsilon is set to infinity in order to begin
         # while loop.
         fSum = 0
@@ -110,7 +248,6 @@ def monte_carlo_average(function, lowerLimit, upperLimit, acceptableError,\
             # If the number of iterations reaches the maximum allowable
             # iterations a RuntimeError is raised.
             if iterations == maximumIterations:
-                print()
                 raise RuntimeError('Reached maximum number of allowed '\
                                    'iterations: {0}'.format(maximumIterations))
             else:
@@ -132,33 +269,57 @@ def monte_carlo_average(function, lowerLimit, upperLimit, acceptableError,\
                 # Calculate area under curve
                 area = (upperLimit - lowerLimit)*fBar
 
-                # Prints out area under curve, epsilon, and iterations.
-                # Continuously updates during integration. Comment out if
-                # unnecessary.
-                print('{0:.6f}\t{1:.6f}\t{2}'\
-                      .format(area, epsilon, iterations),end='\r')
-                     
+                # Reports area under curve, epsilon, and iterations to the
+                # callback
+                progress.update(area, epsilon, iterations)
+
+    # Check if function attribute is any other iterable of samples, e.g. a
+    # generator or an iterator of numpy chunks. A numpy ndarray is taken as a
+    # single chunk.
+    elif isinstance(function, collections.abc.Iterable):
+
+        chunks = [function] if isinstance(function, numpy.ndarray) \
+                 else function
+
+        # Accumulate the mean and variance of the samples in one pass
+        statistics = numerical.integrate.RunningStatistics()
+        for chunk in chunks:
+            statistics.update(chunk)
+
+            # Calculate area and epsilon and report them to the callback
+            area = (upperLimit - lowerLimit)*statistics.mean
+            epsilon = (upperLimit - lowerLimit)*statistics.standardError
+            progress.update(area, epsilon, statistics.count)
+
+        if statistics.count == 0:
+            msg = 'Provided attribute "function" contains no samples'
+            raise ValueError(msg)
+        iterations = statistics.count
 
     else:
-        # Raise TypeError if the function attribute is not a function, list
-        # or tuple
-        msg = 'Provided attribute "function" is not a function, list or tuple'
+        # Raise TypeError if the function attribute is not a function or an
+        # iterable of samples
+        msg = 'Provided attribute "function" is not a function, list, tuple '\
+              'or iterable'
         raise TypeError(msg)
 
-    # Return area under curve. Print is added for command line formatting
-    # purposes. Comment out if unnecessary.
-    print()
+    # Report the final area under curve and return it
+    progress.finish(area, epsilon, iterations)
     return area
 
 if __name__ == '__main__':
     
     import math
     import numerical.integrate
+    import numpy
     import time
 
     def f(x):
         return math.sqrt(x)
     
+    # Print the area, epsilon and iterations table while integrating
+    progress = numerical.integrate.progress.PrintProgress()
+
     lowerLimit = 0.0
     upperLimit = 1.0
     for acceptableError in (0.1, 0.01, 0.001, 0.0001):
@@ -166,7 +327,23 @@ if __name__ == '__main__':
         area = numerical.integrate.monte_carlo_average(f,\
                                                        lowerLimit,\
                                                        upperLimit,\
-                                                       acceptableError)
+                                                       acceptableError,\
+                                                       callback=progress)
+        print('Elapsed time = {0:.6f} [s]'.format(time.time() - startTime))
+        print('With an acceptable error of {0:.10f}'.format(acceptableError))
+        print('Area of f(x)=sqrt(x) over [{0}, {1}] = {2}'.format(lowerLimit,\
+                                                                  upperLimit,\
+                                                                  area))
+
+    # Repeat the integrations evaluating batches of samples at once
+    for acceptableError in (0.1, 0.01, 0.001, 0.0001):
+        startTime = time.time()
+        area = numerical.integrate.monte_carlo_average(numpy.sqrt,\
+                                                       lowerLimit,\
+                                                       upperLimit,\
+                                                       acceptableError,\
+                                                       10**8,\
+                                                       vectorized=True)
         print('Elapsed time = {0:.6f} [s]'.format(time.time() - startTime))
         print('With an acceptable error of {0:.10f}'.format(acceptableError))
         print('Area of f(x)=sqrt(x) over [{0}, {1}] = {2}'.format(lowerLimit,\
@@ -0,0 +1,154 @@
+import numpy
+from math import sqrt
+
+import numerical.integrate
+
+def monte_carlo_average_vectorized(function, lowerLimit, upperLimit,\
+                                   acceptableError, maximumIterations=100000,\
+                                   batchSize=1000, growthFactor=2, seed=None,\
+                                   sampler=None,\
+                                   callback=None, callbackInterval=0.1):
+
+    """
+    title::
+        monte_carlo_average_vectorized
+
+    description::
+        This method will perform an integration using the Monte Carlo "Average"
+        method on batches of samples. The function is evaluated once on a
+        numpy array of uniformly random numbers per batch rather than once per
+        random number. Running sums of the function values and of their
+        squares are kept so that the area and epsilon are only calculated once
+        per batch. Each batch is growthFactor times larger than the previous
+        one, so the number of batches grows only logarithmically with the
+        number of samples needed to reach the acceptable error. A
+        variance-reduction sampler from numerical.integrate.samplers may be
+        given in place of the plain uniformly random samples. Each sampler
+        returns independent estimates of the area, so the area is their mean
+        and epsilon is the standard error of their mean.
+
+    attributes::
+        function
+            (function) Function for which the area will be found under. It
+            must accept a numpy ndarray of x-values and return an ndarray of
+            y-values of the same shape, e.g. lambda x: numpy.sqrt(x).
+
+        lowerLimit
+            (int or float) The lower (left-hand) boundary of the region beneath
+            the function for which the area is to be found.
+
+        upperLimit
+            (int or float) The upper (right-hand) boundary of the region
+            beneath the function for which the area is to be found.
+
+        acceptableError
+            (float) The acceptable error for the approximation of the area.
+
+        maximumIterations
+            (int [optional]) The maximum allowable number of samples that the
+            method may evaluate before raising a RuntimeError. Default value
+            of 100000.
+
+        batchSize
+            (int [optional]) The number of samples in the first batch. Default
+            value of 1000.
+
+        growthFactor
+            (int or float [optional]) The factor by which each batch is larger
+            than the previous batch. Default value of 2.
+
+        seed
+            (int [optional]) The seed of the random number generator. Default
+            value of None, in which case fresh entropy is used.
+
+        sampler
+            (sampler [optional]) A sampler from numerical.integrate.samplers,
+            e.g. StratifiedSampler(). Default value of None, in which case
+            UniformSampler is used.
+
+        callback
+            (function [optional]) Called with a dictionary of the area,
+            epsilon, iterations, evaluations per second and elapsed time at
+            most once every callbackInterval seconds and once when the
+            integration finishes, e.g. numerical.integrate.progress.
+            PrintProgress() or ConvergenceTrace(). Default value of None, in
+            which case the integration is silent.
+
+        callbackInterval
+            (float [optional]) The minimum number of seconds between calls to
+            callback. Default value of 0.1.
+
+    returns::
+        area
+            (float) The area under the curve to within a specified acceptable
+            error.
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    rng = numpy.random.default_rng(seed)
+    if sampler is None:
+        sampler = numerical.integrate.samplers.UniformSampler()
+
+    # Report progress to the callback, if any, no more often than
+    # callbackInterval
+    progress = numerical.integrate.progress.Progress(callback,\
+                                                     callbackInterval)
+
+    # Define variables. Epsilon is set to infinity in order to begin the
+    # while loop. Iterations counts the function evaluations, including any
+    # pilot evaluations of the sampler, and estimates counts the estimates of
+    # the area the sampler has returned.
+    fSum = 0.0
+    fSquaredSum = 0.0
+    estimates = 0
+    iterations = 0
+    epsilon = float('inf')
+    size = batchSize
+
+    # Start integration. Once epsilon is less than acceptable error the
+    # while loop is stopped. At least two estimates are needed to estimate
+    # epsilon.
+    while epsilon >= acceptableError or estimates <= 1:
+
+        # If the number of samples reaches the maximum allowable number a
+        # RuntimeError is raised.
+        if iterations >= maximumIterations:
+            raise RuntimeError('Reached maximum number of allowed '\
+                               'iterations: {0}'.format(maximumIterations))
+
+        # Do not draw more samples than the maximum allowable number
+        size = min(int(size), maximumIterations - iterations)
+
+        # Evaluate the function once on a batch of samples and add the
+        # estimates of the area and their squares to the running sums
+        fx, evaluations = sampler.sample(function, lowerLimit, upperLimit,\
+                                         size, rng)
+        fSum += float(fx.sum())
+        fSquaredSum += float(numpy.dot(fx, fx))
+        estimates += fx.size
+        iterations += evaluations
+
+        # Calculate an average of each total sum, epsilon and the area. The
+        # variance is clipped at zero to guard against round-off.
+        area = fSum/estimates
+        fSquaredBar = fSquaredSum/estimates
+        epsilon = sqrt(max(fSquaredBar - area**2, 0.0)/estimates)
+
+        # Reports area under curve, epsilon, and iterations to the
+        # callback
+        progress.update(area, epsilon, iterations)
+
+        size *= growthFactor
+
+    # Report the final area under curve and return it
+    progress.finish(area, epsilon, iterations)
+    return area
@@ -0,0 +1,205 @@
+import numpy
+
+def monte_carlo_batch(function, lowerLimits, upperLimits, acceptableError,\
+                      parameters=None, maximumIterations=100000,\
+                      batchSize=1000, growthFactor=2, maximumBatchSize=2**22,\
+                      seed=None):
+
+    """
+    title::
+        monte_carlo_batch
+
+    description::
+        This method will perform many integrations using the Monte Carlo
+        "Average" method in one call, e.g. the same spectrum over thousands
+        of spectral bands or the same function over a sweep of parameters.
+        Every case that has not yet reached its acceptable error is sampled
+        together in one two-dimensional numpy array per batch, one row per
+        case, and running sums of the function values and of their squares
+        are kept per case. Each case stops being sampled as soon as its
+        epsilon is less than its acceptable error, so easy cases do not pay
+        for hard ones. Batches grow by growthFactor, but the total number of
+        samples in one batch is capped at maximumBatchSize to bound memory.
+
+    attributes::
+        function
+            (function) Function for which the areas will be found under. It
+            is called with a numpy ndarray of x-values of shape (cases,
+            samples) and, if parameters is given, with the parameters of
+            those cases as a second argument, and must return an ndarray of
+            y-values of the same shape as the x-values, e.g.
+            lambda x, temperature: planck(x, temperature).
+
+        lowerLimits
+            (int, float, list, tuple or numpy ndarray) The lower (left-hand)
+            boundary of the region of each case.
+
+        upperLimits
+            (int, float, list, tuple or numpy ndarray) The upper (right-hand)
+            boundary of the region of each case. The limits are broadcast
+            against each other and against the first axis of parameters.
+
+        acceptableError
+            (float or numpy ndarray) The acceptable error for the
+            approximation of the area, either one value for every case or one
+            per case.
+
+        parameters
+            (numpy ndarray [optional]) One row of parameters per case. The
+            parameters of the cases being sampled are passed to function with
+            an axis inserted after the first, so a one-dimensional parameter
+            array has shape (cases, 1) and broadcasts against the x-values.
+            Default value of None, in which case function is called with the
+            x-values only.
+
+        maximumIterations
+            (int [optional]) The maximum allowable number of samples of any
+            one case before raising a RuntimeError. Default value of 100000.
+
+        batchSize
+            (int [optional]) The number of samples of each case in the first
+            batch. Default value of 1000.
+
+        growthFactor
+            (int or float [optional]) The factor by which each batch is larger
+            than the previous batch. Default value of 2.
+
+        maximumBatchSize
+            (int [optional]) The largest number of samples, over all cases,
+            in a batch. Default value of 2**22.
+
+        seed
+            (int [optional]) The seed of the random number generator. Default
+            value of None, in which case fresh entropy is used.
+
+    returns::
+        areas
+            (numpy ndarray) The area under the curve of each case to within
+            its acceptable error
+
+        errors
+            (numpy ndarray) The epsilon of each case
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    rng = numpy.random.default_rng(seed)
+
+    # Broadcast the limits, acceptable errors and parameters to one entry per
+    # case
+    shapes = [numpy.shape(lowerLimits), numpy.shape(upperLimits)]
+    if parameters is not None:
+        parameters = numpy.asarray(parameters)
+        shapes.append(parameters.shape[:1])
+    shape = numpy.broadcast_shapes(*shapes)
+    if len(shape) > 1:
+        msg = 'Provided attributes "lowerLimits" and "upperLimits" must be '\
+              'scalars or one-dimensional'
+        raise ValueError(msg)
+    lowerLimits = numpy.broadcast_to(numpy.asarray(lowerLimits, dtype=float),\
+                                     shape).ravel()
+    upperLimits = numpy.broadcast_to(numpy.asarray(upperLimits, dtype=float),\
+                                     shape).ravel()
+    cases = lowerLimits.size
+    acceptableError = numpy.broadcast_to(numpy.asarray(acceptableError,\
+                                                       dtype=float), (cases,))
+    width = upperLimits - lowerLimits
+
+    # Define variables. Epsilon is set to infinity so every case is sampled
+    # at least once.
+    fSum = numpy.zeros(cases)
+    fSquaredSum = numpy.zeros(cases)
+    samples = numpy.zeros(cases, dtype=numpy.int64)
+    areas = numpy.zeros(cases)
+    errors = numpy.full(cases, float('inf'))
+    active = numpy.arange(cases)
+    size = batchSize
+
+    # Start integration. Once every case's epsilon is less than its
+    # acceptable error the while loop is stopped. At least two samples of a
+    # case are needed to estimate its epsilon.
+    while active.size:
+
+        # If a case reaches the maximum allowable number of samples a
+        # RuntimeError is raised.
+        if samples[active].max() >= maximumIterations:
+            raise RuntimeError('Reached maximum number of allowed '\
+                               'iterations: {0} ({1} of {2} cases did not '\
+                               'converge)'.format(maximumIterations,\
+                                                  active.size, cases))
+
+        # Sample every active case together, bounding the size of the batch
+        size = min(int(size), maximumIterations - int(samples[active].max()))
+        rowSize = max(min(size, maximumBatchSize//active.size), 2)
+        u = rng.random((active.size, rowSize))
+        x = lowerLimits[active, None] + width[active, None]*u
+        if parameters is None:
+            fx = function(x)
+        else:
+            fx = function(x, parameters[active][:, None])
+        fx = numpy.broadcast_to(numpy.asarray(fx, dtype=float), x.shape)
+
+        # Add the function values and their squares to the running sums of
+        # each case
+        fSum[active] += fx.sum(axis=1)
+        fSquaredSum[active] += numpy.einsum('ij,ij->i', fx, fx)
+        samples[active] += rowSize
+
+        # Calculate an average of each total sum, epsilon and the area of
+        # each active case. The variance is clipped at zero to guard against
+        # round-off.
+        n = samples[active]
+        fBar = fSum[active]/n
+        fSquaredBar = fSquaredSum[active]/n
+        areas[active] = width[active]*fBar
+        errors[active] = numpy.abs(width[active])*\
+                         numpy.sqrt(numpy.maximum(fSquaredBar - fBar**2, 0)/n)
+
+        # Stop sampling the cases that have reached their acceptable error
+        active = active[errors[active] >= acceptableError[active]]
+
+        size *= growthFactor
+
+    return areas, errors
+
+
+if __name__ == '__main__':
+
+    import numerical.integrate
+    import time
+
+    # The area of f(x)=sqrt(x) over a thousand bands and, with a parameter
+    # per case, the area of f(x)=x**p over [0, 1]
+    lowerLimits = numpy.linspace(0, 9.99, 1000)
+    upperLimits = lowerLimits + 0.01
+    acceptableError = 1e-6
+    startTime = time.time()
+    areas, errors = numerical.integrate.monte_carlo_batch(numpy.sqrt,\
+                                                          lowerLimits,\
+                                                          upperLimits,\
+                                                          acceptableError,\
+                                                          seed=2016)
+    exact = (2.0/3.0)*(upperLimits**1.5 - lowerLimits**1.5)
+    print('Elapsed time = {0:.6f} [s]'.format(time.time() - startTime))
+    print('{0} bands, largest error = {1:.3e}, largest epsilon = {2:.3e}'\
+          .format(areas.size, numpy.max(numpy.abs(areas - exact)),\
+                  numpy.max(errors)))
+
+    powers = numpy.linspace(0.5, 4, 1000)
+    startTime = time.time()
+    areas, errors = numerical.integrate.monte_carlo_batch(\
+                        lambda x, p: x**p, 0.0, 1.0, 0.001,\
+                        parameters=powers, seed=2016)
+    exact = 1/(powers + 1)
+    print('Elapsed time = {0:.6f} [s]'.format(time.time() - startTime))
+    print('{0} powers, largest error = {1:.3e}, largest epsilon = {2:.3e}'\
+          .format(areas.size, numpy.max(numpy.abs(areas - exact)),\
+                  numpy.max(errors)))
@@ -3,8 +3,15 @@ import random
 import time
 from math import sqrt
 
+import numpy
+
+import numerical.integrate
+
 def monte_carlo_hit_or_miss(function, lowerLimit, upperLimit, acceptableError,\
-                        maximumIterations=100000, numberSamples=1000):
+                        maximumIterations=100000, numberSamples=1000,\
+                        vectorized=False, batchSize=1000, seed=None,\
+                        workers=None, sampling='random', callback=None,\
+                        callbackInterval=0.1, quadrature=None):
 
     """
     title::
@@ -49,6 +56,56 @@ def monte_carlo_hit_or_miss(function, lowerLimit, upperLimit, acceptableError,\
             (int [optional]) The of samples at which to initially define the
             function. 
 
+        vectorized
+            (bool [optional]) If True the integration is performed by
+            monte_carlo_hit_or_miss_vectorized on batches of numpy points,
+            keeping only running counts so memory does not grow with the
+            number of samples. The function must then accept and return numpy
+            ndarrays. Default value of False. Ignored if function attribute
+            is a list or tuple
+
+        batchSize
+            (int [optional]) The number of points in the first batch when
+            vectorized is True. Default value of 1000.
+
+        seed
+            (int [optional]) The seed of the random number generator when
+            vectorized is True, workers is given or sampling is not 'random'.
+            Default value of None.
+
+        workers
+            (int [optional]) If given, the integration is split across this
+            many worker processes by monte_carlo_parallel, each with its own
+            random stream derived from seed, or from 0 if seed is None, so
+            the result is reproducible. The function must then accept and
+            return numpy ndarrays and be picklable. Default value of None.
+
+        sampling
+            (string [optional]) Either 'random' for pseudo-random samples, or
+            'sobol' or 'halton' for scrambled low-discrepancy samples
+            integrated by quasi_monte_carlo. The function must accept and
+            return numpy ndarrays for 'sobol' and 'halton'. Default value of
+            'random'.
+
+        callback
+            (function [optional]) Called with a dictionary of the area,
+            epsilon, iterations, evaluations per second and elapsed time at
+            most once every callbackInterval seconds and once when the
+            integration finishes, e.g. numerical.integrate.progress.
+            PrintProgress() or ConvergenceTrace(). Default value of None, in
+            which case the integration is silent.
+
+        callbackInterval
+            (float [optional]) The minimum number of seconds between calls to
+            callback. Default value of 0.1.
+
+        quadrature
+            (string [optional]) If given and the function attribute is a 2 x M
+            list, tuple or numpy ndarray of x- and y-values, it is integrated
+            by numerical.integrate.quadrature with one of 'auto', 'trapezoid',
+            'simpson' or 'romberg' instead of the "Hit or Miss" method. The
+            estimated error is reported to the callback. Default value of None.
+
     returns::
         area
             (float) The area under the curve to within a specified acceptable
@@ -64,6 +121,72 @@ def monte_carlo_hit_or_miss(function, lowerLimit, upperLimit, acceptableError,\
         1.0.0
 
     """
+
+    # Use low-discrepancy samples if requested
+    if sampling != 'random' and callable(function):
+        return numerical.integrate.quasi_monte_carlo(function,\
+                                                   lowerLimit,\
+                                                   upperLimit,\
+                                                   acceptableError,\
+                                                   method='hit_or_miss',\
+                                                   sequence=sampling,\
+                                                   maximumIterations=\
+                                                   maximumIterations,\
+                                                   seed=seed,\
+                                                   numberSamples=\
+                                                   numberSamples,\
+                                                   callback=callback,\
+                                                   callbackInterval=\
+                                                   callbackInterval)
+
+    # Split the integration across worker processes if requested
+    if workers is not None and callable(function):
+        return numerical.integrate.monte_carlo_parallel(function,\
+                                                   lowerLimit,\
+                                                   upperLimit,\
+                                                   acceptableError,\
+                                                   method='hit_or_miss',\
+                                                   workers=workers,\
+                                                   seed=0 if seed is None\
+                                                   else seed,\
+                                                   maximumIterations=\
+                                                   maximumIterations,\
+                                                   batchSize=batchSize,\
+                                                   numberSamples=\
+                                                   numberSamples,\
+                                                   callback=callback,\
+                                                   callbackInterval=\
+                                                   callbackInterval)
+
+    # Evaluate batches of points at once if a vectorized integration was
+    # requested
+    if vectorized and callable(function):
+        return numerical.integrate.monte_carlo_hit_or_miss_vectorized(\
+                                                   function,\
+                                                   lowerLimit,\
+                                                   upperLimit,\
+                                                   acceptableError,\
+                                                   maximumIterations,\
+                                                   numberSamples,\
+                                                   batchSize=batchSize,\
+                                                   seed=seed,\
+                                                   callback=callback,\
+                                                   callbackInterval=\
+                                                   callbackInterval)
+
+    # Report progress to the callback, if any, no more often than
+    # callbackInterval
+    progress = numerical.integrate.progress.Progress(callback,\
+                                                     callbackInterval)
+
+    # Integrate tabulated data with a deterministic rule if requested
+    if quadrature is not None and \
+       isinstance(function, (list, tuple, numpy.ndarray)):
+        area, epsilon = numerical.integrate.quadrature(function[1],\
+                                                   function[0],\
+                                                   method=quadrature)
+        progress.finish(area, epsilon, len(function[1]))
+        return area
     
     # Check if function attribute is a list or tuple
     if isinstance(function, list) or isinstance(function, tuple):
@@ -79,18 +202,14 @@ def monte_carlo_hit_or_miss(function, lowerLimit, upperLimit, acceptableError,\
                     hits += 1
                     ratio = hits/len(randomY)
                     area = ratio*(max(function[0]) - min(function[0]))*maxY
-                    print('Area: {0}'.format(area),end='\r')
 
+        iterations = len(randomY)
         epsilon = (2.0/3.0)*(max(function[0]) - min(function[0]))*maxY*\
                   sqrt((ratio*(1 - ratio))/len(randomY))
             
     # Check if function attribute is a function    
     elif inspect.isfunction(function):
 
-        # Create small table for display purposes on command line.
-        # Comment out if unnecessary.
-        print('\nArea\t\tEpsilon\t\tIterations')
-
         # Define variables and empty lists. Epsilon is set to infinity in order
         # to begin while loop.
         maxY = 0
@@ -123,7 +242,6 @@ def monte_carlo_hit_or_miss(function, lowerLimit, upperLimit, acceptableError,\
             # If the number of iterations reaches the maximum allowable
             # iterations a RuntimeError is raised.
             if iterations == maximumIterations:
-                print()
                 raise RuntimeError('Reached maximum number of allowed '\
                                    'iterations: {0}'.format(maximumIterations))
             else:
@@ -154,12 +272,9 @@ def monte_carlo_hit_or_miss(function, lowerLimit, upperLimit, acceptableError,\
                 if randomY[-1] <= function(randomX[-1]):
                     hits += 1
  
-                # Prints out area under curve, epsilon, and iterations.
-                # Continuously updates during integration. Comment out if
-                # unnecessary.
-                print('{0:.6f}\t{1:.6f}\t{2}'\
-                      .format(area, epsilon, iterations),end='\r')
-                     
+                # Reports area under curve, epsilon, and iterations to the
+                # callback
+                progress.update(area, epsilon, iterations)
 
     else:
         # Raise TypeError if the function attribute is not a function, list
@@ -167,20 +282,23 @@ def monte_carlo_hit_or_miss(function, lowerLimit, upperLimit, acceptableError,\
         msg = 'Provided attribute "function" is not a function, list or tuple'
         raise TypeError(msg)
 
-    # Return area under curve. Print is added for command line formatting
-    # purposes. Comment out if unnecessary.
-    print()
+    # Report the final area under curve and return it
+    progress.finish(area, epsilon, iterations)
     return area
 
 if __name__ == '__main__':
 
     import math
     import numerical.integrate
+    import numpy
     import time
 
     def f(x):
         return math.sqrt(x)
 
+    # Print the area, epsilon and iterations table while integrating
+    progress = numerical.integrate.progress.PrintProgress()
+
     lowerLimit = 0.0
     upperLimit = 1.0
     for acceptableError in (0.1, 0.01, 0.001, 0.0001):
@@ -188,7 +306,23 @@ if __name__ == '__main__':
         area = numerical.integrate.monte_carlo_hit_or_miss(f,\
                                                        lowerLimit,\
                                                        upperLimit,\
-                                                       acceptableError)
+                                                       acceptableError,\
+                                                       callback=progress)
+        print('Elapsed time = {0:.6f} [s]'.format(time.time() - startTime))
+        print('With an acceptable error of {0:.10f}'.format(acceptableError))
+        print('Area of f(x)=sqrt(x) over [{0}, {1}] = {2}'.format(lowerLimit,\
+                                                                  upperLimit,\
+                                                                  area))
+
+    # Repeat the integrations evaluating batches of points at once
+    for acceptableError in (0.1, 0.01, 0.001, 0.0001):
+        startTime = time.time()
+        area = numerical.integrate.monte_carlo_hit_or_miss(numpy.sqrt,\
+                                                       lowerLimit,\
+                                                       upperLimit,\
+                                                       acceptableError,\
+                                                       10**8,\
+                                                       vectorized=True)
         print('Elapsed time = {0:.6f} [s]'.format(time.time() - startTime))
         print('With an acceptable error of {0:.10f}'.format(acceptableError))
         print('Area of f(x)=sqrt(x) over [{0}, {1}] = {2}'.format(lowerLimit,\
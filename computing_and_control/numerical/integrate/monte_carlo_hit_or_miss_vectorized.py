@@ -0,0 +1,175 @@
+import numpy
+from math import sqrt
+
+import numerical.integrate
+
+def monte_carlo_hit_or_miss_vectorized(function, lowerLimit, upperLimit,\
+                                       acceptableError,\
+                                       maximumIterations=100000,\
+                                       numberSamples=1000, batchSize=1000,\
+                                       growthFactor=2,\
+                                       maximumBatchSize=2**20,\
+                                       envelopeMargin=0.05, seed=None,\
+                                       callback=None, callbackInterval=0.1):
+
+    """
+    title::
+        monte_carlo_hit_or_miss_vectorized
+
+    description::
+        This method will perform an integration using the Monte Carlo "Hit or
+        Miss" method on batches of random points while keeping only running
+        counts of the points and the hits, so the memory used does not grow
+        with the number of samples. The bounding envelope (the maximum of the
+        function) is first estimated with a single vectorized pass over
+        numberSamples random x-values and widened by envelopeMargin. Each
+        batch of points is then evaluated once. If a batch finds the function
+        above the envelope, the envelope is raised and the counts are
+        restarted, as the points counted so far were drawn under an envelope
+        that cut off part of the curve and cannot be re-normalized.
+
+    attributes::
+        function
+            (function) Function for which the area will be found under. It
+            must be non-negative between the limits, accept a numpy ndarray of
+            x-values and return an ndarray of y-values of the same shape, e.g.
+            lambda x: numpy.sqrt(x).
+
+        lowerLimit
+            (int or float) The lower (left-hand) boundary of the region beneath
+            the function for which the area is to be found.
+
+        upperLimit
+            (int or float) The upper (right-hand) boundary of the region
+            beneath the function for which the area is to be found.
+
+        acceptableError
+            (float) The acceptable error for the approximation of the area.
+
+        maximumIterations
+            (int [optional]) The maximum allowable number of points that the
+            method may evaluate before raising a RuntimeError. Default value
+            of 100000.
+
+        numberSamples
+            (int [optional]) The number of samples at which the function is
+            evaluated to estimate its maximum. Default value of 1000.
+
+        batchSize
+            (int [optional]) The number of points in the first batch. Default
+            value of 1000.
+
+        growthFactor
+            (int or float [optional]) The factor by which each batch is larger
+            than the previous batch. Default value of 2.
+
+        maximumBatchSize
+            (int [optional]) The largest number of points in a batch, which
+            bounds the memory used. Default value of 2**20.
+
+        envelopeMargin
+            (float [optional]) The fraction by which the estimated maximum of
+            the function is widened. Default value of 0.05.
+
+        seed
+            (int [optional]) The seed of the random number generator. Default
+            value of None, in which case fresh entropy is used.
+
+        callback
+            (function [optional]) Called with a dictionary of the area,
+            epsilon, iterations, evaluations per second and elapsed time at
+            most once every callbackInterval seconds and once when the
+            integration finishes, e.g. numerical.integrate.progress.
+            PrintProgress() or ConvergenceTrace(). Default value of None, in
+            which case the integration is silent.
+
+        callbackInterval
+            (float [optional]) The minimum number of seconds between calls to
+            callback. Default value of 0.1.
+
+    returns::
+        area
+            (float) The area under the curve to within a specified acceptable
+            error.
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    rng = numpy.random.default_rng(seed)
+    width = upperLimit - lowerLimit
+
+    # Report progress to the callback, if any, no more often than
+    # callbackInterval
+    progress = numerical.integrate.progress.Progress(callback,\
+                                                     callbackInterval)
+
+    # Estimate the maximum point of the function within the bounds with one
+    # vectorized pass
+    x = rng.uniform(lowerLimit, upperLimit, numberSamples)
+    maxY = float(numpy.max(function(x)))*(1 + envelopeMargin)
+
+    # Define variables. Epsilon is set to infinity in order to begin the
+    # while loop.
+    hits = 0
+    points = 0
+    iterations = 0
+    epsilon = float('inf')
+    size = batchSize
+
+    # Start integration. Once epsilon is less than acceptable error the
+    # while loop is stopped.
+    while epsilon >= acceptableError or points <= 1:
+
+        # If the number of points reaches the maximum allowable number a
+        # RuntimeError is raised.
+        if iterations >= maximumIterations:
+            raise RuntimeError('Reached maximum number of allowed '\
+                               'iterations: {0}'.format(maximumIterations))
+
+        # Do not evaluate more points than the maximum allowable number
+        size = min(int(size), maximumBatchSize, maximumIterations - iterations)
+
+        # Create a batch of uniformly random points between the lower and
+        # upper limits and between 0 and the maximum point of the function
+        x = rng.uniform(lowerLimit, upperLimit, size)
+        y = rng.uniform(0, maxY, size)
+        fx = numpy.broadcast_to(function(x), x.shape)
+        iterations += size
+
+        # If the function rises above the envelope, raise the envelope and
+        # restart the counts
+        batchMaxY = float(numpy.max(fx))
+        if batchMaxY > maxY:
+            maxY = batchMaxY*(1 + envelopeMargin)
+            hits = 0
+            points = 0
+            epsilon = float('inf')
+            continue
+
+        # Count the points under the curve as hits
+        hits += int(numpy.count_nonzero(y <= fx))
+        points += size
+
+        # Calculate the ratio of points under the curve to the number of
+        # points, epsilon and the area under curve
+        ratio = hits/points
+        epsilon = (2.0/3.0)*width*maxY*sqrt((ratio*(1 - ratio))/points)
+        area = ratio*width*maxY
+
+        # Reports area under curve, epsilon, and iterations to the
+        # callback
+        progress.update(area, epsilon, iterations)
+
+        size *= growthFactor
+
+    # Report the final area under curve and return it
+    progress.finish(area, epsilon, iterations)
+    return area
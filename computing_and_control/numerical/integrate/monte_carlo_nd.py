@@ -0,0 +1,281 @@
+import numpy
+from math import sqrt
+
+import numerical.integrate
+
+def _vegas_draw(edges, size, rng):
+
+    # Draw points from the VEGAS grid in the unit hypercube. Each dimension
+    # picks one of its bins uniformly and a uniformly random position within
+    # it, so narrow bins are sampled more densely. The jacobian is the ratio
+    # of the uniform density to the grid's density at each point.
+    dimensions, bins = edges.shape[0], edges.shape[1] - 1
+    position = rng.random((size, dimensions))*bins
+    index = numpy.minimum(position.astype(numpy.intp), bins - 1)
+    fraction = position - index
+
+    columns = numpy.arange(dimensions)
+    left = edges[columns, index]
+    widths = edges[columns, index + 1] - left
+    y = left + fraction*widths
+    jacobian = numpy.prod(bins*widths, axis=1)
+
+    return y, jacobian, index
+
+
+def _vegas_refine(edges, index, values, alpha):
+
+    # Move the edges of every dimension's grid so that each bin holds an
+    # equal share of the smoothed and damped sum of the squared estimates
+    # that fell into it
+    dimensions, bins = edges.shape[0], edges.shape[1] - 1
+    newEdges = numpy.empty_like(edges)
+    squared = values**2
+
+    for dimension in range(dimensions):
+        d = numpy.bincount(index[:, dimension], weights=squared,\
+                           minlength=bins)
+
+        # Smooth each bin with its neighbours and normalize
+        smoothed = numpy.convolve(numpy.pad(d, 1, mode='edge'),\
+                                  numpy.ones(3)/3, mode='valid')
+        total = smoothed.sum()
+        if total <= 0:
+            newEdges[dimension] = edges[dimension]
+            continue
+        smoothed /= total
+
+        # Damp the importance of each bin so the grid does not collapse
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            importance = ((1 - smoothed)/numpy.log(1/smoothed))**alpha
+        importance = numpy.nan_to_num(importance)
+
+        # Place the new edges at equal steps of the cumulative importance
+        cumulative = numpy.concatenate(([0.0], numpy.cumsum(importance)))
+        newEdges[dimension] = numpy.interp(numpy.linspace(0, cumulative[-1],\
+                                           bins + 1), cumulative,\
+                                           edges[dimension])
+
+    return newEdges
+
+
+def monte_carlo_nd(function, lowerLimits, upperLimits, acceptableError,\
+                   maximumIterations=10**7, batchSize=10000, growthFactor=2,\
+                   maximumBatchSize=2**20, adaptive=False, bins=50,\
+                   trainingIterations=5, trainingSize=10000, alpha=1.5,\
+                   seed=None, callback=None, callbackInterval=0.1):
+
+    """
+    title::
+        monte_carlo_nd
+
+    description::
+        This method will perform an integration using the Monte Carlo "Average"
+        method over a hyperrectangle of any number of dimensions, e.g. over
+        wavelength, angle and area. The function is evaluated once per batch
+        on a numpy array of random points, and batches grow by growthFactor
+        until epsilon is less than the acceptable error.
+
+        If adaptive is True a VEGAS-style grid is first trained: each
+        dimension is divided into bins that are repeatedly resized so that
+        each bin contributes equally to the variance, concentrating the
+        points where the function is large. The trained grid is then held
+        fixed while the area is estimated, so the estimates stay independent
+        and epsilon is a correct standard error. The training evaluations are
+        counted towards the maximum allowable number of iterations.
+
+    attributes::
+        function
+            (function) Function for which the volume will be found under. It
+            must accept an N x D numpy ndarray of points, one row per point
+            and one column per dimension, and return an ndarray of N values,
+            e.g. lambda x: numpy.exp(-numpy.sum(x**2, axis=1)).
+
+        lowerLimits
+            (list, tuple or numpy ndarray) The lower boundary of each of the
+            D dimensions.
+
+        upperLimits
+            (list, tuple or numpy ndarray) The upper boundary of each of the
+            D dimensions.
+
+        acceptableError
+            (float) The acceptable error for the approximation of the volume.
+
+        maximumIterations
+            (int [optional]) The maximum allowable number of function
+            evaluations before raising a RuntimeError. Default value of 10**7.
+
+        batchSize
+            (int [optional]) The number of points in the first batch. Default
+            value of 10000.
+
+        growthFactor
+            (int or float [optional]) The factor by which each batch is larger
+            than the previous batch. Default value of 2.
+
+        maximumBatchSize
+            (int [optional]) The largest number of points in a batch, which
+            bounds the memory used. Default value of 2**20.
+
+        adaptive
+            (bool [optional]) If True a VEGAS-style adaptive grid is trained
+            before the volume is estimated. Default value of False.
+
+        bins
+            (int [optional]) The number of grid bins in each dimension when
+            adaptive is True. Default value of 50.
+
+        trainingIterations
+            (int [optional]) The number of times the grid is refined when
+            adaptive is True. Default value of 5.
+
+        trainingSize
+            (int [optional]) The number of points used for each refinement of
+            the grid. Default value of 10000.
+
+        alpha
+            (float [optional]) The damping exponent of each refinement.
+            Smaller values change the grid more slowly. Default value of 1.5.
+
+        seed
+            (int [optional]) The seed of the random number generator. Default
+            value of None, in which case fresh entropy is used.
+
+        callback
+            (function [optional]) Called with a dictionary of the volume,
+            epsilon, iterations, evaluations per second and elapsed time at
+            most once every callbackInterval seconds and once when the
+            integration finishes, e.g. numerical.integrate.progress.
+            PrintProgress() or ConvergenceTrace(). Default value of None, in
+            which case the integration is silent.
+
+        callbackInterval
+            (float [optional]) The minimum number of seconds between calls to
+            callback. Default value of 0.1.
+
+    returns::
+        volume
+            (float) The volume under the function to within a specified
+            acceptable error.
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    rng = numpy.random.default_rng(seed)
+    lowerLimits = numpy.asarray(lowerLimits, dtype=float)
+    upperLimits = numpy.asarray(upperLimits, dtype=float)
+    if lowerLimits.shape != upperLimits.shape or lowerLimits.ndim != 1:
+        msg = 'Provided attributes "lowerLimits" and "upperLimits" must be '\
+              'one-dimensional and of equal length'
+        raise ValueError(msg)
+
+    dimensions = lowerLimits.size
+    widths = upperLimits - lowerLimits
+    hypervolume = float(numpy.prod(widths))
+
+    # Define variables. Epsilon is set to infinity in order to begin the
+    # while loop.
+    fSum = 0.0
+    fSquaredSum = 0.0
+    points = 0
+    iterations = 0
+    epsilon = float('inf')
+    size = batchSize
+
+    # Report progress to the callback, if any, no more often than
+    # callbackInterval. The clock starts before training, as the training
+    # evaluations are counted in iterations.
+    progress = numerical.integrate.progress.Progress(callback,\
+                                                     callbackInterval)
+
+    # Train the adaptive grid. The grid starts with equal bins in the unit
+    # hypercube.
+    edges = None
+    if adaptive:
+        edges = numpy.tile(numpy.linspace(0, 1, bins + 1), (dimensions, 1))
+        for training in range(trainingIterations):
+            y, jacobian, index = _vegas_draw(edges, trainingSize, rng)
+            fx = numpy.asarray(function(lowerLimits + widths*y), dtype=float)
+            edges = _vegas_refine(edges, index, jacobian*fx, alpha)
+            iterations += trainingSize
+
+    # Start integration. Once epsilon is less than acceptable error the
+    # while loop is stopped.
+    while epsilon >= acceptableError or points <= 1:
+
+        # If the number of evaluations reaches the maximum allowable number
+        # a RuntimeError is raised.
+        if iterations >= maximumIterations:
+            raise RuntimeError('Reached maximum number of allowed '\
+                               'iterations: {0}'.format(maximumIterations))
+
+        # Do not draw more points than the maximum allowable number
+        size = min(int(size), maximumBatchSize,\
+                   maximumIterations - iterations)
+
+        # Draw a batch of points, uniformly or from the adaptive grid, and
+        # evaluate the function once on all of them
+        if adaptive:
+            y, jacobian, index = _vegas_draw(edges, size, rng)
+        else:
+            y = rng.random((size, dimensions))
+            jacobian = 1.0
+        fx = numpy.asarray(function(lowerLimits + widths*y), dtype=float)
+        estimates = hypervolume*jacobian*numpy.broadcast_to(fx, (size,))
+
+        # Add the estimates and their squares to the running sums
+        fSum += float(estimates.sum())
+        fSquaredSum += float(numpy.dot(estimates, estimates))
+        points += size
+        iterations += size
+
+        # Calculate the volume and epsilon. The variance is clipped at zero
+        # to guard against round-off.
+        volume = fSum/points
+        epsilon = sqrt(max(fSquaredSum/points - volume**2, 0.0)/points)
+
+        # Reports volume under function, epsilon, and iterations to the
+        # callback
+        progress.update(volume, epsilon, iterations)
+
+        size *= growthFactor
+
+    # Report the final volume under function and return it
+    progress.finish(volume, epsilon, iterations)
+    return volume
+
+
+if __name__ == '__main__':
+
+    import math
+    import numerical.integrate
+    import time
+
+    # A narrow Gaussian peak in 4 dimensions. Its volume over the unit
+    # hypercube is very close to 1.
+    def f(x):
+        return numpy.exp(-numpy.sum((x - 0.5)**2, axis=1)/(2*0.05**2))/\
+               (2*math.pi*0.05**2)**2
+
+    lowerLimits = [0.0]*4
+    upperLimits = [1.0]*4
+    for adaptive in (False, True):
+        startTime = time.time()
+        volume = numerical.integrate.monte_carlo_nd(f,\
+                                                    lowerLimits,\
+                                                    upperLimits,\
+                                                    0.005,\
+                                                    10**9,\
+                                                    adaptive=adaptive)
+        print('Elapsed time = {0:.6f} [s]'.format(time.time() - startTime))
+        print('Volume of a 4-D Gaussian with adaptive = {0}: {1}'\
+              .format(adaptive, volume))
@@ -0,0 +1,249 @@
+import math
+import multiprocessing
+import os
+
+import numpy
+
+import numerical.integrate
+
+def _partial_sums(task):
+
+    # Evaluate one batch of samples for one worker and return only its
+    # partial sums. Each (worker, round) pair has its own independent stream
+    # so the result does not depend on which process runs the task.
+    function, method, lowerLimit, upperLimit, maxY, seed, worker, \
+    batch, size = task
+
+    rng = numpy.random.default_rng(numpy.random.SeedSequence(seed,\
+                                   spawn_key=(worker, batch)))
+    x = rng.uniform(lowerLimit, upperLimit, size)
+    fx = numpy.broadcast_to(numpy.asarray(function(x), dtype=float), x.shape)
+
+    if method == 'average':
+        return size, float(fx.sum()), float(numpy.dot(fx, fx)), 0.0
+    else:
+        y = rng.uniform(0, maxY, size)
+        return size, float(numpy.count_nonzero(y <= fx)), 0.0, \
+               float(numpy.max(fx))
+
+
+def monte_carlo_parallel(function, lowerLimit, upperLimit, acceptableError,\
+                         method='average', workers=None, seed=0,\
+                         maximumIterations=10**7, batchSize=10000,\
+                         growthFactor=2, numberSamples=1000,\
+                         envelopeMargin=0.05, callback=None,\
+                         callbackInterval=0.1):
+
+    """
+    title::
+        monte_carlo_parallel
+
+    description::
+        This method will perform an integration using either the Monte Carlo
+        "Average" or "Hit or Miss" method across a pool of worker processes.
+        Each worker draws from its own independent random stream, derived
+        from the seed with numpy.random.SeedSequence using the worker number
+        and the round number as its spawn key, and returns only the partial
+        sums of its batch. The partial sums are merged in worker order with
+        math.fsum after every round, so the result is bit-reproducible for a
+        given seed and number of workers regardless of how the operating
+        system schedules the processes. Once the combined epsilon is less
+        than the acceptable error no further batches are handed out and the
+        pool is shut down. Batches grow by growthFactor every round.
+
+    attributes::
+        function
+            (function) Function for which the area will be found under. It
+            must accept a numpy ndarray of x-values, return an ndarray of
+            y-values of the same shape and be picklable (defined at the top
+            level of a module, not a lambda), e.g. numpy.sqrt.
+
+        lowerLimit
+            (int or float) The lower (left-hand) boundary of the region beneath
+            the function for which the area is to be found.
+
+        upperLimit
+            (int or float) The upper (right-hand) boundary of the region
+            beneath the function for which the area is to be found.
+
+        acceptableError
+            (float) The acceptable error for the approximation of the area.
+
+        method
+            (string [optional]) Either 'average' or 'hit_or_miss'. Default
+            value of 'average'.
+
+        workers
+            (int [optional]) The number of worker processes. Default value of
+            None, in which case the number of CPUs is used.
+
+        seed
+            (int [optional]) The seed from which every worker's random stream
+            is derived. Default value of 0.
+
+        maximumIterations
+            (int [optional]) The maximum allowable number of samples, summed
+            over all workers, before raising a RuntimeError. Default value of
+            10**7.
+
+        batchSize
+            (int [optional]) The number of samples each worker evaluates in
+            the first round. Default value of 10000.
+
+        growthFactor
+            (int or float [optional]) The factor by which each round's batches
+            are larger than the previous round's. Default value of 2.
+
+        numberSamples
+            (int [optional]) The number of samples at which the function is
+            evaluated to estimate its maximum for the "Hit or Miss" method.
+            Default value of 1000.
+
+        envelopeMargin
+            (float [optional]) The fraction by which the estimated maximum of
+            the function is widened for the "Hit or Miss" method. Default
+            value of 0.05.
+
+        callback
+            (function [optional]) Called with a dictionary of the area,
+            epsilon, iterations, evaluations per second and elapsed time at
+            most once every callbackInterval seconds and once when the
+            integration finishes, e.g. numerical.integrate.progress.
+            PrintProgress() or ConvergenceTrace(). Default value of None, in
+            which case the integration is silent.
+
+        callbackInterval
+            (float [optional]) The minimum number of seconds between calls to
+            callback. Default value of 0.1.
+
+    returns::
+        area
+            (float) The area under the curve to within a specified acceptable
+            error.
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    if method not in ('average', 'hit_or_miss'):
+        msg = 'Provided attribute "method" must be "average" or "hit_or_miss"'
+        raise ValueError(msg)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    width = upperLimit - lowerLimit
+
+    # Estimate the maximum point of the function for the "Hit or Miss" method
+    # from the seed's root stream, which no worker uses
+    maxY = 0.0
+    if method == 'hit_or_miss':
+        rng = numpy.random.default_rng(numpy.random.SeedSequence(seed))
+        x = rng.uniform(lowerLimit, upperLimit, numberSamples)
+        maxY = float(numpy.max(function(x)))*(1 + envelopeMargin)
+
+    # Report progress to the callback, if any, no more often than
+    # callbackInterval
+    progress = numerical.integrate.progress.Progress(callback,\
+                                                     callbackInterval)
+
+    # Define variables. Epsilon is set to infinity in order to begin the
+    # while loop.
+    samples = 0
+    firstSum = 0.0
+    secondSum = 0.0
+    iterations = 0
+    epsilon = float('inf')
+    size = batchSize
+    batch = 0
+
+    with multiprocessing.Pool(workers) as pool:
+
+        # Start integration. Once the combined epsilon is less than the
+        # acceptable error the while loop is stopped.
+        while epsilon >= acceptableError or samples <= 1:
+
+            # If the number of samples reaches the maximum allowable number
+            # a RuntimeError is raised.
+            if iterations >= maximumIterations:
+                raise RuntimeError('Reached maximum number of allowed '\
+                                   'iterations: {0}'\
+                                   .format(maximumIterations))
+
+            # Hand one batch to each worker. The batches are split so the
+            # maximum allowable number of samples is not exceeded.
+            size = min(int(size), -(-(maximumIterations - iterations)\
+                                    //workers))
+            tasks = [(function, method, lowerLimit, upperLimit, maxY, seed,\
+                      worker, batch, size) for worker in range(workers)]
+            partials = pool.map(_partial_sums, tasks)
+            iterations += size*workers
+            batch += 1
+            size *= growthFactor
+
+            # If the function rises above the envelope, raise the envelope
+            # and restart the counts
+            if method == 'hit_or_miss':
+                batchMaxY = max(partial[3] for partial in partials)
+                if batchMaxY > maxY:
+                    maxY = batchMaxY*(1 + envelopeMargin)
+                    samples = 0
+                    firstSum = 0.0
+                    epsilon = float('inf')
+                    continue
+
+            # Merge the partial sums of every worker in worker order
+            samples += sum(partial[0] for partial in partials)
+            firstSum = math.fsum([firstSum] + [p[1] for p in partials])
+            secondSum = math.fsum([secondSum] + [p[2] for p in partials])
+
+            # Calculate epsilon and the area under curve
+            if method == 'average':
+                fBar = firstSum/samples
+                fSquaredBar = secondSum/samples
+                epsilon = width*math.sqrt(max(fSquaredBar - fBar**2, 0.0)\
+                                          /samples)
+                area = width*fBar
+            else:
+                ratio = firstSum/samples
+                epsilon = (2.0/3.0)*width*maxY*\
+                          math.sqrt((ratio*(1 - ratio))/samples)
+                area = ratio*width*maxY
+
+            # Reports area under curve, epsilon, and iterations to the
+            # callback
+            progress.update(area, epsilon, iterations)
+
+    # Report the final area under curve and return it
+    progress.finish(area, epsilon, iterations)
+    return area
+
+
+if __name__ == '__main__':
+
+    import numerical.integrate
+    import time
+
+    lowerLimit = 0.0
+    upperLimit = 1.0
+    for method in ('average', 'hit_or_miss'):
+        for acceptableError in (0.001, 0.0001):
+            startTime = time.time()
+            area = numerical.integrate.monte_carlo_parallel(numpy.sqrt,\
+                                                            lowerLimit,\
+                                                            upperLimit,\
+                                                            acceptableError,\
+                                                            method=method,\
+                                                            seed=2016)
+            print('Elapsed time = {0:.6f} [s]'.format(time.time() - startTime))
+            print('With an acceptable error of {0:.10f} ({1})'\
+                  .format(acceptableError, method))
+            print('Area of f(x)=sqrt(x) over [{0}, {1}] = {2}'\
+                  .format(lowerLimit, upperLimit, area))
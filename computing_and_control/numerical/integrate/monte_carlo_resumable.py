@@ -0,0 +1,263 @@
+import os
+import time
+
+import numpy
+
+import numerical.integrate
+
+def monte_carlo_resumable(function, lowerLimit, upperLimit, acceptableError,\
+                          checkpointFile, checkpointInterval=60.0,\
+                          method='average', maximumIterations=10**10,\
+                          batchSize=1000, growthFactor=2,\
+                          maximumBatchSize=2**20, numberSamples=1000,\
+                          envelopeMargin=0.05, seed=None, callback=None,\
+                          callbackInterval=0.1):
+
+    """
+    title::
+        monte_carlo_resumable
+
+    description::
+        This method will perform an integration using either the Monte Carlo
+        "Average" or "Hit or Miss" method on batches of samples, saving a
+        numerical.integrate.Checkpoint of its state to checkpointFile at most
+        once every checkpointInterval seconds and once when it finishes. If
+        checkpointFile already exists the integration resumes from it, so a
+        long run with a tight acceptable error that is killed loses at most
+        checkpointInterval seconds of work. As the state of the random number
+        generator and the size of the next batch are saved, a run resumed
+        after being killed draws exactly the samples the uninterrupted run
+        would have drawn. Checkpoints of independent runs, e.g. on separate
+        machines with different seeds, may be merged with Checkpoint.merge
+        and the merged checkpoint given here to continue as one run.
+
+    attributes::
+        function
+            (function) Function for which the area will be found under. It
+            must accept a numpy ndarray of x-values and return an ndarray of
+            y-values of the same shape, e.g. numpy.sqrt.
+
+        lowerLimit
+            (int or float) The lower (left-hand) boundary of the region beneath
+            the function for which the area is to be found.
+
+        upperLimit
+            (int or float) The upper (right-hand) boundary of the region
+            beneath the function for which the area is to be found.
+
+        acceptableError
+            (float) The acceptable error for the approximation of the area.
+
+        checkpointFile
+            (string) The name of the checkpoint file to resume from, if it
+            exists, and to save to.
+
+        checkpointInterval
+            (float [optional]) The minimum number of seconds between saved
+            checkpoints. Default value of 60.0.
+
+        method
+            (string [optional]) Either 'average' or 'hit_or_miss'. Default
+            value of 'average'.
+
+        maximumIterations
+            (int [optional]) The maximum allowable number of samples, over
+            every run resumed from the checkpoint, before raising a
+            RuntimeError. The checkpoint is saved first. Default value of
+            10**10.
+
+        batchSize
+            (int [optional]) The number of samples in the first batch of a new
+            run. Default value of 1000.
+
+        growthFactor
+            (int or float [optional]) The factor by which each batch is larger
+            than the previous batch. Default value of 2.
+
+        maximumBatchSize
+            (int [optional]) The largest number of samples in a batch, which
+            bounds the memory used and the time between checkpoints. Default
+            value of 2**20.
+
+        numberSamples
+            (int [optional]) The number of samples at which the function is
+            evaluated to estimate its maximum for the "Hit or Miss" method.
+            Default value of 1000.
+
+        envelopeMargin
+            (float [optional]) The fraction by which the estimated maximum of
+            the function is widened for the "Hit or Miss" method. Default
+            value of 0.05.
+
+        seed
+            (int [optional]) The seed of the random number generator of a new
+            run, or of a resumed run whose checkpoint has no generator state.
+            Default value of None, in which case fresh entropy is used.
+
+        callback
+            (function [optional]) Called with a dictionary of the area,
+            epsilon, iterations, evaluations per second and elapsed time at
+            most once every callbackInterval seconds and once when the
+            integration finishes. Default value of None.
+
+        callbackInterval
+            (float [optional]) The minimum number of seconds between calls to
+            callback. Default value of 0.1.
+
+    returns::
+        area
+            (float) The area under the curve to within a specified acceptable
+            error.
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    rng = numpy.random.default_rng(seed)
+
+    # Resume from the checkpoint file if it exists, otherwise start a new run
+    if os.path.exists(checkpointFile):
+        checkpoint = numerical.integrate.Checkpoint.load(checkpointFile)
+        if (checkpoint.method, checkpoint.lowerLimit, checkpoint.upperLimit)\
+           != (method, float(lowerLimit), float(upperLimit)):
+            msg = 'Checkpoint "{0}" is of a different method or limits'\
+                  .format(checkpointFile)
+            raise ValueError(msg)
+        if checkpoint.rngState is not None:
+            rng.bit_generator.state = checkpoint.rngState
+    else:
+        checkpoint = numerical.integrate.Checkpoint(method, lowerLimit,\
+                                                    upperLimit,\
+                                                    size=batchSize)
+
+        # Estimate the maximum point of the function for the "Hit or Miss"
+        # method
+        if method == 'hit_or_miss':
+            x = rng.uniform(lowerLimit, upperLimit, numberSamples)
+            checkpoint.maxY = float(numpy.max(function(x)))*\
+                              (1 + envelopeMargin)
+            checkpoint.iterations += numberSamples
+
+    progress = numerical.integrate.progress.Progress(callback,\
+                                                     callbackInterval)
+    lastSave = time.perf_counter()
+
+    def save():
+        checkpoint.rngState = rng.bit_generator.state
+        checkpoint.save(checkpointFile)
+
+    # Start integration. Once epsilon is less than acceptable error the
+    # while loop is stopped.
+    while checkpoint.epsilon >= acceptableError:
+
+        # If the number of samples reaches the maximum allowable number the
+        # checkpoint is saved and a RuntimeError is raised.
+        if checkpoint.iterations >= maximumIterations:
+            save()
+            raise RuntimeError('Reached maximum number of allowed '\
+                               'iterations: {0}'.format(maximumIterations))
+
+        size = min(checkpoint.size, maximumBatchSize,\
+                   maximumIterations - checkpoint.iterations)
+        x = rng.uniform(lowerLimit, upperLimit, size)
+        fx = numpy.broadcast_to(numpy.asarray(function(x), dtype=float),\
+                                x.shape)
+        checkpoint.iterations += size
+        checkpoint.size = int(min(size*growthFactor, maximumBatchSize))
+
+        if method == 'average':
+            checkpoint.statistics.update(fx)
+        else:
+            y = rng.uniform(0, checkpoint.maxY, size)
+
+            # If the function rises above the envelope, raise the envelope
+            # and restart the counts
+            batchMaxY = float(numpy.max(fx))
+            if batchMaxY > checkpoint.maxY:
+                checkpoint.maxY = batchMaxY*(1 + envelopeMargin)
+                checkpoint.statistics = \
+                    numerical.integrate.RunningStatistics()
+                continue
+            checkpoint.statistics.update(checkpoint.maxY*(y <= fx))
+
+        # Reports area under curve, epsilon, and iterations to the callback
+        progress.update(checkpoint.area, checkpoint.epsilon,\
+                        checkpoint.iterations)
+
+        # Save the state no more often than checkpointInterval
+        if time.perf_counter() - lastSave >= checkpointInterval:
+            save()
+            lastSave = time.perf_counter()
+
+    # Save and report the final area under curve and return it
+    save()
+    progress.finish(checkpoint.area, checkpoint.epsilon, checkpoint.iterations)
+    return checkpoint.area
+
+
+if __name__ == '__main__':
+
+    import numerical.integrate
+    import tempfile
+
+    lowerLimit = 0.0
+    upperLimit = 1.0
+    directory = tempfile.mkdtemp()
+
+    # An uninterrupted run, and a run stopped part way and resumed
+    for method in ('average', 'hit_or_miss'):
+        whole = os.path.join(directory, method + '_whole.npz')
+        parts = os.path.join(directory, method + '_parts.npz')
+        area = numerical.integrate.monte_carlo_resumable(numpy.sqrt,\
+                                                         lowerLimit,\
+                                                         upperLimit, 0.0001,\
+                                                         whole, method=method,\
+                                                         seed=2016)
+        try:
+            numerical.integrate.monte_carlo_resumable(numpy.sqrt, lowerLimit,\
+                                                      upperLimit, 0.0001,\
+                                                      parts, method=method,\
+                                                      maximumIterations=10**6,\
+                                                      seed=2016)
+        except RuntimeError:
+            print('Stopped at {0}'\
+                  .format(numerical.integrate.Checkpoint.load(parts)))
+        resumed = numerical.integrate.monte_carlo_resumable(numpy.sqrt,\
+                                                            lowerLimit,\
+                                                            upperLimit,\
+                                                            0.0001, parts,\
+                                                            method=method)
+        print('Area of f(x)=sqrt(x) ({0}) = {1}, resumed = {2}'\
+              .format(method, area, resumed))
+
+    # Independent runs merged into one estimate
+    merged = None
+    for seed in range(4):
+        filename = os.path.join(directory, 'run{0}.npz'.format(seed))
+        numerical.integrate.monte_carlo_resumable(numpy.sqrt, lowerLimit,\
+                                                  upperLimit, 0.001,\
+                                                  filename, seed=seed)
+        checkpoint = numerical.integrate.Checkpoint.load(filename)
+        print('Run {0}: {1}'.format(seed, checkpoint))
+        merged = checkpoint if merged is None else merged.merge(checkpoint)
+    print('Merged: {0}'.format(merged))
+
+    # Independent "Hit or Miss" runs, each with its own envelope, merged
+    merged = None
+    for seed in range(4):
+        filename = os.path.join(directory, 'hit{0}.npz'.format(seed))
+        numerical.integrate.monte_carlo_resumable(numpy.sqrt, lowerLimit,\
+                                                  upperLimit, 0.001,\
+                                                  filename,\
+                                                  method='hit_or_miss',\
+                                                  seed=seed)
+        checkpoint = numerical.integrate.Checkpoint.load(filename)
+        merged = checkpoint if merged is None else merged.merge(checkpoint)
+    print('Merged "Hit or Miss": {0}'.format(merged))
@@ -0,0 +1,173 @@
+"""
+title::
+    progress
+
+description::
+    This file contains the progress reporting used by the integrators in
+    numerical.integrate. The integrators are silent by default. If a callback
+    is given it is called with a dictionary of the current area, epsilon,
+    iterations, evaluations per second and elapsed time, at most once every
+    callbackInterval seconds and always once when the integration finishes.
+    Any function that accepts the dictionary may be used as a callback.
+
+classes::
+    Progress
+        Throttles the reports an integrator makes to its callback.
+
+    PrintProgress
+        A callback that prints the area, epsilon and iterations table to the
+        command line, as the integrators used to on every iteration.
+
+    ConvergenceTrace
+        A callback that collects every report so the convergence of an
+        integration can be exported to JSON or CSV for later analysis.
+
+author::
+    Alex Perkins
+
+copyright::
+    Copyright (C) 2016, Rochester Institute of Technology
+
+version::
+    1.0.0
+
+"""
+
+import csv
+import json
+import time
+
+# The keys of the dictionary passed to every callback
+FIELDS = ('area', 'epsilon', 'iterations', 'evaluationsPerSecond',\
+          'elapsedTime', 'done')
+
+
+class Progress():
+
+    """
+    description::
+        Throttles the reports an integrator makes to its callback. The
+        integrator calls update after every iteration or batch and finish
+        once it is done.
+
+    attributes::
+        callback
+            (function) Called with a dictionary of the keys in FIELDS. If
+            None, update and finish do nothing.
+
+        interval
+            (float [optional]) The minimum number of seconds between reports.
+            Defaults to 0.1.
+    """
+
+    def __init__(self, callback, interval=0.1):
+        self.callback = callback
+        self.interval = interval
+        self._startTime = time.perf_counter()
+        self._lastTime = float('-inf')
+
+    def _report(self, now, area, epsilon, iterations, done):
+        elapsedTime = now - self._startTime
+        self._lastTime = now
+        self.callback({'area': area,
+                       'epsilon': epsilon,
+                       'iterations': iterations,
+                       'evaluationsPerSecond': iterations/elapsedTime\
+                                               if elapsedTime > 0 else 0.0,
+                       'elapsedTime': elapsedTime,
+                       'done': done})
+
+    def update(self, area, epsilon, iterations):
+
+        """
+        description::
+            Reports the current state to the callback if at least interval
+            seconds have passed since the last report
+        """
+
+        if self.callback is None:
+            return
+        now = time.perf_counter()
+        if now - self._lastTime >= self.interval:
+            self._report(now, area, epsilon, iterations, False)
+
+    def finish(self, area, epsilon, iterations):
+
+        """
+        description::
+            Reports the final state to the callback
+        """
+
+        if self.callback is not None:
+            self._report(time.perf_counter(), area, epsilon, iterations, True)
+
+
+class PrintProgress():
+
+    """
+    description::
+        A callback that prints a table of the area, epsilon and iterations to
+        the command line, overwriting the previous line until the integration
+        is done.
+    """
+
+    def __init__(self):
+        self._header = False
+
+    def __call__(self, report):
+        if not self._header:
+            print('\nArea\t\tEpsilon\t\tIterations')
+            self._header = True
+        print('{0:.6f}\t{1:.6f}\t{2}'.format(report['area'],\
+              report['epsilon'], report['iterations']),\
+              end='\n' if report['done'] else '\r')
+        if report['done']:
+            self._header = False
+
+
+class ConvergenceTrace():
+
+    """
+    description::
+        A callback that collects every report it is given. The trace can be
+        exported with to_json or to_csv, or read directly from the reports
+        attribute, a list of dictionaries with the keys in FIELDS.
+    """
+
+    def __init__(self):
+        self.reports = []
+
+    def __call__(self, report):
+        self.reports.append(report)
+
+    def column(self, field):
+
+        """
+        description::
+            Returns one field of every report as a list, e.g.
+            trace.column('epsilon')
+        """
+
+        return [report[field] for report in self.reports]
+
+    def to_json(self, filename):
+
+        """
+        description::
+            Writes the reports to a file as a JSON list of objects
+        """
+
+        with open(filename, 'w') as f:
+            json.dump(self.reports, f, indent=2)
+
+    def to_csv(self, filename):
+
+        """
+        description::
+            Writes the reports to a file as CSV with a header row
+        """
+
+        with open(filename, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(self.reports)
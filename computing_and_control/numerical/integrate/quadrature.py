@@ -0,0 +1,211 @@
+import numpy
+
+# The order of the error of each rule, used for the Richardson error estimate
+ORDERS = {'trapezoid': 2, 'simpson': 4}
+
+def _trapezoid(x, y):
+
+    # Trapezoid rule for evenly or unevenly spaced x-values
+    return float(numpy.dot(numpy.diff(x), (y[:-1] + y[1:])))/2
+
+
+def _simpson(x, y):
+
+    # Simpson's rule for evenly or unevenly spaced x-values. Each pair of
+    # intervals is integrated by the parabola through its three points. If
+    # there is an odd number of intervals the last one is integrated by the
+    # parabola through the last three points.
+    n = x.size
+    if n < 3:
+        return _trapezoid(x, y)
+
+    h = numpy.diff(x)
+    end = n - 1 if (n - 1) % 2 == 0 else n - 2
+    h0 = h[0:end - 1:2]
+    h1 = h[1:end:2]
+    y0 = y[0:end - 1:2]
+    y1 = y[1:end:2]
+    y2 = y[2:end + 1:2]
+    area = float(numpy.sum((h0 + h1)/6*((2 - h1/h0)*y0 +\
+                                        (h0 + h1)**2/(h0*h1)*y1 +\
+                                        (2 - h0/h1)*y2)))
+
+    if end != n - 1:
+        h0 = h[-2]
+        h1 = h[-1]
+        area += y[-1]*(2*h1**2 + 3*h0*h1)/(6*(h0 + h1)) +\
+                y[-2]*(h1**2 + 3*h0*h1)/(6*h0) -\
+                y[-3]*h1**3/(6*h0*(h0 + h1))
+
+    return area
+
+
+def _romberg(x, y):
+
+    # Romberg integration of 2^k + 1 evenly spaced points. The trapezoid rule
+    # is applied with every 2^j-th point and the results are extrapolated.
+    # The error is estimated from the last two diagonal entries.
+    levels = int(round(numpy.log2(x.size - 1)))
+    table = []
+    for level in range(levels + 1):
+        stride = 2**(levels - level)
+        row = [_trapezoid(x[::stride], y[::stride])]
+        for j in range(1, level + 1):
+            row.append(row[j - 1] + (row[j - 1] - table[-1][j - 1])/\
+                       (4**j - 1))
+        table.append(row)
+
+    area = table[-1][-1]
+    epsilon = abs(area - table[-2][-2]) if levels > 0 else float('inf')
+
+    return area, epsilon
+
+
+def _is_uniform(x):
+    h = numpy.diff(x)
+    return bool(numpy.allclose(h, h[0], rtol=1e-9, atol=0))
+
+
+def quadrature(y, x=None, lowerLimit=None, upperLimit=None, method='auto'):
+
+    """
+    title::
+        quadrature
+
+    description::
+        This method will integrate tabulated data, such as a measured
+        spectrum, with a vectorized deterministic rule. Evenly or unevenly
+        spaced x-values are supported by the trapezoid and Simpson's rules.
+        Romberg integration needs 2^k + 1 evenly spaced points. The error is
+        estimated by comparing the rule applied to every point with the same
+        rule applied to every other point. The difference is scaled down by
+        Richardson extrapolation only for evenly spaced points whose steps
+        are exactly halved, and is used as it is otherwise. With two points
+        there is no coarser grid and the error is infinite. With
+        'auto', Romberg is used for 2^k + 1 evenly spaced points, Simpson's
+        rule for three or more points and the trapezoid rule otherwise.
+
+    attributes::
+        y
+            (list, tuple or numpy ndarray) The y-values of the function
+
+        x
+            (list, tuple or numpy ndarray [optional]) The increasing x-values
+            of the function. Defaults to None, in which case the y-values are
+            assumed to be evenly spaced from lowerLimit to upperLimit
+            inclusive.
+
+        lowerLimit
+            (int or float [optional]) The x-value of the first y-value if x is
+            not given
+
+        upperLimit
+            (int or float [optional]) The x-value of the last y-value if x is
+            not given
+
+        method
+            (string [optional]) One of 'auto', 'trapezoid', 'simpson' or
+            'romberg'. Defaults to 'auto'.
+
+    returns::
+        area
+            (float) The area under the curve
+
+        epsilon
+            (float) The estimated error of the area
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    y = numpy.asarray(y, dtype=float).ravel()
+    if x is None:
+        if lowerLimit is None or upperLimit is None:
+            msg = 'Provide either attribute "x" or both "lowerLimit" and '\
+                  '"upperLimit"'
+            raise ValueError(msg)
+        x = numpy.linspace(lowerLimit, upperLimit, y.size)
+    else:
+        x = numpy.asarray(x, dtype=float).ravel()
+
+    if x.size != y.size or y.size < 2:
+        msg = 'Provided attributes "x" and "y" must be of equal length and '\
+              'contain at least two values'
+        raise ValueError(msg)
+
+    # Pick the most accurate rule the data allows
+    n = y.size
+    isRomberg = n >= 5 and (n - 1) & (n - 2) == 0 and _is_uniform(x)
+    if method == 'auto':
+        if isRomberg:
+            method = 'romberg'
+        elif n >= 3:
+            method = 'simpson'
+        else:
+            method = 'trapezoid'
+
+    if method == 'romberg':
+        if not isRomberg:
+            msg = 'Romberg integration needs 2^k + 1 evenly spaced points'
+            raise ValueError(msg)
+        area, epsilon = _romberg(x, y)
+        return float(area), float(epsilon)
+
+    rules = {'trapezoid': _trapezoid, 'simpson': _simpson}
+    if method not in rules:
+        msg = 'Provided attribute "method" must be "auto", "trapezoid", '\
+              '"simpson" or "romberg"'
+        raise ValueError(msg)
+
+    # Estimate the error from the same rule applied to every other point,
+    # keeping the last point so both cover the same interval
+    area = rules[method](x, y)
+    halved = (n - 1) % 2 == 0
+    coarse = numpy.r_[0:n:2] if halved else \
+             numpy.r_[numpy.arange(0, n - 1, 2), n - 1]
+    if coarse.size < n:
+        coarseArea = rules[method](x[coarse], y[coarse])
+        epsilon = abs(area - coarseArea)
+
+        # The Richardson divisor only holds when every step of the coarse
+        # grid is exactly halved and the coarse rule is of the same order,
+        # Simpson's rule falling back to the trapezoid rule on two points
+        if halved and _is_uniform(x) and \
+           (method == 'trapezoid' or coarse.size >= 3):
+            epsilon /= 2**ORDERS[method] - 1
+    else:
+        epsilon = float('inf')
+
+    return float(area), float(epsilon)
+
+
+if __name__ == '__main__':
+
+    import numerical.integrate
+    import time
+
+    # A tabulated blackbody-like spectrum with a million unevenly spaced
+    # samples
+    x = numpy.sort(numpy.random.default_rng(2016).uniform(0, 10, 10**6))
+    x[0] = 0
+    x[-1] = 10
+    y = x**3/(numpy.exp(x) - 1 + 1e-300)
+    for method in ('trapezoid', 'simpson'):
+        startTime = time.time()
+        area, epsilon = numerical.integrate.quadrature(y, x, method=method)
+        print('Elapsed time = {0:.6f} [s]'.format(time.time() - startTime))
+        print('{0}: area = {1}, epsilon = {2}'.format(method, area, epsilon))
+
+    x = numpy.linspace(0, 10, 2**20 + 1)
+    y = x**3/(numpy.exp(x) - 1 + 1e-300)
+    startTime = time.time()
+    area, epsilon = numerical.integrate.quadrature(y, x)
+    print('Elapsed time = {0:.6f} [s]'.format(time.time() - startTime))
+    print('romberg: area = {0}, epsilon = {1}'.format(area, epsilon))
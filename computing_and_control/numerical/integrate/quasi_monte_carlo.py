@@ -0,0 +1,234 @@
+import numpy
+from math import sqrt
+
+import numerical.integrate
+
+def quasi_monte_carlo(function, lowerLimit, upperLimit, acceptableError,\
+                      method='average', sequence='sobol', randomizations=16,\
+                      maximumIterations=10**7, batchSize=256,\
+                      numberSamples=1000, envelopeMargin=0.05, seed=None,\
+                      callback=None, callbackInterval=0.1):
+
+    """
+    title::
+        quasi_monte_carlo
+
+    description::
+        This method will perform an integration using either the Monte Carlo
+        "Average" or "Hit or Miss" method with low-discrepancy points from a
+        scrambled Sobol or Halton sequence in place of pseudo-random numbers.
+        The points are generated in bulk by scipy.stats.qmc. A single
+        low-discrepancy sequence has no usable sample variance, so a number of
+        independently scrambled copies of the sequence are integrated side by
+        side and epsilon is estimated from the spread of their areas. For
+        smooth functions epsilon falls close to 1/N rather than 1/sqrt(N),
+        which reaches a small acceptable error with orders of magnitude fewer
+        evaluations. The number of points drawn from each sequence doubles
+        every iteration so that Sobol sequences stay balanced at powers of
+        two.
+
+    attributes::
+        function
+            (function) Function for which the area will be found under. It
+            must accept a numpy ndarray of x-values and return an ndarray of
+            y-values of the same shape, e.g. numpy.sqrt.
+
+        lowerLimit
+            (int or float) The lower (left-hand) boundary of the region beneath
+            the function for which the area is to be found.
+
+        upperLimit
+            (int or float) The upper (right-hand) boundary of the region
+            beneath the function for which the area is to be found.
+
+        acceptableError
+            (float) The acceptable error for the approximation of the area.
+
+        method
+            (string [optional]) Either 'average' or 'hit_or_miss'. Default
+            value of 'average'.
+
+        sequence
+            (string [optional]) Either 'sobol' or 'halton'. Default value of
+            'sobol'.
+
+        randomizations
+            (int [optional]) The number of independently scrambled sequences
+            used to estimate epsilon. Default value of 16.
+
+        maximumIterations
+            (int [optional]) The maximum allowable number of evaluations,
+            summed over all of the sequences, before raising a RuntimeError.
+            Default value of 10**7.
+
+        batchSize
+            (int [optional]) The number of points drawn from each sequence in
+            the first iteration. Rounded up to a power of two. Default value
+            of 256.
+
+        numberSamples
+            (int [optional]) The number of samples at which the function is
+            evaluated to estimate its maximum for the "Hit or Miss" method.
+            Default value of 1000.
+
+        envelopeMargin
+            (float [optional]) The fraction by which the estimated maximum of
+            the function is widened for the "Hit or Miss" method. Default
+            value of 0.05.
+
+        seed
+            (int [optional]) The seed from which the scrambling of every
+            sequence is derived. Default value of None, in which case fresh
+            entropy is used.
+
+        callback
+            (function [optional]) Called with a dictionary of the area,
+            epsilon, iterations, evaluations per second and elapsed time at
+            most once every callbackInterval seconds and once when the
+            integration finishes, e.g. numerical.integrate.progress.
+            PrintProgress() or ConvergenceTrace(). Default value of None, in
+            which case the integration is silent.
+
+        callbackInterval
+            (float [optional]) The minimum number of seconds between calls to
+            callback. Default value of 0.1.
+
+    returns::
+        area
+            (float) The area under the curve to within a specified acceptable
+            error.
+
+    author::
+        Alex Perkins
+
+    copyright::
+        Copyright (C) 2016, Rochester Institute of Technology
+
+    version::
+        1.0.0
+
+    """
+
+    # scipy is only needed for this sampling mode
+    from scipy.stats import qmc
+
+    engines = {'sobol': qmc.Sobol, 'halton': qmc.Halton}
+    if sequence not in engines:
+        msg = 'Provided attribute "sequence" must be "sobol" or "halton"'
+        raise ValueError(msg)
+    if method not in ('average', 'hit_or_miss'):
+        msg = 'Provided attribute "method" must be "average" or "hit_or_miss"'
+        raise ValueError(msg)
+
+    width = upperLimit - lowerLimit
+    seedSequence = numpy.random.SeedSequence(seed)
+
+    # Estimate the maximum point of the function for the "Hit or Miss" method
+    maxY = 0.0
+    dimensions = 1
+    if method == 'hit_or_miss':
+        rng = numpy.random.default_rng(seedSequence.spawn(1)[0])
+        x = rng.uniform(lowerLimit, upperLimit, numberSamples)
+        maxY = float(numpy.max(function(x)))*(1 + envelopeMargin)
+        dimensions = 2
+
+    # Create one independently scrambled sequence per randomization. The
+    # "Hit or Miss" method draws its x and y coordinates from a 2-D sequence.
+    generators = [engines[sequence](dimensions, scramble=True,\
+                                    seed=numpy.random.default_rng(child))\
+                  for child in seedSequence.spawn(randomizations)]
+
+    # Report progress to the callback, if any, no more often than
+    # callbackInterval
+    progress = numerical.integrate.progress.Progress(callback,\
+                                                     callbackInterval)
+
+    # Define variables. Epsilon is set to infinity in order to begin the
+    # while loop. Sums holds the running sum of each sequence.
+    sums = numpy.zeros(randomizations)
+    points = 0
+    iterations = 0
+    epsilon = float('inf')
+    firstSize = 2**int(numpy.ceil(numpy.log2(max(batchSize, 1))))
+    size = firstSize
+
+    # Start integration. Once epsilon is less than acceptable error the
+    # while loop is stopped.
+    while epsilon >= acceptableError:
+
+        # If the number of evaluations would exceed the maximum allowable
+        # number a RuntimeError is raised.
+        if iterations + size*randomizations > maximumIterations:
+            raise RuntimeError('Reached maximum number of allowed '\
+                               'iterations: {0}'.format(maximumIterations))
+
+        # Draw the next points of every sequence and evaluate the function
+        # once on all of them
+        u = numpy.stack([generator.random(size)\
+                         for generator in generators])
+        x = lowerLimit + width*u[:, :, 0]
+        fx = numpy.broadcast_to(numpy.asarray(function(x), dtype=float),\
+                                x.shape)
+
+        if method == 'average':
+            sums += fx.sum(axis=1)
+        else:
+            # If the function rises above the envelope, raise the envelope
+            # and restart every sequence from its first point
+            batchMaxY = float(numpy.max(fx))
+            if batchMaxY > maxY:
+                maxY = batchMaxY*(1 + envelopeMargin)
+                for generator in generators:
+                    generator.reset()
+                iterations += size*randomizations
+                sums[:] = 0
+                points = 0
+                size = firstSize
+                continue
+            sums += numpy.count_nonzero(maxY*u[:, :, 1] <= fx, axis=1)
+
+        # The next draw is as large as all of the points drawn so far, so
+        # the number of points from each sequence doubles every iteration
+        points += size
+        iterations += size*randomizations
+        size = points
+
+        # Calculate the area of each sequence. The area under curve is their
+        # mean and epsilon is the standard error of the mean.
+        if method == 'average':
+            areas = width*sums/points
+        else:
+            areas = width*maxY*sums/points
+        area = float(areas.mean())
+        epsilon = float(areas.std(ddof=1))/sqrt(randomizations)
+
+        # Reports area under curve, epsilon, and iterations to the
+        # callback
+        progress.update(area, epsilon, iterations)
+
+    # Report the final area under curve and return it
+    progress.finish(area, epsilon, iterations)
+    return area
+
+
+if __name__ == '__main__':
+
+    import numerical.integrate
+    import time
+
+    lowerLimit = 0.0
+    upperLimit = 1.0
+    for sequence in ('sobol', 'halton'):
+        for acceptableError in (0.001, 0.0001, 0.000001):
+            startTime = time.time()
+            area = numerical.integrate.quasi_monte_carlo(numpy.sqrt,\
+                                                         lowerLimit,\
+                                                         upperLimit,\
+                                                         acceptableError,\
+                                                         sequence=sequence,\
+                                                         seed=2016)
+            print('Elapsed time = {0:.6f} [s]'.format(time.time() - startTime))
+            print('With an acceptable error of {0:.10f} ({1})'\
+                  .format(acceptableError, sequence))
+            print('Area of f(x)=sqrt(x) over [{0}, {1}] = {2}'\
+                  .format(lowerLimit, upperLimit, area))
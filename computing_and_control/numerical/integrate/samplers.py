@@ -0,0 +1,280 @@
+"""
+title::
+    samplers
+
+description::
+    This file contains the variance-reduction samplers used by
+    monte_carlo_average_vectorized. Every sampler has a sample method that
+    evaluates a function on a batch of points and returns independent,
+    identically distributed estimates of the area under the curve along with
+    the number of function evaluations it used. Because the estimates are
+    independent, the area is their mean and epsilon is the standard error of
+    their mean for every sampler, so the usual acceptable error stopping rule
+    applies unchanged. Samplers that reduce the variance of each estimate
+    reach the acceptable error with fewer function evaluations.
+
+classes::
+    UniformSampler
+        Plain uniformly random samples, the "Average" method.
+
+    StratifiedSampler
+        Splits the limits into equal strata and draws one uniformly random
+        sample from every stratum per estimate.
+
+    AntitheticSampler
+        Pairs each uniformly random sample x with its reflection
+        lowerLimit + upperLimit - x.
+
+    ControlVariateSampler
+        Subtracts a multiple of a control function with a known integral that
+        is correlated with the function.
+
+    ImportanceSampler
+        Draws samples from a user-supplied probability density that follows
+        the shape of the function, e.g. a peaked Planck curve.
+
+author::
+    Alex Perkins
+
+copyright::
+    Copyright (C) 2016, Rochester Institute of Technology
+
+version::
+    1.0.0
+
+"""
+
+import numpy
+
+def _evaluate(function, x):
+
+    # Evaluate the function on an array of x-values. Broadcasting allows
+    # functions that return a constant.
+    return numpy.broadcast_to(numpy.asarray(function(x), dtype=float),\
+                              x.shape)
+
+
+class UniformSampler():
+
+    """
+    description::
+        Draws uniformly random samples between the limits. Each sample gives
+        one estimate, (upperLimit - lowerLimit)*f(x), which is the "Average"
+        method.
+    """
+
+    def sample(self, function, lowerLimit, upperLimit, size, rng):
+
+        """
+        description::
+            Evaluates the function on a batch of samples
+
+        attributes::
+            function
+                (function) Function that accepts and returns numpy ndarrays
+
+            lowerLimit
+                (int or float) The lower (left-hand) boundary of the region
+
+            upperLimit
+                (int or float) The upper (right-hand) boundary of the region
+
+            size
+                (int) The number of function evaluations to use
+
+            rng
+                (numpy.random.Generator) The random number generator
+
+        returns::
+            estimates
+                (numpy ndarray) Independent estimates of the area
+
+            evaluations
+                (int) The number of times the function was evaluated
+        """
+
+        x = rng.uniform(lowerLimit, upperLimit, size)
+        estimates = (upperLimit - lowerLimit)*_evaluate(function, x)
+
+        return estimates, size
+
+
+class StratifiedSampler():
+
+    """
+    description::
+        Splits the limits into a number of equal strata. Each estimate draws
+        one uniformly random sample from every stratum, so the samples cannot
+        cluster. Each estimate uses strata function evaluations, except that
+        a batch of fewer than strata evaluations uses as many strata as it
+        has evaluations so that it never uses more than it was given.
+
+    attributes::
+        strata
+            (int [optional]) The number of strata. Defaults to 16.
+    """
+
+    def __init__(self, strata=16):
+        self.strata = strata
+
+    def sample(self, function, lowerLimit, upperLimit, size, rng):
+
+        """
+        description::
+            Evaluates the function on a batch of stratified samples. See
+            UniformSampler.sample.
+        """
+
+        strata = max(min(self.strata, size), 1)
+        replicates = max(size//strata, 1)
+        stratumWidth = (upperLimit - lowerLimit)/strata
+
+        # Offset a uniformly random position within each stratum by the
+        # stratum's lower boundary
+        offsets = lowerLimit + stratumWidth*numpy.arange(strata)
+        x = offsets + stratumWidth*rng.random((replicates, strata))
+        estimates = stratumWidth*_evaluate(function, x).sum(axis=1)
+
+        return estimates, replicates*strata
+
+
+class AntitheticSampler():
+
+    """
+    description::
+        Pairs each uniformly random sample x with its reflection
+        lowerLimit + upperLimit - x. Each estimate is the average of the pair,
+        which cancels much of the variance of monotonic functions. Each
+        estimate uses two function evaluations.
+    """
+
+    def sample(self, function, lowerLimit, upperLimit, size, rng):
+
+        """
+        description::
+            Evaluates the function on a batch of antithetic pairs. See
+            UniformSampler.sample.
+        """
+
+        pairs = max(size//2, 1)
+        x = rng.uniform(lowerLimit, upperLimit, pairs)
+
+        # Evaluate the function once on both halves of the pairs
+        fx = _evaluate(function, numpy.concatenate((x,\
+                                  lowerLimit + upperLimit - x)))
+        estimates = (upperLimit - lowerLimit)*(fx[:pairs] + fx[pairs:])/2
+
+        return estimates, 2*pairs
+
+
+class ControlVariateSampler():
+
+    """
+    description::
+        Subtracts a multiple of a control function g, whose integral over the
+        limits is known, from the function. Each estimate is
+        (upperLimit - lowerLimit)*(f(x) - c*g(x)) + c*controlIntegral, which
+        is unbiased for any fixed coefficient c. If the coefficient is not
+        given it is fitted, as cov(f, g)/var(g), from a pilot batch the first
+        time the sampler is used with a function and limits, and is then held
+        fixed for them so that the estimates stay independent. The fitted
+        coefficients are kept apart from the given one, so the sampler may be
+        reused for other functions or limits. The pilot evaluations are
+        counted.
+
+    attributes::
+        controlFunction
+            (function) The control function g. It must accept and return numpy
+            ndarrays.
+
+        controlIntegral
+            (float) The integral of the control function over the limits
+
+        coefficient
+            (float [optional]) The coefficient c. Defaults to None, in which
+            case it is fitted from a pilot batch.
+
+        pilotSize
+            (int [optional]) The number of samples in the pilot batch.
+            Defaults to 1000.
+    """
+
+    def __init__(self, controlFunction, controlIntegral, coefficient=None,\
+                 pilotSize=1000):
+        self.controlFunction = controlFunction
+        self.controlIntegral = controlIntegral
+        self.coefficient = coefficient
+        self.pilotSize = pilotSize
+        self._fitted = {}
+
+    def sample(self, function, lowerLimit, upperLimit, size, rng):
+
+        """
+        description::
+            Evaluates the function and the control function on a batch of
+            samples. See UniformSampler.sample.
+        """
+
+        evaluations = 0
+        coefficient = self.coefficient
+
+        # Fit the coefficient for this function and these limits from a pilot
+        # batch, once
+        if coefficient is None:
+            key = (function, lowerLimit, upperLimit)
+            coefficient = self._fitted.get(key)
+            if coefficient is None:
+                x = rng.uniform(lowerLimit, upperLimit, self.pilotSize)
+                fx = _evaluate(function, x)
+                gx = _evaluate(self.controlFunction, x)
+                variance = numpy.var(gx)
+                coefficient = float(numpy.cov(fx, gx, bias=True)[0, 1]\
+                                    /variance) if variance > 0 else 0.0
+                self._fitted[key] = coefficient
+                evaluations += self.pilotSize
+
+        x = rng.uniform(lowerLimit, upperLimit, size)
+        fx = _evaluate(function, x)
+        gx = _evaluate(self.controlFunction, x)
+        estimates = (upperLimit - lowerLimit)*(fx - coefficient*gx) + \
+                    coefficient*self.controlIntegral
+
+        return estimates, evaluations + size
+
+
+class ImportanceSampler():
+
+    """
+    description::
+        Draws samples from a probability density p that is non-zero wherever
+        the function is non-zero between the limits. Each estimate is
+        f(x)/p(x). The closer p follows the shape of the function the smaller
+        the variance, which helps peaked or steep functions most.
+
+    attributes::
+        density
+            (function) The probability density p. It must integrate to one
+            over the limits and accept and return numpy ndarrays.
+
+        draw
+            (function) Draws samples from the density. It is called as
+            draw(size, rng) with a numpy.random.Generator and must return a
+            numpy ndarray of size samples between the limits.
+    """
+
+    def __init__(self, density, draw):
+        self.density = density
+        self.draw = draw
+
+    def sample(self, function, lowerLimit, upperLimit, size, rng):
+
+        """
+        description::
+            Evaluates the function on a batch of samples drawn from the
+            density. See UniformSampler.sample.
+        """
+
+        x = numpy.asarray(self.draw(size, rng), dtype=float)
+        estimates = _evaluate(function, x)/_evaluate(self.density, x)
+
+        return estimates, size